@@ -4,15 +4,21 @@ from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from auth import hash_password  # Import the hash_password function
-from task_chat import TaskChat, show_chat_interface
+from task_chat import get_task_chat, show_chat_interface
 from calendar_view import show_calendar
+from deadline_heatmap import show_deadline_heatmap
 from config import ThemeConfig as theme
+from deadline_parser import parse_deadline
+from role_taxonomy import get_role_taxonomy
+from task_snapshot import TaskSnapshot
+from session_manager import rerun_fragment
 
-def get_dashboard_stats(db):
+TASK_REFRESH_INTERVAL = "60s"
+
+def get_dashboard_stats(db, snapshot):
     """Get dashboard statistics from the database"""
     try:
-        # Get all tasks
-        tasks = pd.DataFrame(list(db.tasks.find()))
+        tasks = snapshot.frame()
         employees = pd.DataFrame(list(db.users.find({"role": "employee"})))
         
         # Calculate stats
@@ -31,7 +37,6 @@ def get_dashboard_stats(db):
             # Calculate tasks created this week
             now = datetime.now()
             week_start = now - timedelta(days=now.weekday())
-            tasks['created_at'] = pd.to_datetime(tasks['created_at'])
             stats['tasks_this_week'] = len(tasks[tasks['created_at'] >= week_start])
         
         return stats
@@ -44,7 +49,11 @@ def get_dashboard_stats(db):
             'tasks_this_week': 0
         }
 
-def show_admin_dashboard(db, db_manager):
+def show_admin_dashboard(db, db_manager, snapshot=None):
+    # One read of the tasks collection for the whole rerun
+    if snapshot is None:
+        snapshot = TaskSnapshot(db_manager)
+    
     # Modern header with gradient background
     st.markdown(
         f"""
@@ -63,7 +72,7 @@ def show_admin_dashboard(db, db_manager):
     )
     
     # Quick stats in modern cards
-    stats = get_dashboard_stats(db)
+    stats = get_dashboard_stats(db, snapshot)
     cols = st.columns(4)
     
     stats_data = [
@@ -115,32 +124,34 @@ def show_admin_dashboard(db, db_manager):
             )
 
     # Add calendar view after stats
-    tasks = list(db.tasks.find())
-    show_calendar(tasks, user_role="admin")
+    show_calendar(db_manager, user_role="admin", version=snapshot.version)
+    show_deadline_heatmap(db_manager, version=snapshot.version)
 
-    # Modern tabs for different sections
-    tabs = st.tabs(["📈 Overview", "👥 Team", "📝 Tasks", "🔔 Notifications", "💬 Chat"])
-    
-    with tabs[0]:
-        show_overview_charts(db)
+    # Section switcher; unlike st.tabs, only the selected section runs
+    section = st.radio(
+        "Section",
+        ["📈 Overview", "👥 Team", "📝 Tasks", "🔔 Notifications", "💬 Chat"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="admin_section"
+    )
     
-    with tabs[1]:
+    if section == "📈 Overview":
+        show_overview_charts(snapshot)
+    elif section == "👥 Team":
         manage_employees(db_manager, db)
-    
-    with tabs[2]:
-        manage_tasks(db, db_manager)
-    
-    with tabs[3]:
+    elif section == "📝 Tasks":
+        manage_tasks(db, db_manager, snapshot)
+    elif section == "🔔 Notifications":
         manage_notifications(db, db_manager)
-    
-    with tabs[4]:
-        task_chat = TaskChat(db_manager)
-        show_chat_interface(task_chat, user={"role": "admin"})
+    else:
+        task_chat = get_task_chat(db_manager)
+        show_chat_interface(task_chat, user=st.session_state.user)
 
-def show_overview_charts(db):
+def show_overview_charts(snapshot):
     """Show overview charts and statistics"""
     try:
-        tasks = pd.DataFrame(list(db.tasks.find()))
+        tasks = snapshot.frame()
         if not tasks.empty:
             # Task Status Distribution
             st.markdown("### Task Status Distribution")
@@ -178,7 +189,6 @@ def show_overview_charts(db):
             
             # Task Timeline
             st.markdown("### Task Timeline")
-            tasks['created_at'] = pd.to_datetime(tasks['created_at'])
             timeline_data = tasks.groupby([tasks['created_at'].dt.date, 'status']).size().reset_index()
             timeline_data.columns = ['date', 'status', 'count']
             
@@ -210,6 +220,7 @@ def show_overview_charts(db):
 
 def manage_employees(db_manager, db):
     st.subheader("Employee Management")
+    role_names = get_role_taxonomy(db).role_names()
     
     # Add new employee
     with st.expander("Add New Employee"):
@@ -217,12 +228,7 @@ def manage_employees(db_manager, db):
             name = st.text_input("Name")
             email = st.text_input("Email")
             password = st.text_input("Password", type="password")
-            role = st.selectbox("Job Role", [
-                "Sales Analyst",
-                "Presentation Designer",
-                "Software Engineer",
-                "Marketing Manager"
-            ])
+            role = st.selectbox("Job Role", role_names)
             
             if st.form_submit_button("Add Employee"):
                 if db_manager.get_user(email):
@@ -242,6 +248,27 @@ def manage_employees(db_manager, db):
                     else:
                         st.error("Failed to add employee")
 
+    # Edit the role taxonomy used by task extraction and the dropdowns
+    with st.expander("Manage Job Roles"):
+        with st.form("save_role"):
+            role_name = st.text_input("Role Name")
+            synonyms = st.text_input("Synonyms (comma separated)")
+            hints = st.text_input("Task Keywords (comma separated)")
+
+            if st.form_submit_button("Save Role"):
+                taxonomy = get_role_taxonomy(db)
+                if not role_name.strip():
+                    st.error("Please enter a role name")
+                elif taxonomy.save_role(
+                    role_name.strip(),
+                    [s.strip() for s in synonyms.split(',') if s.strip()],
+                    [h.strip() for h in hints.split(',') if h.strip()]
+                ):
+                    st.success("Role saved successfully!")
+                    st.rerun()
+                else:
+                    st.error("Failed to save role")
+
     # List and manage employees
     employees = list(db.users.find({"role": "employee"}))
     if employees:
@@ -278,12 +305,7 @@ def manage_employees(db_manager, db):
                 with col1:
                     new_role = st.selectbox(
                         "Update Role",
-                        options=[
-                            "Sales Analyst",
-                            "Presentation Designer",
-                            "Software Engineer",
-                            "Marketing Manager"
-                        ]
+                        options=role_names
                     )
                     if st.button("Update Role"):
                         if db_manager.update_user(selected_emp_id, {"employee_role": new_role}):
@@ -301,10 +323,13 @@ def manage_employees(db_manager, db):
                             else:
                                 st.error("Failed to delete employee")
 
-def manage_tasks(db, db_manager):
+# Edits and filters rerun only this fragment; the timer picks up changes from others
+@st.fragment(run_every=TASK_REFRESH_INTERVAL)
+def manage_tasks(db, db_manager, snapshot):
     st.subheader("Task Management")
     
-    tasks = pd.DataFrame(list(db.tasks.find()))
+    snapshot.revalidate()
+    tasks = snapshot.frame()
     if not tasks.empty:
         # Filters
         col1, col2, col3 = st.columns(3)
@@ -342,7 +367,8 @@ def manage_tasks(db, db_manager):
                     st.write("**Role:**", task['role'])
                     
                     # Add deadline update functionality
-                    current_deadline = pd.to_datetime(task['deadline']) if task['deadline'] != 'Not specified' else None
+                    deadline = parse_deadline(task['deadline'])
+                    current_deadline = deadline.date() if deadline else None
                     new_deadline = st.date_input(
                         "Update Deadline",
                         value=current_deadline,
@@ -351,7 +377,8 @@ def manage_tasks(db, db_manager):
                     
                     if new_deadline != current_deadline:
                         if st.button("Update Deadline", key=f"update_deadline_{task['_id']}"):
-                            if db_manager.update_task(task['_id'], {'deadline': new_deadline.strftime('%Y-%m-%d')}):
+                            deadline_update = {'deadline': new_deadline.strftime('%Y-%m-%d')}
+                            if db_manager.update_task(task['_id'], deadline_update):
                                 # Create notification for the assignee
                                 notification_data = {
                                     'user_id': task['assignee_id'],
@@ -360,8 +387,9 @@ def manage_tasks(db, db_manager):
                                     'type': 'deadline_update'
                                 }
                                 db_manager.create_notification(notification_data)
+                                snapshot.update_task(task['_id'], deadline_update)
                                 st.success("Deadline updated successfully")
-                                st.rerun()
+                                rerun_fragment()
                             else:
                                 st.error("Failed to update deadline")
                 
@@ -381,7 +409,8 @@ def manage_tasks(db, db_manager):
                                 'type': 'status_update'
                             }
                             db_manager.create_notification(notification_data)
-                            st.rerun()
+                            snapshot.update_task(task['_id'], {'status': new_status})
+                            rerun_fragment()
                         else:
                             st.error("Failed to update task status")
 
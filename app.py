@@ -6,8 +6,9 @@ from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
 from database_manager import DatabaseManager
-from session_manager import init_session
+from session_manager import init_session, rerun_fragment
 from config import ThemeConfig as theme
+from task_snapshot import TaskSnapshot, get_task_cache
 
 # Set page config first
 st.set_page_config(
@@ -64,6 +65,20 @@ def set_page_style():
         unsafe_allow_html=True
     )
 
+# Polls on its own timer and reruns alone when a notification is marked read
+@st.fragment(run_every="30s")
+def show_notifications(user_id):
+    notifications = db_manager.get_unread_notifications(user_id)
+    
+    if notifications:
+        st.warning(f"You have {len(notifications)} unread notifications!")
+        with st.expander("View Notifications"):
+            for notif in notifications:
+                st.write(notif['message'])
+                if st.button("Mark as Read", key=str(notif['_id'])):
+                    db_manager.mark_notification_read(notif['_id'])
+                    rerun_fragment()
+
 def main():
     set_page_style()
     # Sidebar
@@ -72,22 +87,7 @@ def main():
             st.write(f"Logged in as: {st.session_state.user['name']}")
             
             # Show notifications
-            notifications = list(db.notifications.find({
-                "user_id": st.session_state.user["id"],
-                "read": False
-            }))
-            
-            if notifications:
-                st.warning(f"You have {len(notifications)} unread notifications!")
-                with st.expander("View Notifications"):
-                    for notif in notifications:
-                        st.write(notif['message'])
-                        if st.button("Mark as Read", key=str(notif['_id'])):
-                            db.notifications.update_one(
-                                {"_id": notif['_id']},
-                                {"$set": {"read": True}}
-                            )
-                            st.rerun()
+            show_notifications(st.session_state.user["id"])
             
             if st.button("Logout"):
                 logout()
@@ -100,10 +100,14 @@ def main():
 
     # Main content
     if st.session_state.user:
+        # Every section of this rerun shares one snapshot, served from the
+        # process-wide cache that all sessions revalidate by task version
+        task_cache = get_task_cache(db_manager)
         if st.session_state.user['role'] == 'admin':
-            show_admin_dashboard(db, db_manager)
+            show_admin_dashboard(db, db_manager, TaskSnapshot(db_manager, cache=task_cache))
         else:
-            show_employee_dashboard(db, db_manager, st.session_state.user)
+            user = st.session_state.user
+            show_employee_dashboard(db, db_manager, user, TaskSnapshot(db_manager, user['id'], task_cache))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,23 +1,114 @@
 import speech_recognition as sr
+import threading
+from collections import deque
+from voice_activity import VoiceActivityDetector
+
+class PhraseBuffer:
+    """Bounded ring buffer of captured phrases; the oldest is dropped when full"""
+
+    def __init__(self, max_phrases=32):
+        self.phrases = deque(maxlen=max_phrases)
+        self.dropped = 0
+        self._cond = threading.Condition()
+
+    def put(self, audio):
+        with self._cond:
+            if len(self.phrases) == self.phrases.maxlen:
+                self.dropped += 1
+            self.phrases.append(audio)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the oldest buffered phrase, or None if none arrives in time"""
+        with self._cond:
+            if not self.phrases:
+                self._cond.wait(timeout)
+            return self.phrases.popleft() if self.phrases else None
+
+    def __len__(self):
+        return len(self.phrases)
 
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, buffer_size=32):
         self.recognizer = sr.Recognizer()
+        # Keep adapting the energy threshold while the stream stays open
+        self.recognizer.dynamic_energy_threshold = True
+
+        self.phrases = PhraseBuffer(buffer_size)
+        self.vad = VoiceActivityDetector()
+        self.vad_stats = {'phrases': 0, 'dropped': 0, 'bytes_in': 0, 'bytes_out': 0}
+        self._running = threading.Event()
+        self._capture_thread = None
+
+    def start_continuous(self, source=None):
+        """Open the microphone once, calibrate once and capture phrases in the background"""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop,
+            args=(source or sr.Microphone(),),
+            daemon=True
+        )
+        self._capture_thread.start()
+
+    def stop_continuous(self):
+        self._running.clear()
+        if self._capture_thread:
+            self._capture_thread.join()
+            self._capture_thread = None
+
+    def _capture_loop(self, source):
+        try:
+            with source:
+                print("Calibrating for ambient noise...")
+                self.recognizer.adjust_for_ambient_noise(source)
+                print("Listening...")
+                while self._running.is_set():
+                    try:
+                        # A short timeout only lets us notice stop requests;
+                        # the stream stays open between phrases
+                        audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=30)
+                        self.phrases.put(audio)
+                    except sr.WaitTimeoutError:
+                        continue
+        except Exception as e:
+            print(f"Audio capture stopped: {str(e)}")
+        finally:
+            self._running.clear()
+
+    def recognize(self, audio):
+        # Drop silence and noise locally instead of paying for a recognition round trip
+        self.vad_stats['phrases'] += 1
+        self.vad_stats['bytes_in'] += len(audio.frame_data)
+        audio = self.vad.trim(audio, self.recognizer.energy_threshold)
+        if audio is None:
+            self.vad_stats['dropped'] += 1
+            return None
+        self.vad_stats['bytes_out'] += len(audio.frame_data)
         
+        try:
+            text = self.recognizer.recognize_google(audio)
+            print(f"Captured: {text}")
+            return text
+        except sr.UnknownValueError:
+            print("Could not understand audio")
+            return None
+        except sr.RequestError as e:
+            print(f"Could not request results; {e}")
+            return None
+
     def capture_audio(self):
+        # In continuous mode, hand over the next buffered phrase
+        if self._running.is_set() or len(self.phrases):
+            audio = self.phrases.get(timeout=5)
+            return self.recognize(audio) if audio else None
+
         with sr.Microphone() as source:
             print("Listening...")
             self.recognizer.adjust_for_ambient_noise(source)
             try:
                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=30)
-                text = self.recognizer.recognize_google(audio)
-                print(f"Captured: {text}")
-                return text
+                return self.recognize(audio)
             except sr.WaitTimeoutError:
                 return None
-            except sr.UnknownValueError:
-                print("Could not understand audio")
-                return None
-            except sr.RequestError as e:
-                print(f"Could not request results; {e}")
-                return None 
\ No newline at end of file
@@ -5,6 +5,7 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 from session_manager import save_session
+from role_taxonomy import get_role_taxonomy
 
 load_dotenv()
 
@@ -33,12 +34,9 @@ def signup():
         email = st.text_input("Email")
         password = st.text_input("Password", type="password")
         role = st.selectbox("Role", ["employee", "admin"])
-        employee_role = st.selectbox("Job Role", [
-            "Sales Analyst",
-            "Presentation Designer",
-            "Software Engineer",
-            "Marketing Manager"
-        ]) if role == "employee" else None
+        employee_role = st.selectbox(
+            "Job Role", get_role_taxonomy(db).role_names()
+        ) if role == "employee" else None
         
         if st.form_submit_button("Sign Up"):
             if db.users.find_one({"email": email}):
@@ -1,9 +1,26 @@
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
 from datetime import datetime, timedelta
-import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import calendar
 from config import ThemeConfig as theme
+from deadline_parser import parse_many
+
+STATUS_ORDER = ['pending', 'in_progress', 'completed']
+
+# Tasks drawn as individual markers in a day cell; the rest become a "+N" count
+MAX_MARKERS_PER_DAY = 4
+MARKER_SPACING = 0.2
+MAX_OVERFLOW_HOVER = 10
+
+# Rendered month figures as JSON, keyed by (year, month, scope, version, day)
+FIGURE_CACHE_SIZE = 128
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+_prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='calendar-prefetch')
 
 class CalendarView:
     def __init__(self):
@@ -26,7 +43,11 @@ class CalendarView:
         }
 
     def create_calendar(self, tasks, year=None, month=None):
-        """Create an interactive calendar with tasks"""
+        """Create an interactive calendar with tasks.
+
+        The figure has a fixed number of traces however many tasks there are:
+        one for day numbers, one marker trace per status and one for overflow counts.
+        """
         if year is None:
             year = self.today.year
         if month is None:
@@ -36,91 +57,91 @@ class CalendarView:
         cal = calendar.monthcalendar(year, month)
         month_name = calendar.month_name[month]
         
-        # Process tasks
+        # Group the month's tasks by day
         task_dates = {}
-        for task in tasks:
-            deadline = pd.to_datetime(task['deadline']) if task['deadline'] != 'Not specified' else None
-            if deadline:
-                date_str = deadline.strftime('%Y-%m-%d')
-                if date_str not in task_dates:
-                    task_dates[date_str] = []
-                task_dates[date_str].append({
-                    'description': task['task_description'],
-                    'status': task['status'],
-                    'assignee': task.get('assignee_name', 'Unassigned')
-                })
-
-        # Create calendar grid
-        fig = go.Figure()
+        deadlines = parse_many([task.get('deadline') for task in tasks])
+        for task, deadline in zip(tasks, deadlines):
+            if deadline and deadline.year == year and deadline.month == month:
+                task_dates.setdefault(deadline.day, []).append(task)
+
+        day_x, day_y, day_text, day_colors = [], [], [], []
+        markers = {status: {'x': [], 'y': [], 'hover': []} for status in STATUS_ORDER}
+        overflow = {'x': [], 'y': [], 'text': [], 'hover': []}
+        today = self.today.date()
 
-        # Add cells for each day
         for week_num, week in enumerate(cal):
+            row = 5 - week_num
             for day_num, day in enumerate(week):
-                if day != 0:
-                    date = datetime(year, month, day)
-                    date_str = date.strftime('%Y-%m-%d')
-                    
-                    # Determine cell color
-                    if date.strftime('%Y-%m-%d') == self.today.strftime('%Y-%m-%d'):
-                        color = self.colors['today']
-                    elif date.weekday() >= 5:  # Weekend
-                        color = self.colors['weekend']
-                    else:
-                        color = 'white'
-                    
-                    # Create cell with black text
-                    fig.add_trace(go.Scatter(
-                        x=[day_num + 0.5],
-                        y=[6 - week_num - 0.5],
-                        mode='text',
-                        text=str(day),
-                        textfont=dict(
-                            color=self.text_color,
-                            size=14
-                        ),
-                        hoverinfo='text',
-                        showlegend=False
-                    ))
-                    
-                    # Add task indicators with improved visibility
-                    if date_str in task_dates:
-                        for i, task in enumerate(task_dates[date_str]):
-                            # Add larger, more visible markers
-                            fig.add_trace(go.Scatter(
-                                x=[day_num + 0.5],  # Centered in the cell
-                                y=[6 - week_num - 0.75],  # Slightly lower
-                                mode='markers',
-                                marker=dict(
-                                    size=16,  # Increased size
-                                    symbol='circle',
-                                    color=self.colors[task['status']],
-                                    line=dict(
-                                        color=self.border_colors[task['status']],
-                                        width=2  # Thicker border
-                                    )
-                                ),
-                                hovertext=(
-                                    f"<b>{task['description']}</b><br>"
-                                    f"Status: {task['status'].replace('_', ' ').title()}<br>"
-                                    f"Assignee: {task['assignee']}"
-                                ),
-                                hoverinfo='text',
-                                showlegend=False
-                            ))
-                            
-                            # Add a small label below the marker
-                            fig.add_trace(go.Scatter(
-                                x=[day_num + 0.5],
-                                y=[6 - week_num - 0.9],
-                                mode='text',
-                                text='📅',  # Calendar emoji as indicator
-                                textfont=dict(
-                                    size=10,
-                                    color=self.border_colors[task['status']]
-                                ),
-                                hoverinfo='skip',
-                                showlegend=False
-                            ))
+                if day == 0:
+                    continue
+                day_x.append(day_num)
+                day_y.append(row + 0.3)
+                if datetime(year, month, day).date() == today:
+                    day_text.append(f"<b>{day}</b>")
+                    day_colors.append(theme.SECONDARY)
+                else:
+                    day_text.append(str(day))
+                    day_colors.append(self.text_color)
+
+                day_tasks = sorted(
+                    task_dates.get(day, []),
+                    key=lambda task: STATUS_ORDER.index(task['status']) if task['status'] in STATUS_ORDER else len(STATUS_ORDER)
+                )
+                shown = day_tasks[:MAX_MARKERS_PER_DAY]
+                for i, task in enumerate(shown):
+                    status = task['status'] if task['status'] in markers else 'pending'
+                    markers[status]['x'].append(day_num + (i - (len(shown) - 1) / 2) * MARKER_SPACING)
+                    markers[status]['y'].append(row - 0.05)
+                    markers[status]['hover'].append(self.hover_text(task))
+
+                hidden = day_tasks[MAX_MARKERS_PER_DAY:]
+                if hidden:
+                    overflow['x'].append(day_num)
+                    overflow['y'].append(row - 0.32)
+                    overflow['text'].append(f"+{len(hidden)}")
+                    overflow['hover'].append('<br>'.join(
+                        f"{task['task_description']} ({task['status'].replace('_', ' ')})"
+                        for task in hidden[:MAX_OVERFLOW_HOVER]
+                    ) + (f"<br>…and {len(hidden) - MAX_OVERFLOW_HOVER} more" if len(hidden) > MAX_OVERFLOW_HOVER else ''))
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=day_x,
+            y=day_y,
+            mode='text',
+            text=day_text,
+            textfont=dict(color=day_colors, size=14),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+
+        # One trace per status doubles as its legend entry
+        for status in STATUS_ORDER:
+            fig.add_trace(go.Scatter(
+                x=markers[status]['x'],
+                y=markers[status]['y'],
+                mode='markers',
+                marker=dict(
+                    size=16,
+                    symbol='circle',
+                    color=self.colors[status],
+                    line=dict(color=self.border_colors[status], width=2)
+                ),
+                hovertext=markers[status]['hover'],
+                hoverinfo='text',
+                name=status.replace('_', ' ').title()
+            ))
+
+        fig.add_trace(go.Scatter(
+            x=overflow['x'],
+            y=overflow['y'],
+            mode='text',
+            text=overflow['text'],
+            textfont=dict(color=theme.TEXT_SECONDARY, size=11),
+            hovertext=overflow['hover'],
+            hoverinfo='text',
+            showlegend=False
+        ))
 
         # Configure layout with improved text visibility
         fig.update_layout(
@@ -133,87 +154,122 @@ class CalendarView:
             showlegend=True,
             height=500,
             xaxis=dict(
-                showgrid=True,
-                gridwidth=1,
-                gridcolor='#E5E7EB',
+                showgrid=False,
                 ticktext=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
                 tickvals=list(range(7)),
                 range=[-0.5, 6.5],
-                tickfont=dict(color=self.text_color)
+                tickfont=dict(color=self.text_color),
+                fixedrange=True
             ),
             yaxis=dict(
-                showgrid=True,
-                gridwidth=1,
-                gridcolor='#E5E7EB',
+                showgrid=False,
                 ticktext=['Week 6', 'Week 5', 'Week 4', 'Week 3', 'Week 2', 'Week 1'],
                 tickvals=list(range(6)),
                 range=[-0.5, 5.5],
-                tickfont=dict(color=self.text_color)
-            )
+                tickfont=dict(color=self.text_color),
+                fixedrange=True
+            ),
+            # Cell borders and weekend shading as layout shapes, not traces
+            shapes=self.cell_shapes(len(cal))
         )
 
-        # Add legend with improved visibility
-        for status, color in [
-            ('Pending', self.colors['pending']),
-            ('In Progress', self.colors['in_progress']),
-            ('Completed', self.colors['completed'])
-        ]:
-            fig.add_trace(go.Scatter(
-                x=[None], y=[None],
-                mode='markers',
-                marker=dict(
-                    size=16,  # Match the size of calendar markers
-                    color=color,
-                    line=dict(
-                        color=self.border_colors[status.lower().replace(' ', '_')],
-                        width=2
-                    )
-                ),
-                name=status
-            ))
-
         return fig
 
-def show_calendar(tasks, user_role="employee"):
-    """Display the calendar in the Streamlit app"""
+    def hover_text(self, task):
+        return (
+            f"<b>{task['task_description']}</b><br>"
+            f"Status: {task['status'].replace('_', ' ').title()}<br>"
+            f"Assignee: {task.get('assignee_name', 'Unassigned')}"
+        )
+
+    def cell_shapes(self, weeks):
+        shapes = [
+            dict(type='rect', xref='x', yref='y', x0=4.5, x1=6.5, y0=5.5 - weeks, y1=5.5,
+                 fillcolor=self.colors['weekend'], line=dict(width=0), layer='below')
+        ]
+        for x in range(8):
+            shapes.append(dict(type='line', x0=x - 0.5, x1=x - 0.5, y0=5.5 - weeks, y1=5.5,
+                               line=dict(color='#E5E7EB', width=1)))
+        for y in range(weeks + 1):
+            shapes.append(dict(type='line', x0=-0.5, x1=6.5, y0=5.5 - y, y1=5.5 - y,
+                               line=dict(color='#E5E7EB', width=1)))
+        return shapes
+
+def month_range(year, month):
+    """First day of the month and of the next one, as deadline strings"""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}-01", f"{next_year:04d}-{next_month:02d}-01"
+
+def shift_month(year, month, delta):
+    index = year * 12 + month - 1 + delta
+    return index // 12, index % 12 + 1
+
+def calendar_figure_json(db_manager, year, month, user_id=None, version=None):
+    """Figure JSON for one month, querying only the tasks due in it"""
+    # Today is highlighted, so a new day needs a new figure
+    key = (year, month, user_id, version, datetime.now().date())
+    if version is not None:
+        with _figure_cache_lock:
+            if key in _figure_cache:
+                _figure_cache.move_to_end(key)
+                return _figure_cache[key]
+
+    start, end = month_range(year, month)
+    tasks = db_manager.get_tasks_in_range(start, end, user_id)
+    spec = CalendarView().create_calendar(tasks, year, month).to_json()
+
+    if version is not None:
+        with _figure_cache_lock:
+            _figure_cache[key] = spec
+            while len(_figure_cache) > FIGURE_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+    return spec
+
+def prefetch_adjacent_months(db_manager, year, month, user_id=None, version=None):
+    """Render the previous and next month in the background"""
+    if version is None:
+        return
+    for delta in (-1, 1):
+        adjacent_year, adjacent_month = shift_month(year, month, delta)
+        _prefetcher.submit(calendar_figure_json, db_manager, adjacent_year, adjacent_month, user_id, version)
+
+def show_calendar(db_manager, user_role="employee", user_id=None, version=None, prefetch=True):
+    """Display the calendar in the Streamlit app.
+
+    Only the visible month is queried; pass user_id to restrict it to one
+    assignee and the task version to reuse rendered figures.
+    """
     st.markdown("### 📅 Task Calendar")
     
+    if 'calendar_month' not in st.session_state:
+        st.session_state.calendar_month = datetime.now().month
+        st.session_state.calendar_year = datetime.now().year
+    
     # Calendar navigation
     col1, col2, col3 = st.columns([2, 3, 2])
     with col1:
         if st.button("◀ Previous Month"):
-            if 'calendar_month' not in st.session_state:
-                st.session_state.calendar_month = datetime.now().month
-                st.session_state.calendar_year = datetime.now().year
-            if st.session_state.calendar_month == 1:
-                st.session_state.calendar_month = 12
-                st.session_state.calendar_year -= 1
-            else:
-                st.session_state.calendar_month -= 1
+            st.session_state.calendar_year, st.session_state.calendar_month = shift_month(
+                st.session_state.calendar_year, st.session_state.calendar_month, -1
+            )
                 
+    with col3:
+        if st.button("Next Month ▶"):
+            st.session_state.calendar_year, st.session_state.calendar_month = shift_month(
+                st.session_state.calendar_year, st.session_state.calendar_month, 1
+            )
+
+    year, month = st.session_state.calendar_year, st.session_state.calendar_month
     with col2:
         st.markdown(
-            f"<h3 style='text-align: center;'>{calendar.month_name[st.session_state.get('calendar_month', datetime.now().month)]} "
-            f"{st.session_state.get('calendar_year', datetime.now().year)}</h3>",
+            f"<h3 style='text-align: center;'>{calendar.month_name[month]} {year}</h3>",
             unsafe_allow_html=True
         )
-        
-    with col3:
-        if st.button("Next Month ▶"):
-            if 'calendar_month' not in st.session_state:
-                st.session_state.calendar_month = datetime.now().month
-                st.session_state.calendar_year = datetime.now().year
-            if st.session_state.calendar_month == 12:
-                st.session_state.calendar_month = 1
-                st.session_state.calendar_year += 1
-            else:
-                st.session_state.calendar_month += 1
-
-    # Initialize calendar view and display
-    calendar_view = CalendarView()
-    fig = calendar_view.create_calendar(
-        tasks,
-        st.session_state.get('calendar_year', datetime.now().year),
-        st.session_state.get('calendar_month', datetime.now().month)
-    )
-    st.plotly_chart(fig, use_container_width=True) 
\ No newline at end of file
+
+    if version is None:
+        version = db_manager.get_task_version()
+    spec = calendar_figure_json(db_manager, year, month, user_id, version)
+    st.plotly_chart(pio.from_json(spec, skip_invalid=True), use_container_width=True)
+    
+    if prefetch:
+        prefetch_adjacent_months(db_manager, year, month, user_id, version)
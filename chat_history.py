@@ -0,0 +1,131 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from llm_gateway import LLMGateway, PRIORITY_CHAT
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and a task
+management assistant. Fold the new exchanges into the existing summary. Keep facts,
+decisions, open questions and the tasks discussed; drop small talk. Reply with the
+updated summary only, in at most {max_words} words.
+
+Existing summary:
+{summary}
+
+New exchanges:
+{exchanges}
+"""
+
+
+def format_turns(turns):
+    return "\n\n".join(f"User: {turn['user']}\nAssistant: {turn['assistant']}" for turn in turns)
+
+
+class ChatHistory:
+    """Per-user chat turns in MongoDB with capped retention and a rolling summary.
+
+    The newest recent_turns go into prompts verbatim; older turns are folded
+    into a summary in the background as soon as they leave that window.
+    """
+
+    def __init__(self, db, max_turns=None, recent_turns=5, max_summary_words=200):
+        self.db = db
+        self.max_turns = max_turns or int(os.getenv('CHAT_HISTORY_TURNS', 50))
+        self.recent_turns = recent_turns
+        self.max_summary_words = max_summary_words
+        self.gateway = LLMGateway()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chat-summary')
+
+    def recent(self, user_id, limit=None):
+        """Latest turns for a user, oldest first"""
+        try:
+            turns = self.db.chat_messages.find(
+                {'user_id': user_id},
+                sort=[('timestamp', -1)],
+                limit=limit or self.max_turns
+            )
+            return list(turns)[::-1]
+        except Exception as e:
+            print(f"Error loading chat history: {str(e)}")
+            return []
+
+    def summary(self, user_id):
+        """Return (summary, timestamp of the last summarized turn)"""
+        try:
+            document = self.db.chat_summaries.find_one({'_id': user_id}) or {}
+            return document.get('summary', ''), document.get('covered_until')
+        except Exception as e:
+            print(f"Error loading chat summary: {str(e)}")
+            return '', None
+
+    def prompt_turns(self, turns, covered_until=None):
+        """The newest recent_turns the summary does not cover yet"""
+        if covered_until:
+            turns = [turn for turn in turns if turn['timestamp'] > covered_until]
+        return turns[-self.recent_turns:]
+
+    def append(self, user_id, turn):
+        """Persist a turn, trim the user's history and schedule summarization"""
+        try:
+            self.db.chat_messages.insert_one(dict(turn, user_id=user_id))
+
+            # Capped retention: drop everything older than the newest max_turns
+            cutoff = list(self.db.chat_messages.find(
+                {'user_id': user_id}, {'timestamp': 1},
+                sort=[('timestamp', -1)], skip=self.max_turns - 1, limit=1
+            ))
+            if cutoff:
+                self.db.chat_messages.delete_many(
+                    {'user_id': user_id, 'timestamp': {'$lt': cutoff[0]['timestamp']}}
+                )
+        except Exception as e:
+            print(f"Error saving chat message: {str(e)}")
+            return
+
+        self.maybe_summarize(user_id)
+
+    def maybe_summarize(self, user_id):
+        with self._lock:
+            if user_id in self._pending:
+                return
+            self._pending.add(user_id)
+        self._executor.submit(self._summarize, user_id)
+
+    def _summarize(self, user_id):
+        try:
+            document = self.db.chat_summaries.find_one({'_id': user_id}) or {}
+            turns = self.recent(user_id)
+            older = turns[:-self.recent_turns]
+            covered = document.get('covered_until')
+            if covered:
+                older = [turn for turn in older if turn['timestamp'] > covered]
+            if not older:
+                return
+
+            prompt = SUMMARY_PROMPT.format(
+                max_words=self.max_summary_words,
+                summary=document.get('summary') or '(none yet)',
+                exchanges=format_turns(older)
+            )
+            response = self.gateway.generate(self.gateway.model(), prompt, priority=PRIORITY_CHAT)
+            self.db.chat_summaries.update_one(
+                {'_id': user_id},
+                {'$set': {
+                    'summary': response.text.strip(),
+                    'covered_until': older[-1]['timestamp'],
+                    'updated_at': datetime.now()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Error summarizing chat history: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(user_id)
+
+    def clear(self, user_id):
+        self.db.chat_messages.delete_many({'user_id': user_id})
+        self.db.chat_summaries.delete_one({'_id': user_id})
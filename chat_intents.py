@@ -0,0 +1,167 @@
+import re
+from calendar import monthrange
+from datetime import datetime, timedelta
+
+from deadline_parser import parse_many
+
+# Status words as users type them -> stored status
+STATUS_WORDS = {
+    'pending': 'pending', 'open': 'pending', 'todo': 'pending', 'to do': 'pending',
+    'not started': 'pending', 'outstanding': 'pending',
+    'in progress': 'in_progress', 'in-progress': 'in_progress', 'ongoing': 'in_progress',
+    'started': 'in_progress', 'active': 'in_progress',
+    'completed': 'completed', 'complete': 'completed', 'done': 'completed', 'finished': 'completed'
+}
+
+STATUS_PATTERN = re.compile(
+    r'\b(' + '|'.join(sorted(map(re.escape, STATUS_WORDS), key=len, reverse=True)) + r')\b'
+)
+
+# Requests that need reasoning or writing are left to the LLM
+OPEN_ENDED_PATTERN = re.compile(
+    r'\b(why|should|suggest|recommend|advice|advise|help me|explain|prioriti[sz]e|next steps?|'
+    r'plan|write|draft|summari[sz]e|improve|compare|best|ideas?)\b|\bhow (do|can|to|would|should)\b'
+)
+
+# Questions about history or timing ("finished late", "done last week") are
+# not answerable from current status and deadline alone
+UNSUPPORTED_PATTERN = re.compile(
+    r'\b(late|early|on time|did|was|were|had|yesterday|ago|last (?:week|month)|since|before|after)\b'
+)
+
+COUNT_PATTERN = re.compile(r'\b(how many|number of|count)\b')
+OVERDUE_PATTERN = re.compile(r'\b(overdue|past due|past (?:the |their |its )?deadlines?)\b')
+DUE_PATTERN = re.compile(
+    r'\b(?:due|deadlines?)\b.*?\b(today|tomorrow|this week|next week|this month|next 7 days)\b'
+)
+LIST_PATTERN = re.compile(r'\b(list|show|which|what|any)\b')
+
+MAX_LISTED = 10
+
+
+class IntentRouter:
+    """Answers common factual task questions locally instead of via the LLM"""
+
+    def __init__(self, role_taxonomy=None):
+        self.role_taxonomy = role_taxonomy
+
+    def parse(self, message):
+        """Return (intent, filters) for a recognized question, or None"""
+        text = ' '.join(message.lower().split())
+        if not text or OPEN_ENDED_PATTERN.search(text) or UNSUPPORTED_PATTERN.search(text):
+            return None
+
+        status = STATUS_PATTERN.search(text)
+        filters = {
+            'status': STATUS_WORDS[status.group(1)] if status else None,
+            'role': self.role_taxonomy.find_role(text) if self.role_taxonomy else None
+        }
+        counting = bool(COUNT_PATTERN.search(text))
+        listing = bool(LIST_PATTERN.search(text))
+
+        if OVERDUE_PATTERN.search(text):
+            if not (counting or listing):
+                return None
+            return ('count_overdue' if counting else 'overdue'), filters
+
+        due = DUE_PATTERN.search(text)
+        if due:
+            filters['window'] = due.group(1)
+            return ('count_due' if counting else 'due'), filters
+
+        if counting and 'task' in text:
+            return 'count', filters
+
+        if filters['status'] and 'task' in text and listing:
+            return 'list', filters
+        return None
+
+    def answer(self, message, tasks, today=None, task_id=None):
+        """Answer the message from the given tasks, or None to fall through.
+
+        With a task_id the question is about that task only.
+        """
+        parsed = self.parse(message)
+        if not parsed:
+            return None
+        intent, filters = parsed
+        today = today or datetime.now()
+        start = datetime(today.year, today.month, today.day)
+
+        if task_id:
+            tasks = [task for task in tasks if str(task.get('_id')) == str(task_id)]
+            if not tasks:
+                return None
+
+        tasks = [
+            task for task in tasks
+            if (not filters['role'] or task.get('role') == filters['role'])
+            and (not filters['status'] or task.get('status') == filters['status'])
+        ]
+        if intent in ('overdue', 'count_overdue'):
+            matches = self.with_deadlines(tasks, today, lambda deadline: deadline < start)
+            suffix = " overdue"
+        elif intent in ('due', 'count_due'):
+            window_start, window_end = self.window(filters['window'], start)
+            matches = self.with_deadlines(
+                tasks, today, lambda deadline: window_start <= deadline < window_end
+            )
+            suffix = f" due {filters['window']}"
+        else:
+            matches = [(task, None) for task in tasks]
+            suffix = ""
+        label = self.describe_scope(filters, len(matches)) + suffix
+        verb = 'is' if len(matches) == 1 else 'are'
+
+        if intent.startswith('count'):
+            if intent == 'count' and not filters['status']:
+                by_status = {}
+                for task, _ in matches:
+                    by_status[task.get('status')] = by_status.get(task.get('status'), 0) + 1
+                breakdown = ', '.join(f"{count} {status.replace('_', ' ')}" for status, count in by_status.items())
+                return f"There {verb} **{len(matches)}** {label}" + (f" ({breakdown})." if breakdown else ".")
+            return f"There {verb} **{len(matches)}** {label}."
+
+        if not matches:
+            return f"There are no {label}."
+
+        lines = [f"There {verb} **{len(matches)}** {label}:", ""]
+        for task, deadline in matches[:MAX_LISTED]:
+            line = f"- {task['task_description']} — {task.get('status', '').replace('_', ' ')}, due {task.get('deadline')}"
+            if task.get('assignee_name'):
+                line += f" ({task['assignee_name']})"
+            lines.append(line)
+        if len(matches) > MAX_LISTED:
+            lines.append(f"- …and {len(matches) - MAX_LISTED} more")
+        return '\n'.join(lines)
+
+    def describe_scope(self, filters, count=0):
+        words = []
+        if filters['status']:
+            words.append(filters['status'].replace('_', ' '))
+        if filters['role']:
+            words.append(filters['role'])
+        words.append('task' if count == 1 else 'tasks')
+        return ' '.join(words)
+
+    def with_deadlines(self, tasks, today, predicate):
+        """Tasks whose deadline satisfies predicate, soonest first; completed ones are skipped"""
+        tasks = [task for task in tasks if task.get('status') != 'completed']
+        deadlines = parse_many([task.get('deadline') for task in tasks], today)
+        matches = [
+            (task, deadline) for task, deadline in zip(tasks, deadlines)
+            if deadline and predicate(deadline)
+        ]
+        return sorted(matches, key=lambda pair: pair[1])
+
+    def window(self, name, start):
+        """[start, end) of a named due-date window"""
+        if name == 'today':
+            return start, start + timedelta(days=1)
+        if name == 'tomorrow':
+            return start + timedelta(days=1), start + timedelta(days=2)
+        if name == 'next week':
+            return start + timedelta(days=7), start + timedelta(days=14)
+        if name == 'this month':
+            return start, start.replace(day=monthrange(start.year, start.month)[1]) + timedelta(days=1)
+        return start, start + timedelta(days=7)
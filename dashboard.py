@@ -9,6 +9,7 @@ import plotly.graph_objects as go
 from queue import Queue
 import threading
 from queue_manager import QueueManager
+from deadline_parser import parse_many
 
 # Load environment variables
 load_dotenv()
@@ -17,15 +18,6 @@ load_dotenv()
 client = MongoClient(os.getenv('MONGODB_URI'))
 db = client.task_manager
 
-def convert_to_datetime(date_str):
-    """Convert various date formats to datetime"""
-    if pd.isna(date_str) or date_str == 'Not specified':
-        return None
-    try:
-        return pd.to_datetime(date_str)
-    except:
-        return None
-
 def load_tasks():
     """Load tasks from MongoDB and convert to DataFrame"""
     tasks = list(db.tasks.find())
@@ -89,7 +81,7 @@ def main():
     with col2:
         st.subheader("📅 Upcoming Deadlines")
         # Filter and convert deadline dates
-        df['deadline_date'] = df['deadline'].apply(convert_to_datetime)
+        df['deadline_date'] = parse_many(df['deadline'])
         deadline_df = df[df['deadline_date'].notna()].copy()
         
         if not deadline_df.empty:
@@ -170,8 +162,9 @@ def main():
                 if new_status != task['status']:
                     db.tasks.update_one(
                         {'_id': task['_id']},
-                        {'$set': {'status': new_status}}
+                        {'$set': {'status': new_status, 'updated_at': datetime.now()}}
                     )
+                    db.counters.update_one({'_id': 'tasks'}, {'$inc': {'version': 1}}, upsert=True)
                     st.experimental_rerun()
             
             # st.write("**Original Transcript:**", task['original_transcript'])
@@ -1,4 +1,5 @@
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 import os
 from datetime import datetime
 from bson import ObjectId
@@ -23,6 +24,7 @@ class DatabaseManager:
         
     def update_user(self, user_id, update_data):
         try:
+            update_data['updated_at'] = datetime.now()
             result = self.db.users.update_one(
                 {"_id": ObjectId(user_id)},
                 {"$set": update_data}
@@ -51,11 +53,55 @@ class DatabaseManager:
                     
             task_data['created_at'] = datetime.now()
             result = self.db.tasks.insert_one(task_data)
+            self.bump_task_version()
             return result.inserted_id
         except Exception as e:
             print(f"Error creating task: {str(e)}")
             return None
             
+    def create_tasks(self, tasks):
+        """Insert many tasks at once; returns the ids of the tasks stored, in order.
+
+        Inserts stop at the first failing task, so the ids returned are those
+        of the leading tasks that were stored.
+        """
+        try:
+            required_fields = ['task_description', 'assignee_id', 'assignee_name', 
+                             'role', 'deadline', 'status']
+            now = datetime.now()
+            for task_data in tasks:
+                for field in required_fields:
+                    if field not in task_data:
+                        raise ValueError(f"Missing required field: {field}")
+                task_data['created_at'] = now
+                
+            result = self.db.tasks.insert_many(tasks, ordered=True)
+            self.bump_task_version()
+            return result.inserted_ids
+        except BulkWriteError as e:
+            inserted = e.details.get('nInserted', 0)
+            print(f"Error creating tasks: stored {inserted} of {len(tasks)}: {str(e)}")
+            if inserted:
+                self.bump_task_version()
+            # insert_many assigns _id to each document before sending it
+            return [task_data['_id'] for task_data in tasks[:inserted]]
+        except Exception as e:
+            print(f"Error creating tasks: {str(e)}")
+            return []
+
+    def create_transcript(self, text, source=None):
+        """Store a transcript once so tasks can reference it by id"""
+        try:
+            result = self.db.transcripts.insert_one({
+                'source': source,
+                'text': text,
+                'created_at': datetime.now()
+            })
+            return result.inserted_id
+        except Exception as e:
+            print(f"Error creating transcript: {str(e)}")
+            return None
+            
     def update_task(self, task_id, update_data):
         try:
             update_data['updated_at'] = datetime.now()
@@ -63,6 +109,8 @@ class DatabaseManager:
                 {"_id": ObjectId(task_id)},
                 {"$set": update_data}
             )
+            if result.modified_count:
+                self.bump_task_version()
             return result.modified_count > 0
         except Exception as e:
             print(f"Error updating task: {str(e)}")
@@ -85,6 +133,18 @@ class DatabaseManager:
             print(f"Error creating notification: {str(e)}")
             return None
             
+    def create_notifications(self, notifications):
+        try:
+            now = datetime.now()
+            for notification_data in notifications:
+                notification_data['created_at'] = now
+                notification_data['read'] = False
+            result = self.db.notifications.insert_many(notifications)
+            return result.inserted_ids
+        except Exception as e:
+            print(f"Error creating notifications: {str(e)}")
+            return []
+            
     def mark_notification_read(self, notification_id):
         try:
             result = self.db.notifications.update_one(
@@ -116,13 +176,31 @@ class DatabaseManager:
         ))
         
     def update_task_status(self, task_id, status):
-        return self.db.tasks.update_one(
+        result = self.db.tasks.update_one(
             {'_id': task_id},
             {'$set': {
                 'status': status,
                 'updated_at': datetime.now()
             }}
         )
+        if result.modified_count:
+            self.bump_task_version()
+        return result
+
+    def get_task_version(self):
+        """Counter bumped on every task write; None if it cannot be read"""
+        try:
+            counter = self.db.counters.find_one({"_id": "tasks"})
+            return counter["version"] if counter else 0
+        except Exception as e:
+            print(f"Error reading task version: {str(e)}")
+            return None
+
+    def bump_task_version(self):
+        try:
+            self.db.counters.update_one({"_id": "tasks"}, {"$inc": {"version": 1}}, upsert=True)
+        except Exception as e:
+            print(f"Error bumping task version: {str(e)}")
         
     def get_user_by_role(self, role):
         """Find a user by their employee role"""
@@ -144,6 +222,65 @@ class DatabaseManager:
             print(f"Error getting all tasks: {str(e)}")
             return []
 
+    def get_task_ids(self):
+        """Ids of every stored task, read from the _id index; None on error"""
+        try:
+            return {task['_id'] for task in self.db.tasks.find({}, {'_id': 1})}
+        except Exception as e:
+            print(f"Error getting task ids: {str(e)}")
+            return None
+
+    def delete_task(self, task_id):
+        try:
+            result = self.db.tasks.delete_one({"_id": ObjectId(task_id)})
+            if result.deleted_count:
+                self.bump_task_version()
+            return result.deleted_count > 0
+        except Exception as e:
+            print(f"Error deleting task: {str(e)}")
+            return False
+
+    def get_tasks_modified_since(self, since=None):
+        """Get tasks created or updated at or after a timestamp (all tasks if None)"""
+        try:
+            if since is None:
+                return list(self.db.tasks.find())
+            return list(self.db.tasks.find({"$or": [
+                {"created_at": {"$gte": since}},
+                {"updated_at": {"$gte": since}}
+            ]}))
+        except Exception as e:
+            print(f"Error getting modified tasks: {str(e)}")
+            return []
+
+    def get_tasks_in_range(self, start, end, assignee_id=None):
+        """Get tasks with a deadline in [start, end), both 'YYYY-MM-DD' strings"""
+        try:
+            query = {"deadline": {"$gte": start, "$lt": end}}
+            if assignee_id:
+                query["assignee_id"] = assignee_id
+            return list(self.db.tasks.find(query, {
+                "task_description": 1, "status": 1, "deadline": 1, "assignee_name": 1
+            }))
+        except Exception as e:
+            print(f"Error getting tasks between {start} and {end}: {str(e)}")
+            return []
+
+    def get_deadline_counts(self, start, end):
+        """Count tasks per deadline day, role and status for deadlines in [start, end)"""
+        try:
+            groups = self.db.tasks.aggregate([
+                {"$match": {"deadline": {"$gte": start, "$lt": end}}},
+                {"$group": {
+                    "_id": {"day": "$deadline", "role": "$role", "status": "$status"},
+                    "count": {"$sum": 1}
+                }}
+            ])
+            return [dict(group["_id"], count=group["count"]) for group in groups]
+        except Exception as e:
+            print(f"Error counting deadlines: {str(e)}")
+            return []
+
     def get_task(self, task_id):
         """Get a specific task by ID"""
         try:
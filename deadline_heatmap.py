@@ -0,0 +1,109 @@
+import streamlit as st
+import plotly.graph_objects as go
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from config import ThemeConfig as theme
+
+STATUS_FILTERS = {
+    'Open (pending + in progress)': ('pending', 'in_progress'),
+    'All tasks': None,
+    'Pending': ('pending',),
+    'In Progress': ('in_progress',),
+    'Completed': ('completed',)
+}
+
+# Aggregated rows keyed by (start, end, task version)
+_counts_cache = OrderedDict()
+_counts_cache_lock = threading.Lock()
+COUNTS_CACHE_SIZE = 16
+
+
+def deadline_counts(db_manager, start, end, version=None):
+    """Per (day, role, status) task counts, computed by MongoDB and cached per version"""
+    key = (start, end, version)
+    if version is not None:
+        with _counts_cache_lock:
+            if key in _counts_cache:
+                _counts_cache.move_to_end(key)
+                return _counts_cache[key]
+
+    rows = db_manager.get_deadline_counts(start, end)
+
+    if version is not None:
+        with _counts_cache_lock:
+            _counts_cache[key] = rows
+            while len(_counts_cache) > COUNTS_CACHE_SIZE:
+                _counts_cache.popitem(last=False)
+    return rows
+
+
+def create_heatmap(rows, start_date, days, statuses=None):
+    """Single heatmap trace: one column per day, one row per role"""
+    roles = sorted({row['role'] or 'Unassigned' for row in rows})
+    role_index = {role: i for i, role in enumerate(roles)}
+    z = [[0] * days for _ in roles]
+    breakdown = [[{} for _ in range(days)] for _ in roles]
+
+    for row in rows:
+        if statuses and row['status'] not in statuses:
+            continue
+        try:
+            day = (datetime.strptime(row['day'], '%Y-%m-%d').date() - start_date).days
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= day < days:
+            continue
+        role = role_index[row['role'] or 'Unassigned']
+        z[role][day] += row['count']
+        breakdown[role][day][row['status']] = breakdown[role][day].get(row['status'], 0) + row['count']
+
+    dates = [start_date + timedelta(days=i) for i in range(days)]
+    hover = [
+        [
+            f"<b>{role}</b><br>{date.strftime('%a %d %b %Y')}<br>{z[r][i]} tasks"
+            + ''.join(f"<br>{status.replace('_', ' ').title()}: {count}"
+                      for status, count in breakdown[r][i].items())
+            for i, date in enumerate(dates)
+        ]
+        for r, role in enumerate(roles)
+    ]
+
+    fig = go.Figure(go.Heatmap(
+        x=dates,
+        y=roles,
+        z=z,
+        text=hover,
+        hoverinfo='text',
+        xgap=1,
+        ygap=1,
+        colorscale=[[0, '#F3F4F6'], [0.001, theme.BG_PRIMARY], [1, theme.DANGER]],
+        colorbar=dict(title='Tasks')
+    ))
+    fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        height=120 + 40 * max(len(roles), 1),
+        margin=dict(t=20, l=0, r=0, b=0),
+        xaxis=dict(tickformat='%b %Y', dtick='M1', tickfont=dict(color=theme.TEXT_PRIMARY)),
+        yaxis=dict(tickfont=dict(color=theme.TEXT_PRIMARY))
+    )
+    return fig
+
+
+def show_deadline_heatmap(db_manager, version=None, days=365):
+    """Display deadline load per day and role for the coming year"""
+    st.markdown("### 🔥 Deadline Load")
+    status_filter = st.selectbox("Show", list(STATUS_FILTERS), key="heatmap_status")
+
+    start_date = datetime.now().date().replace(day=1)
+    end_date = start_date + timedelta(days=days)
+    if version is None:
+        version = db_manager.get_task_version()
+    rows = deadline_counts(db_manager, start_date.isoformat(), end_date.isoformat(), version)
+
+    if not rows:
+        st.info("No deadlines in the coming year")
+        return
+    fig = create_heatmap(rows, start_date, days, STATUS_FILTERS[status_filter])
+    st.plotly_chart(fig, use_container_width=True)
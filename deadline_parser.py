@@ -0,0 +1,230 @@
+import re
+import calendar
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+
+MONTHS = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12
+}
+
+WEEKDAYS = {
+    'monday': 0,
+    'tuesday': 1,
+    'wednesday': 2,
+    'thursday': 3,
+    'friday': 4,
+    'saturday': 5,
+    'sunday': 6
+}
+
+# Fixed day offsets for relative phrases
+RELATIVE_OFFSETS = {
+    'day after tomorrow': 2,
+    'end of day': 0,
+    'end of today': 0,
+    'eod': 0,
+    'today': 0,
+    'tonight': 0,
+    'this evening': 0,
+    'tomorrow': 1,
+    'next week': 7,
+    'this week': 7,
+    'next month': 30,
+    'this month': 30
+}
+
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+NOT_SPECIFIED = 'not specified'
+
+
+def _alternation(words):
+    """Build a regex alternation that tries longer phrases first"""
+    ordered = sorted(words, key=len, reverse=True)
+    return '|'.join(re.escape(word).replace(r'\ ', r'\s+') for word in ordered)
+
+
+_MONTH = _alternation(MONTHS)
+_ORDINAL = r'(?:st|nd|rd|th)?'
+
+# One combined grammar. search() returns the leftmost match and, at that
+# position, the first alternative that matches, so more specific forms are
+# listed first and no form may start earlier than the text it belongs to
+# (a bare 'the 15th' would otherwise shadow 'the 15th of March').
+DEADLINE_PATTERN = re.compile(
+    r'(?P<iso>\b\d{4}[-/]\d{1,2}[-/]\d{1,2})'
+    r'|(?P<numeric>\b\d{1,2}[-/.]\d{1,2}[-/.]\d{4})\b'
+    r'|\b(?P<md_month>' + _MONTH + r')\.?\s+(?P<md_day>\d{1,2})' + _ORDINAL +
+    r'(?:,?\s+(?P<md_year>\d{4}))?\b'
+    r'|\b(?P<dm_day>\d{1,2})' + _ORDINAL + r'\s+(?:of\s+)?(?P<dm_month>' + _MONTH + r')\b'
+    r'(?:,?\s+(?P<dm_year>\d{4}))?'
+    r'|\b(?P<end_of>end\s+of\s+(?:the\s+)?(?:week|month))\b'
+    r'|\b(?P<relative>' + _alternation(RELATIVE_OFFSETS) + r')\b'
+    r'|\bin\s+(?P<count>\d+|' + _alternation(NUMBER_WORDS) + r')\s+(?P<unit>day|week|month)s?\b'
+    r'|\b(?:(?:next|this|coming)\s+)?(?P<weekday>' + _alternation(WEEKDAYS) + r')\b'
+    r'|\b(?P<ord_day>\d{1,2})(?:st|nd|rd|th)\b',
+    re.IGNORECASE
+)
+
+# Groups that name a calendar date outright
+ABSOLUTE_GROUPS = ('iso', 'numeric', 'md_month', 'dm_month')
+
+
+def _clamp_date(year, month, day):
+    """Build a datetime, clamping the day to the length of the month"""
+    last_day = calendar.monthrange(year, month)[1]
+    return datetime(year, month, min(day, last_day))
+
+
+def _add_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class DeadlineParser:
+    """Parse deadline phrases (ISO, absolute, relative, weekday) into datetimes"""
+
+    def __init__(self, pattern=DEADLINE_PATTERN):
+        self.pattern = pattern
+
+    def parse(self, value, today=None):
+        """Parse a single deadline value; returns a datetime or None"""
+        # NaT is a datetime subclass and NaN a float; neither equals itself
+        if value is None or value != value:
+            return None
+        if isinstance(value, datetime):
+            return datetime(value.year, value.month, value.day)
+        if isinstance(value, date):
+            return datetime(value.year, value.month, value.day)
+        if not isinstance(value, str):
+            return None
+
+        text = value.strip().lower()
+        if not text or text == NOT_SPECIFIED:
+            return None
+
+        today = today or datetime.now()
+        return _parse_cached(self, text, today.toordinal())
+
+    def parse_many(self, values, today=None):
+        """Parse a batch of deadlines, parsing each distinct value only once"""
+        today = today or datetime.now()
+        parsed = {}
+        results = []
+        for value in values:
+            # Anything that is not a string or date (NaN, NaT, None, ...) has no deadline
+            key = value if isinstance(value, (str, datetime, date)) and value == value else None
+            if key not in parsed:
+                parsed[key] = self.parse(key, today)
+            results.append(parsed[key])
+        return results
+
+    def _match(self, text, today):
+        match = self.pattern.search(text)
+        if not match:
+            return None
+        if match.group('weekday'):
+            # "Friday, October 30": a date written after the weekday wins
+            for later in self.pattern.finditer(text, match.end()):
+                if any(later.group(name) for name in ABSOLUTE_GROUPS):
+                    match = later
+                    break
+
+        groups = match.groupdict()
+        base = datetime(today.year, today.month, today.day)
+
+        if groups['iso']:
+            year, month, day = (int(part) for part in re.split(r'[-/]', groups['iso']))
+            try:
+                return datetime(year, month, day)
+            except ValueError:
+                return None
+
+        if groups['numeric']:
+            # Month first, as pandas read these before; day first when that cannot be a month
+            first, second, year = (int(part) for part in re.split(r'[-/.]', groups['numeric']))
+            month, day = (first, second) if first <= 12 else (second, first)
+            try:
+                return datetime(year, month, day)
+            except ValueError:
+                return None
+
+        if groups['md_month'] or groups['dm_month']:
+            month_name = groups['md_month'] or groups['dm_month']
+            month = MONTHS[re.sub(r'\s+', ' ', month_name.lower())]
+            day = int(groups['md_day'] or groups['dm_day'])
+            year = groups['md_year'] or groups['dm_year']
+            if not 1 <= day <= 31:
+                return None
+            if year:
+                return _clamp_date(int(year), month, day)
+            candidate = _clamp_date(base.year, month, day)
+            if candidate < base:
+                candidate = _clamp_date(base.year + 1, month, day)
+            return candidate
+
+        if groups['end_of']:
+            if groups['end_of'].endswith('week'):
+                # Friday of the current week, or today if the week is nearly over
+                return base + timedelta(days=max(4 - base.weekday(), 0))
+            return _clamp_date(base.year, base.month, 31)
+
+        if groups['relative']:
+            phrase = re.sub(r'\s+', ' ', groups['relative'])
+            return base + timedelta(days=RELATIVE_OFFSETS[phrase])
+
+        if groups['count']:
+            count = groups['count']
+            number = int(count) if count.isdigit() else NUMBER_WORDS[count]
+            return base + timedelta(days=number * UNIT_DAYS[groups['unit']])
+
+        if groups['weekday']:
+            days_ahead = WEEKDAYS[groups['weekday']] - base.weekday()
+            if days_ahead <= 0:
+                days_ahead += 7
+            return base + timedelta(days=days_ahead)
+
+        if groups['ord_day']:
+            day = int(groups['ord_day'])
+            if not 1 <= day <= 31:
+                return None
+            year, month = base.year, base.month
+            if day < base.day:
+                year, month = _add_month(year, month)
+            return _clamp_date(year, month, day)
+
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(parser, text, today_ordinal):
+    return parser._match(text, datetime.fromordinal(today_ordinal))
+
+
+# Shared parser instance used by the extractor, calendar and dashboards
+deadline_parser = DeadlineParser()
+
+
+def parse_deadline(value, today=None):
+    """Parse a single deadline with the shared parser"""
+    return deadline_parser.parse(value, today)
+
+
+def parse_many(values, today=None):
+    """Parse a batch of deadlines with the shared parser"""
+    return deadline_parser.parse_many(values, today)
@@ -1,19 +1,27 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from streamlit_calendar import calendar
 import json
-from task_chat import TaskChat, show_chat_interface
+from task_chat import get_task_chat, stream_reply
 from calendar_view import show_calendar
 from config import ThemeConfig as theme
+from task_snapshot import TaskSnapshot
+from session_manager import rerun_fragment
 
-def show_employee_dashboard(db, db_manager, user):
-    # Initialize chat history if not exists
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
-    
+# Dashboard sections -> task status filter ('chat' for the assistant)
+EMPLOYEE_SECTIONS = {
+    "All Tasks": "all",
+    "Pending": "pending",
+    "In Progress": "in_progress",
+    "Completed": "completed",
+    "💬 Task Chat": "chat"
+}
+
+TASK_REFRESH_INTERVAL = "60s"
+
+def show_employee_dashboard(db, db_manager, user, snapshot=None):
     # Modern welcome header with user info
     st.markdown(
         f"""
@@ -44,13 +52,15 @@ def show_employee_dashboard(db, db_manager, user):
         unsafe_allow_html=True
     )
 
-    # Get employee's tasks using db_manager
-    tasks = db_manager.get_user_tasks(user["id"])
+    # Get employee's tasks once for the whole rerun
+    if snapshot is None:
+        snapshot = TaskSnapshot(db_manager, user["id"])
+    tasks = snapshot.tasks
     if not tasks:
         st.info("No tasks assigned yet")
         return
         
-    df = pd.DataFrame(tasks)
+    df = snapshot.frame()
     
     # Task Statistics with modern cards
     st.markdown("### 📊 Task Overview")
@@ -104,101 +114,114 @@ def show_employee_dashboard(db, db_manager, user):
         )
 
     # Add calendar view after stats
-    show_calendar(tasks, user_role="employee")
+    show_calendar(db_manager, user_role="employee", user_id=user["id"], version=snapshot.version)
 
-    # Task List and Chat Tabs
+    # Task List and Chat sections; only the selected one is rendered
     st.markdown("### 📝 Tasks & Chat")
-    main_tabs = st.tabs(["All Tasks", "Pending", "In Progress", "Completed", "💬 Task Chat"])
-    
-    # Initialize task chat
-    task_chat = TaskChat(db_manager)
-    
-    # First 4 tabs for task lists
-    for tab_index, (tab, status) in enumerate(zip(main_tabs[:4], ["all", "pending", "in_progress", "completed"])):
-        with tab:
-            filtered_df = df if status == "all" else df[df['status'] == status]
-            for idx, task in filtered_df.sort_values('created_at', ascending=False).iterrows():
-                with st.expander(f"{task['task_description']}", expanded=False):
-                    cols = st.columns([2, 1])
-                    with cols[0]:
-                        st.markdown(
-                            f"""
-                            <div style="margin-bottom: 0.5rem;">
-                                <span class="status-badge status-{task['status']}">{task['status'].replace('_', ' ').title()}</span>
-                            </div>
-                            <div style="color: #374151; margin-bottom: 0.5rem;">
-                                <strong>Deadline:</strong> {task['deadline']}
-                            </div>
-                            <div style="color: #6B7280; font-size: 0.875rem;">
-                                Created: {task['created_at'].strftime('%Y-%m-%d %H:%M')}
-                            </div>
-                            """,
-                            unsafe_allow_html=True
-                        )
-                    with cols[1]:
-                        select_key = f"status_{tab_index}_{task['_id']}_{status}"
-                        new_status = st.selectbox(
-                            "Update Status",
-                            options=['pending', 'in_progress', 'completed'],
-                            key=select_key,
-                            index=['pending', 'in_progress', 'completed'].index(task['status'])
-                        )
-                        if new_status != task['status']:
-                            button_key = f"save_{tab_index}_{task['_id']}_{status}"
-                            if st.button("Save", key=button_key, type="primary"):
-                                update_task_status(task, new_status, db_manager, user)
+    section = st.radio(
+        "Section",
+        list(EMPLOYEE_SECTIONS),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="employee_section"
+    )
     
-    # Chat tab
-    with main_tabs[4]:
-        st.markdown(
-            """
-            <div style="background-color: #F3F4F6; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
-                <h4 style="margin: 0; color: #374151;">💬 Task Assistant</h4>
-                <p style="margin: 0.5rem 0 0 0; color: #6B7280; font-size: 0.875rem;">
-                    Ask about any of your tasks - I have context for all of them
-                </p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        
-        # Display current tasks summary
-        with st.expander("Your Current Tasks", expanded=True):
-            for task in tasks:
+    if EMPLOYEE_SECTIONS[section] == "chat":
+        show_employee_chat(get_task_chat(db_manager), tasks, user)
+    else:
+        show_task_list(snapshot, EMPLOYEE_SECTIONS[section], db_manager, user)
+
+# Status edits rerun only the list; the timer picks up tasks assigned meanwhile
+@st.fragment(run_every=TASK_REFRESH_INTERVAL)
+def show_task_list(snapshot, status, db_manager, user):
+    """Task expanders for one status ('all' for every task)"""
+    snapshot.revalidate()
+    df = snapshot.frame()
+    if df.empty:
+        return
+    filtered_df = df if status == "all" else df[df['status'] == status]
+    for idx, task in filtered_df.sort_values('created_at', ascending=False).iterrows():
+        with st.expander(f"{task['task_description']}", expanded=False):
+            cols = st.columns([2, 1])
+            with cols[0]:
                 st.markdown(
                     f"""
-                    <div style="margin-bottom: 0.5rem; padding: 0.5rem; background-color: white; border-radius: 4px;">
-                        <div style="color: #374151; font-weight: 500;">{task['task_description']}</div>
-                        <div style="color: #6B7280; font-size: 0.875rem;">
-                            Status: {task['status'].replace('_', ' ').title()} | 
-                            Deadline: {task['deadline']}
-                        </div>
+                    <div style="margin-bottom: 0.5rem;">
+                        <span class="status-badge status-{task['status']}">{task['status'].replace('_', ' ').title()}</span>
+                    </div>
+                    <div style="color: #374151; margin-bottom: 0.5rem;">
+                        <strong>Deadline:</strong> {task['deadline']}
+                    </div>
+                    <div style="color: #6B7280; font-size: 0.875rem;">
+                        Created: {task['created_at'].strftime('%Y-%m-%d %H:%M')}
                     </div>
                     """,
                     unsafe_allow_html=True
                 )
-        
-        st.markdown("---")
-        
-        # Display chat history
-        for msg in st.session_state.chat_history:
-            with st.chat_message("user"):
-                st.write(msg['user'])
-            with st.chat_message("assistant"):
-                st.write(msg['assistant'])
-        
-        # Chat input
-        message = st.chat_input("Ask about your tasks...")
-        if message:
-            # Pass all tasks as context
-            response = task_chat.chat(
-                message=message,
-                task_id=None,  # No specific task
-                user={
-                    **user,
-                    'tasks': tasks  # Include all tasks in user context
-                }
+            with cols[1]:
+                select_key = f"status_{task['_id']}"
+                new_status = st.selectbox(
+                    "Update Status",
+                    options=['pending', 'in_progress', 'completed'],
+                    key=select_key,
+                    index=['pending', 'in_progress', 'completed'].index(task['status'])
+                )
+                if new_status != task['status']:
+                    button_key = f"save_{task['_id']}"
+                    if st.button("Save", key=button_key, type="primary"):
+                        update_task_status(task, new_status, db_manager, user, snapshot)
+
+def show_employee_chat(task_chat, tasks, user):
+    st.markdown(
+        """
+        <div style="background-color: #F3F4F6; padding: 1rem; border-radius: 8px; margin-bottom: 1rem;">
+            <h4 style="margin: 0; color: #374151;">💬 Task Assistant</h4>
+            <p style="margin: 0.5rem 0 0 0; color: #6B7280; font-size: 0.875rem;">
+                Ask about any of your tasks - I have context for all of them
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    
+    # Display current tasks summary
+    with st.expander("Your Current Tasks", expanded=True):
+        for task in tasks:
+            st.markdown(
+                f"""
+                <div style="margin-bottom: 0.5rem; padding: 0.5rem; background-color: white; border-radius: 4px;">
+                    <div style="color: #374151; font-weight: 500;">{task['task_description']}</div>
+                    <div style="color: #6B7280; font-size: 0.875rem;">
+                        Status: {task['status'].replace('_', ' ').title()} | 
+                        Deadline: {task['deadline']}
+                    </div>
+                </div>
+                """,
+                unsafe_allow_html=True
             )
+    
+    st.markdown("---")
+    
+    # Display chat history
+    for msg in task_chat.load_history(user):
+        with st.chat_message("user"):
+            st.write(msg['user'])
+        with st.chat_message("assistant"):
+            st.write(msg['assistant'])
+    
+    # Chat input
+    message = st.chat_input("Ask about your tasks...")
+    if message:
+        # Pass all tasks as context
+        stream_reply(
+            task_chat,
+            message,
+            task_id=None,  # No specific task
+            user={
+                **user,
+                'tasks': tasks  # Include all tasks in user context
+            }
+        )
 
 def get_status_color(status):
     colors = {
@@ -208,9 +231,11 @@ def get_status_color(status):
     }
     return colors.get(status, '#808080')
 
-def update_task_status(task, new_status, db_manager, user):
+def update_task_status(task, new_status, db_manager, user, snapshot=None):
     """Helper function to update task status"""
     if db_manager.update_task(task['_id'], {'status': new_status}):
+        if snapshot is not None:
+            snapshot.update_task(task['_id'], {'status': new_status})
         notification_data = {
             'user_id': user['id'],
             'task_id': str(task['_id']),
@@ -218,6 +243,6 @@ def update_task_status(task, new_status, db_manager, user):
             'type': 'status_update'
         }
         db_manager.create_notification(notification_data)
-        st.rerun()
+        rerun_fragment()
     else:
         st.error("Failed to update task status") 
\ No newline at end of file
@@ -0,0 +1,113 @@
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from pathlib import Path
+
+from meeting_task_manager import MeetingTaskManager
+
+
+def iter_transcripts(paths, pattern='*.txt'):
+    """Yield (name, text) for every transcript in files, directories or stdin ('-')"""
+    for path in paths:
+        if path == '-':
+            yield '<stdin>', sys.stdin.read()
+            continue
+
+        path = Path(path)
+        files = sorted(path.rglob(pattern)) if path.is_dir() else [path]
+        for file in files:
+            try:
+                yield str(file), file.read_text(encoding='utf-8', errors='replace')
+            except OSError as e:
+                print(f"Error reading {file}: {str(e)}")
+
+
+def extract_file(manager, name, text):
+    """Extract and assign the tasks of one transcript"""
+    batch = []
+    for task in manager.task_extractor.extract_tasks_windowed(text):
+        task_data = manager.build_task_data(task)
+        if task_data:
+            task_data['source'] = name
+            batch.append(task_data)
+    
+    # Store the transcript once and reference it rather than copying it into every task
+    if batch:
+        transcript_id = manager.db_manager.create_transcript(text, name)
+        for task_data in batch:
+            task_data['transcript_id'] = transcript_id
+    return batch
+
+
+def run_import(paths, pattern='*.txt', workers=4, batch_size=100):
+    manager = MeetingTaskManager()
+    started = time.monotonic()
+    transcript_count, task_count, pending = 0, 0, []
+
+    def collect(done):
+        nonlocal transcript_count, task_count, pending
+        for future in done:
+            name = futures.pop(future)
+            transcript_count += 1
+            try:
+                tasks = future.result()
+            except Exception as e:
+                print(f"Error processing {name}: {str(e)}")
+                continue
+            task_count += len(tasks)
+            pending.extend(tasks)
+        if len(pending) >= batch_size:
+            manager.task_queue.add_tasks(pending)
+            pending = []
+
+    futures = {}
+    try:
+        # LLM calls are I/O bound; the shared gateway enforces the rate limits.
+        # Only a few transcripts per worker are held in memory at a time.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for name, text in iter_transcripts(paths, pattern):
+                if not text.strip():
+                    continue
+                if len(futures) >= workers * 2:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    collect(done)
+                futures[pool.submit(extract_file, manager, name, text)] = name
+            collect(list(as_completed(futures)))
+
+        manager.task_queue.add_tasks(pending)
+        manager.task_queue.join()
+    finally:
+        manager.task_queue.stop()
+        manager.client.close()
+
+    elapsed = time.monotonic() - started
+    print_report(transcript_count, task_count, elapsed, manager.task_extractor, manager.task_queue)
+
+
+def print_report(transcript_count, task_count, elapsed, task_extractor, task_queue):
+    elapsed = max(elapsed, 1e-9)
+    metrics = task_extractor.gateway.metrics()
+    print("\nImport complete")
+    print(f"  Transcripts:  {transcript_count} ({transcript_count / elapsed:.2f}/sec)")
+    print(f"  Tasks:        {task_count} ({task_count / elapsed:.2f}/sec), "
+          f"{task_queue.stats['stored']} stored, {task_queue.stats['failed']} failed")
+    print(f"  Elapsed:      {elapsed:.1f}s")
+    print(f"  LLM requests: {metrics['requests']} ({metrics['failures']} failed, "
+          f"{metrics['rate_limited']} rate limited, {metrics['hedges']} hedged)")
+    for lane, lane_metrics in metrics['lanes'].items():
+        if lane_metrics['samples']:
+            print(f"  {lane.title()} queue wait: avg {lane_metrics['avg_wait']:.2f}s, "
+                  f"p95 {lane_metrics['p95_wait']:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import meeting transcripts and extract their tasks")
+    parser.add_argument('paths', nargs='*', default=['-'],
+                        help="Transcript files or directories; '-' reads stdin (default)")
+    parser.add_argument('--pattern', default='*.txt', help="File pattern when scanning directories")
+    parser.add_argument('--workers', type=int, default=4, help="Transcripts processed concurrently")
+    parser.add_argument('--batch-size', type=int, default=100, help="Tasks per bulk insert")
+    args = parser.parse_args()
+
+    run_import(args.paths, args.pattern, args.workers, args.batch_size)
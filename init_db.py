@@ -3,6 +3,7 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 from auth import hash_password
+from role_taxonomy import seed_roles
 
 load_dotenv()
 
@@ -13,7 +14,14 @@ def init_database():
     # Create indexes
     db.users.create_index("email", unique=True)
     db.tasks.create_index("assignee_id")
+    # Month-scoped calendar queries are range scans on the deadline string
+    db.tasks.create_index("deadline")
+    db.tasks.create_index([("assignee_id", 1), ("deadline", 1)])
     db.notifications.create_index("user_id")
+    db.chat_messages.create_index([("user_id", 1), ("timestamp", -1)])
+    
+    # Seed the role taxonomy used for extraction and job role dropdowns
+    seed_roles(db)
     
     # Create default admin if not exists
     if not db.users.find_one({"email": "admin@example.com"}):
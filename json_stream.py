@@ -0,0 +1,152 @@
+import json
+
+
+class JSONArrayStream:
+    """Incrementally parse a JSON array of objects fed in arbitrary chunks.
+
+    Anything before the opening '[' (such as a markdown fence) is skipped, and
+    each top-level object is returned as soon as its closing brace arrives, so
+    a truncated response still yields every object that was complete.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.object_start = None
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the objects it completed"""
+        objects = []
+        if self.finished or not chunk:
+            return objects
+
+        self.buffer += chunk
+        buffer = self.buffer
+        i = self.pos
+
+        while i < len(buffer):
+            char = buffer[i]
+
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                i += 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 0:
+                    self.object_start = i
+                self.depth += 1
+            elif char in '}]':
+                if self.depth == 0:
+                    # Closing bracket of the top-level array
+                    self.finished = True
+                    i += 1
+                    break
+                self.depth -= 1
+                if self.depth == 0:
+                    obj = self._decode(buffer[self.object_start:i + 1])
+                    if obj is not None:
+                        objects.append(obj)
+                    self.object_start = None
+            i += 1
+
+        # Drop text that can no longer be part of an object
+        keep_from = self.object_start if self.object_start is not None else i
+        self.buffer = buffer[keep_from:]
+        self.pos = i - keep_from
+        if self.object_start is not None:
+            self.object_start = 0
+        return objects
+
+    def _decode(self, text):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"Skipping malformed object in stream: {str(e)}")
+            return None
+
+    @property
+    def pending(self):
+        """Text of an object that was started but never closed"""
+        return self.buffer if self.object_start is not None else ''
+
+
+def close_truncated(text):
+    """Close the strings, objects and arrays left open in truncated JSON"""
+    stack, in_string, escape = [], False, False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+
+    # A value cut mid-string would be silently wrong, and a dangling colon
+    # cannot be closed into valid JSON
+    closed = text.rstrip().rstrip(',')
+    if in_string or closed.endswith(':'):
+        return None
+    return closed + ''.join(reversed(stack))
+
+
+def repair_json_array(text):
+    """Parse a model response into a list, salvaging what it can locally.
+
+    Returns (items, repaired) where repaired is True if the text was not
+    a clean JSON array and had to be fixed up.
+    """
+    text = (text or '').strip()
+    try:
+        data = json.loads(text)
+        if isinstance(data, list):
+            return data, False
+        if isinstance(data, dict):
+            # Either a wrapper like {"tasks": [...]} or a single bare object
+            for value in data.values():
+                if isinstance(value, list):
+                    return value, True
+            return [data], True
+    except json.JSONDecodeError:
+        pass
+
+    stream = JSONArrayStream()
+    if '[' not in text and '{' in text:
+        text = '[' + text[text.index('{'):]
+    items = stream.feed(text)
+
+    # Close the truncated final object, backing off to the last complete
+    # member if the cut fell inside a key or value
+    pending = stream.pending
+    while pending:
+        closed = close_truncated(pending)
+        try:
+            if closed:
+                items.append(json.loads(closed))
+                break
+        except json.JSONDecodeError:
+            pass
+        pending = pending[:pending.rfind(',')] if ',' in pending else ''
+    return items, True
@@ -0,0 +1,378 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    from google.api_core.exceptions import ResourceExhausted
+except ImportError:
+    ResourceExhausted = None
+
+# Priority lanes: lower values are admitted first
+PRIORITY_EXTRACTION = 0
+PRIORITY_CHAT = 1
+
+LANE_NAMES = {
+    PRIORITY_EXTRACTION: 'extraction',
+    PRIORITY_CHAT: 'chat'
+}
+
+DEFAULT_MODEL = 'gemini-1.5-flash'
+
+# Rough output allowance added to the prompt estimate for rate limiting
+EXPECTED_OUTPUT_TOKENS = 500
+
+# Latency samples needed before hedging uses the observed p95
+MIN_HEDGE_SAMPLES = 20
+
+
+class LLMTimeoutError(Exception):
+    """Raised when a request waits or runs longer than its timeout"""
+
+
+def estimate_tokens(text):
+    return max(1, len(str(text)) // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until amount tokens are available (0 if available now)"""
+        self._refill(now)
+        # Requests larger than the bucket only need it to be full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        # May go negative when correcting an underestimate; refill repays it
+        self.tokens -= amount
+
+
+class GatewayStream:
+    """Streaming response that holds its gateway slot until consumed or closed"""
+
+    def __init__(self, gateway, response, estimated_tokens):
+        self.gateway = gateway
+        self.response = response
+        self.estimated_tokens = estimated_tokens
+        self._released = False
+
+    def __iter__(self):
+        try:
+            for chunk in self.response:
+                yield chunk
+        except Exception as e:
+            self.gateway._record_failure(e)
+            raise
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self.gateway._release(self.estimated_tokens, self.response)
+
+    def __del__(self):
+        # An abandoned stream must not leak its in-flight slot
+        self.close()
+
+
+class LLMGateway:
+    """Process-wide gate for every Gemini call: rate limits, concurrency and lanes"""
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(LLMGateway, cls).__new__(cls)
+                cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self.max_in_flight = int(os.getenv('LLM_MAX_IN_FLIGHT', 4))
+        self.timeout = float(os.getenv('LLM_TIMEOUT', 60))
+        self.max_retries = int(os.getenv('LLM_MAX_RETRIES', 2))
+        self.requests = TokenBucket(int(os.getenv('LLM_REQUESTS_PER_MINUTE', 15)))
+        self.tokens = TokenBucket(int(os.getenv('LLM_TOKENS_PER_MINUTE', 1000000)))
+
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+
+        self.stats = {
+            'requests': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'rate_limited': 0
+        }
+        self.queue_waits = {lane: deque(maxlen=500) for lane in LANE_NAMES}
+
+        # Hedging: duplicate a slow request after the observed p95 latency,
+        # spending at most hedge_ratio extra requests per hedged call
+        self.hedge_ratio = float(os.getenv('LLM_HEDGE_RATIO', 0.1))
+        self.hedge_default_delay = float(os.getenv('LLM_HEDGE_DELAY', 3))
+        self.hedge_credit = 1.0
+        self.latencies = {}
+        self.hedge_stats = {'hedged_calls': 0, 'hedges': 0, 'hedge_wins': 0, 'hedge_denied': 0}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight * 2 + 2, thread_name_prefix='llm-hedge'
+        )
+
+        # Gemini client: configured on first use, one model object per name
+        self._models = {}
+        self._configured = False
+        self._models_lock = threading.Lock()
+
+    def _acquire(self, priority, tokens, timeout):
+        ticket = (priority, next(self._sequence))
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._waiting[0] == ticket and self._in_flight < self.max_in_flight:
+                        now = time.monotonic()
+                        wait = max(
+                            self.requests.wait_time(1, now),
+                            self.tokens.wait_time(tokens, now)
+                        )
+                        if wait <= 0:
+                            heapq.heappop(self._waiting)
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            self._in_flight += 1
+                            self.stats['requests'] += 1
+                            self.queue_waits.setdefault(priority, deque(maxlen=500)).append(now - started)
+                            # The next ticket may be admissible too
+                            self._cond.notify_all()
+                            return
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise LLMTimeoutError(
+                            f"Waited {timeout:.0f}s for an LLM slot ({LANE_NAMES.get(priority, priority)} lane)"
+                        )
+                    self._cond.wait(min(remaining, wait) if wait else remaining)
+            except BaseException:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+
+    def _release(self, estimated_tokens, response=None):
+        with self._cond:
+            self._in_flight -= 1
+            # Settle the token bucket with the real usage when the API reports it
+            usage = getattr(response, 'usage_metadata', None)
+            actual = getattr(usage, 'total_token_count', None) if usage else None
+            if actual:
+                self.tokens.consume(actual - estimated_tokens)
+            self._cond.notify_all()
+
+    def model(self, name=None, api_key=None):
+        """Shared GenerativeModel, configuring the Gemini client on first use"""
+        name = name or os.getenv('GEMINI_MODEL', DEFAULT_MODEL)
+        with self._models_lock:
+            if name not in self._models:
+                import google.generativeai as genai
+                if not self._configured:
+                    genai.configure(api_key=api_key or os.getenv('GEMINI_API_KEY'))
+                    self._configured = True
+                self._models[name] = genai.GenerativeModel(name)
+            return self._models[name]
+
+    def generate(self, model, prompt, priority=PRIORITY_CHAT, stream=False, timeout=None, on_dispatch=None, **kwargs):
+        """Call model.generate_content under the shared limits.
+
+        on_dispatch, if given, is called with the monotonic time at which the
+        request left the queue.
+        """
+        timeout = timeout or self.timeout
+        estimated = estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS
+        kwargs.setdefault('request_options', {'timeout': timeout})
+        if stream:
+            kwargs['stream'] = True
+
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority, estimated, timeout)
+            started = time.monotonic()
+            if on_dispatch:
+                on_dispatch(started)
+            try:
+                response = model.generate_content(prompt, **kwargs)
+                if not stream:
+                    self._record_latency((priority, False), time.monotonic() - started)
+            except Exception as e:
+                self._release(estimated)
+                if ResourceExhausted and isinstance(e, ResourceExhausted) and attempt < self.max_retries:
+                    # Quota exceeded elsewhere: drain the request bucket and retry
+                    with self._cond:
+                        self.stats['rate_limited'] += 1
+                        self.requests.consume(self.requests.tokens)
+                    time.sleep(2 ** attempt)
+                    continue
+                self._record_failure(e)
+                raise
+
+            if stream:
+                return GatewayStream(self, response, estimated)
+            self._release(estimated, response)
+            return response
+
+    def _record_latency(self, key, seconds):
+        with self._cond:
+            self.latencies.setdefault(key, deque(maxlen=200)).append(seconds)
+
+    def hedge_delay(self, priority, stream=False):
+        """Seconds to wait before hedging: the observed p95 latency"""
+        with self._cond:
+            samples = sorted(self.latencies.get((priority, stream), ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return self.hedge_default_delay
+        return max(0.2, samples[int(len(samples) * 0.95)])
+
+    def _take_hedge_credit(self):
+        with self._cond:
+            if self.hedge_credit >= 1:
+                self.hedge_credit -= 1
+                self.hedge_stats['hedges'] += 1
+                return True
+            return False
+
+    def _open_stream(self, model, prompt, priority, on_dispatch=None, **kwargs):
+        """Start a stream and wait for its first chunk"""
+        dispatched = []
+
+        def dispatch(now):
+            dispatched.append(now)
+            if on_dispatch:
+                on_dispatch(now)
+
+        response = self.generate(model, prompt, priority=priority, stream=True, on_dispatch=dispatch, **kwargs)
+        chunks = iter(response)
+        first = next(chunks, None)
+        # Time to first chunk from dispatch, like the non-streaming samples
+        self._record_latency((priority, True), time.monotonic() - dispatched[-1])
+        return response, chunks, first
+
+    def generate_hedged(self, model, prompt, priority=PRIORITY_EXTRACTION, stream=False, **kwargs):
+        """Like generate, but fire a duplicate if the first call is slower than p95.
+
+        For streams the race is on time to first chunk. Whichever call
+        finishes first wins; the loser is left to finish and discarded.
+        The hedge delay is measured from when the primary call leaves the
+        queue, as the latency samples are.
+        """
+        with self._cond:
+            self.hedge_stats['hedged_calls'] += 1
+            self.hedge_credit = min(5.0, self.hedge_credit + self.hedge_ratio)
+
+        if stream:
+            call = lambda on_dispatch=None: self._open_stream(model, prompt, priority, on_dispatch=on_dispatch, **kwargs)
+        else:
+            call = lambda on_dispatch=None: self.generate(model, prompt, priority=priority, on_dispatch=on_dispatch, **kwargs)
+
+        dispatched = threading.Event()
+        primary = self._executor.submit(call, lambda now: dispatched.set())
+        # A call that fails while still queued never dispatches
+        primary.add_done_callback(lambda future: dispatched.set())
+        futures = [primary]
+        dispatched.wait()
+        done, _ = wait(futures, timeout=self.hedge_delay(priority, stream))
+        if not done:
+            if self._take_hedge_credit():
+                futures.append(self._executor.submit(call))
+            else:
+                with self._cond:
+                    self.hedge_stats['hedge_denied'] += 1
+
+        winner = self._first_success(futures)
+        if winner is not primary:
+            with self._cond:
+                self.hedge_stats['hedge_wins'] += 1
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(self._discard)
+
+        if not stream:
+            return winner.result()
+        response, chunks, first = winner.result()
+        return self._chain(response, chunks, first)
+
+    def _first_success(self, futures):
+        pending, error = set(futures), None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Prefer the earliest submitted call if both finished together
+            for future in futures:
+                if future in done:
+                    if future.exception() is None:
+                        return future
+                    error = future.exception()
+        raise error
+
+    def _discard(self, future):
+        if future.exception() is None and isinstance(future.result(), tuple):
+            # Losing stream: release its slot without reading the rest
+            future.result()[0].close()
+
+    def _chain(self, response, chunks, first):
+        try:
+            if first is not None:
+                yield first
+            for chunk in chunks:
+                yield chunk
+        finally:
+            response.close()
+
+    def _record_failure(self, error):
+        with self._cond:
+            self.stats['failures'] += 1
+            if 'timeout' in str(error).lower() or 'deadline' in str(error).lower():
+                self.stats['timeouts'] += 1
+
+    def metrics(self):
+        """Snapshot of counters, queue depth and queue-wait percentiles per lane"""
+        with self._cond:
+            lanes = {}
+            for priority, waits in self.queue_waits.items():
+                ordered = sorted(waits)
+                lanes[LANE_NAMES.get(priority, str(priority))] = {
+                    'samples': len(ordered),
+                    'avg_wait': sum(ordered) / len(ordered) if ordered else 0,
+                    'p95_wait': ordered[int(len(ordered) * 0.95)] if ordered else 0
+                }
+            return {
+                **self.stats,
+                **self.hedge_stats,
+                'hedge_win_rate': (
+                    self.hedge_stats['hedge_wins'] / self.hedge_stats['hedges']
+                    if self.hedge_stats['hedges'] else 0
+                ),
+                'in_flight': self._in_flight,
+                'waiting': len(self._waiting),
+                'lanes': lanes
+            }
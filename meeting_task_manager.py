@@ -1,14 +1,19 @@
 import speech_recognition as sr
-import google.generativeai as genai
 from pymongo import MongoClient
 from datetime import datetime
 import json
 import os
+import argparse
 from task_extractor import TaskExtractor
 from database_manager import DatabaseManager
 from audio_processor import AudioProcessor
 from config import load_config
 from task_queue import TaskQueue
+from role_taxonomy import get_role_taxonomy
+from roster_index import RosterIndex
+from transcript_window import TranscriptWindow, TaskDeduplicator
+from llm_gateway import LLMGateway
+from recording_ingest import transcribe_recording, RECOGNIZER_BACKENDS
 from dotenv import load_dotenv
 
 class MeetingTaskManager:
@@ -21,14 +26,18 @@ class MeetingTaskManager:
         self.client = MongoClient(os.getenv('MONGODB_URI'))
         self.db = self.client.task_manager
         
-        # Initialize Gemini API
-        genai.configure(api_key=config['gemini_api_key'])
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        # Shared Gemini model, configured once per process
+        self.model = LLMGateway().model(api_key=config['gemini_api_key'])
         
         # Initialize components
         self.db_manager = DatabaseManager(self.db)
-        self.task_extractor = TaskExtractor(self.model)
+        self.roster = RosterIndex(self.db)
+        self.task_extractor = TaskExtractor(
+            self.model, get_role_taxonomy(self.db), self.roster, structured=True, hedge=True
+        )
         self.audio_processor = AudioProcessor()
+        self.transcript_window = TranscriptWindow()
+        self.task_deduplicator = TaskDeduplicator()
         
         # Initialize task queue
         self.task_queue = TaskQueue(self.db_manager)
@@ -36,6 +45,8 @@ class MeetingTaskManager:
     def start_meeting(self):
         print("Starting meeting recording...")
         print("Press Ctrl+C to stop the meeting")
+        # Keep the microphone open so no speech is lost while extracting
+        self.audio_processor.start_continuous()
         try:
             while True:
                 try:
@@ -46,30 +57,13 @@ class MeetingTaskManager:
                     
                     print("\nTranscript:", transcript)
                         
-                    # Extract tasks using Gemini
-                    tasks = self.task_extractor.extract_tasks(transcript)
-                    
-                    # Process and queue tasks
-                    for task in tasks:
-                        # Find employee by role
-                        employee = self.db_manager.get_user_by_role(task['role'])
-                        if employee:
-                            task_data = {
-                                'task_description': task['task'],
-                                'assignee_name': employee['name'],
-                                'assignee_id': str(employee['_id']),
-                                'role': task['role'],
-                                'deadline': task['deadline'],
-                                'status': 'pending',
-                                'created_at': datetime.now(),
-                                'original_transcript': transcript
-                            }
-                            
-                            # Add task to queue for processing
-                            self.task_queue.add_task(task_data)
-                            print(f"\nTask queued: {task_data['task_description']}")
-                        else:
-                            print(f"\nWarning: No employee found for role: {task['role']}")
+                    # Extract tasks using Gemini, queueing each one as soon as it is parsed.
+                    # The window carries a little prior context into each bounded prompt.
+                    for context, text in self.transcript_window.add(transcript):
+                        self.task_deduplicator.next_window(context)
+                        for task in self.task_extractor.extract_tasks_stream(text, context):
+                            if self.task_deduplicator.is_new(task):
+                                self.queue_task(task, transcript)
                         
                 except KeyboardInterrupt:
                     raise KeyboardInterrupt
@@ -80,9 +74,73 @@ class MeetingTaskManager:
             print("\nMeeting recording stopped.")
         finally:
             # Clean up
+            self.audio_processor.stop_continuous()
+            self.task_queue.stop()
+            self.client.close()
+
+    def process_recording(self, path, backend='google', workers=None):
+        """Transcribe a recorded meeting file and queue the tasks found in it"""
+        try:
+            transcript = transcribe_recording(path, backend, workers)
+            if not transcript:
+                print("No speech found in recording")
+                return
+            
+            transcript_id = self.db_manager.create_transcript(transcript, path)
+            window = TranscriptWindow()
+            deduplicator = TaskDeduplicator()
+            for context, text in window.chunk(transcript):
+                deduplicator.next_window(context)
+                for task in self.task_extractor.extract_tasks_stream(text, context):
+                    if deduplicator.is_new(task):
+                        self.queue_task(task, text, transcript_id)
+            
+            # Let the queue store everything before shutting down
+            self.task_queue.join()
+        finally:
             self.task_queue.stop()
             self.client.close()
 
+    def build_task_data(self, task, transcript=None, transcript_id=None):
+        """Assign an extracted task to an employee; returns None if nobody fits.
+
+        Short live utterances are stored on the task; longer transcripts are
+        stored once with create_transcript and referenced by transcript_id.
+        """
+        # Use the assignee resolved during extraction, or find an employee by role
+        if task.get('assignee_id'):
+            employee = self.roster.get(task['assignee_id'])
+        else:
+            employee = self.roster.find_by_role(task['role'])
+        if not employee:
+            print(f"\nWarning: No employee found for role: {task['role']}")
+            return None
+        
+        task_data = {
+            'task_description': task['task'],
+            'assignee_name': employee['name'],
+            'assignee_id': str(employee['_id']),
+            'role': task['role'],
+            'deadline': task['deadline'],
+            'status': 'pending',
+            'created_at': datetime.now()
+        }
+        if transcript_id:
+            task_data['transcript_id'] = transcript_id
+        elif transcript:
+            task_data['original_transcript'] = transcript
+        return task_data
+
+    def queue_task(self, task, transcript=None, transcript_id=None):
+        """Assign an extracted task to an employee and add it to the queue"""
+        task_data = self.build_task_data(task, transcript, transcript_id)
+        if task_data:
+            # Add task to queue for processing
+            self.task_queue.add_task(task_data)
+            print(f"\nTask queued: {task_data['task_description']}")
+            return True
+        return False
+
     def process_task(self, task, db_manager):
         employee = db_manager.get_user_by_role(task['role'])
         if employee:
@@ -110,5 +168,15 @@ class MeetingTaskManager:
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract tasks from a live or recorded meeting")
+    parser.add_argument('--recording', help="WAV/AIFF/FLAC file to process instead of the microphone")
+    parser.add_argument('--backend', default='google', choices=sorted(RECOGNIZER_BACKENDS),
+                        help="Speech recognizer for recordings (sphinx and whisper run offline)")
+    parser.add_argument('--workers', type=int, help="Transcription processes (default: CPU count)")
+    args = parser.parse_args()
+    
     manager = MeetingTaskManager()
-    manager.start_meeting() 
\ No newline at end of file
+    if args.recording:
+        manager.process_recording(args.recording, args.backend, args.workers)
+    else:
+        manager.start_meeting() 
\ No newline at end of file
@@ -0,0 +1,116 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import speech_recognition as sr
+from voice_activity import (
+    VoiceActivityDetector, audio_samples, frame_energy, estimate_energy_threshold,
+    recording_energy_threshold, FRAME_SECONDS
+)
+
+# Recognizer method per backend; sphinx and whisper run offline on the CPU
+RECOGNIZER_BACKENDS = {
+    'google': 'recognize_google',
+    'sphinx': 'recognize_sphinx',
+    'whisper': 'recognize_whisper'
+}
+
+_worker_recognizer = None
+
+
+def load_recording(path):
+    """Read a WAV/AIFF/FLAC recording into mono AudioData"""
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(path) as source:
+        return recognizer.record(source)
+
+
+def split_on_silence(audio, min_silence=0.5, max_chunk_seconds=30, energy_threshold=None):
+    """Split AudioData at pauses; returns a list of AudioData chunks in order"""
+    samples = audio_samples(audio)
+    frame_length = max(1, int(audio.sample_rate * FRAME_SECONDS))
+    energy = frame_energy(samples, frame_length)
+    if not len(energy):
+        return []
+
+    # Silence is anything close to the noise floor relative to typical speech
+    if energy_threshold is None:
+        energy_threshold = estimate_energy_threshold(energy)
+    silent = energy < energy_threshold
+
+    min_silent_frames = max(1, int(min_silence / FRAME_SECONDS))
+    max_frames = max(1, int(max_chunk_seconds / FRAME_SECONDS))
+
+    # Candidate cut points: the middle of every long enough silent run
+    cuts = []
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.astype(np.int8), [0]))))
+    for start, end in zip(edges[::2], edges[1::2]):
+        if end - start >= min_silent_frames:
+            cuts.append((start + end) // 2)
+
+    boundaries, chunk_start = [0], 0
+    for cut in cuts + [len(energy)]:
+        # Chunks that would run too long are split at their quietest frame
+        while cut - chunk_start > max_frames:
+            window = energy[chunk_start + max_frames // 2:chunk_start + max_frames]
+            split = chunk_start + max_frames // 2 + int(np.argmin(window))
+            boundaries.append(split)
+            chunk_start = split
+        if cut > chunk_start:
+            boundaries.append(cut)
+            chunk_start = cut
+
+    chunks = []
+    bytes_per_frame = frame_length * audio.sample_width
+    for start, end in zip(boundaries, boundaries[1:]):
+        if silent[start:end].all():
+            continue
+        data = audio.frame_data[start * bytes_per_frame:end * bytes_per_frame]
+        chunks.append(sr.AudioData(data, audio.sample_rate, audio.sample_width))
+    return chunks
+
+
+def _init_worker():
+    global _worker_recognizer
+    _worker_recognizer = sr.Recognizer()
+
+
+def transcribe_chunk(args):
+    """Transcribe one chunk in a worker process; returns '' for unintelligible audio"""
+    frame_data, sample_rate, sample_width, backend = args
+    recognizer = _worker_recognizer or sr.Recognizer()
+    audio = sr.AudioData(frame_data, sample_rate, sample_width)
+    try:
+        return getattr(recognizer, RECOGNIZER_BACKENDS[backend])(audio)
+    except sr.UnknownValueError:
+        return ''
+    except sr.RequestError as e:
+        print(f"Could not request results; {e}")
+        return ''
+
+
+def transcribe_recording(path, backend='google', workers=None):
+    """Transcribe a recorded meeting in parallel, returning the text in order"""
+    if backend not in RECOGNIZER_BACKENDS:
+        raise ValueError(f"Unknown recognizer backend: {backend}")
+
+    started = time.monotonic()
+    audio = load_recording(path)
+    duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    threshold = recording_energy_threshold(audio)
+    chunks = split_on_silence(audio, energy_threshold=threshold)
+    
+    # Trim each chunk to its speech and drop the ones with none
+    vad = VoiceActivityDetector()
+    speech_chunks = [trimmed for trimmed in (vad.trim(chunk, threshold) for chunk in chunks) if trimmed]
+    print(f"Split {duration:.0f}s recording into {len(chunks)} chunks, {len(speech_chunks)} with speech")
+
+    jobs = [(chunk.frame_data, chunk.sample_rate, chunk.sample_width, backend) for chunk in speech_chunks]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker) as pool:
+        # map() yields results in submission order, so the transcript stays in sequence
+        texts = list(pool.map(transcribe_chunk, jobs))
+
+    elapsed = time.monotonic() - started
+    print(f"Transcribed in {elapsed:.1f}s ({duration / elapsed if elapsed else 0:.1f}x real time)")
+    return ' '.join(text for text in texts if text)
@@ -0,0 +1,260 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Seed taxonomy, used when the roles collection is empty
+DEFAULT_ROLES = [
+    {
+        'name': 'Sales Analyst',
+        'synonyms': ['sales', 'sales analyst', 'sales rep', 'sales representative'],
+        'hints': ['sales', 'reports', 'analytics', 'revenue']
+    },
+    {
+        'name': 'Presentation Designer',
+        'synonyms': ['presentation', 'designer', 'presentation designer'],
+        'hints': ['presentations', 'slides', 'design', 'visuals']
+    },
+    {
+        'name': 'Software Engineer',
+        'synonyms': ['engineer', 'developer', 'software engineer', 'programmer'],
+        'hints': ['code', 'development', 'technical', 'bugs']
+    },
+    {
+        'name': 'Marketing Manager',
+        'synonyms': ['marketing', 'marketing manager', 'marketing lead'],
+        'hints': ['marketing', 'campaigns', 'social media', 'promotion']
+    }
+]
+
+SETTINGS_ID = 'role_taxonomy'
+
+
+class RoleMatcher:
+    """Aho-Corasick automaton mapping synonyms to canonical roles in one pass"""
+
+    def __init__(self, synonyms):
+        # State 0 is the root; each state has transitions, a failure link, the
+        # (length, role) pattern ending exactly in it and a dictionary-suffix
+        # link to the next state on its failure chain that ends a pattern
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+        self.dict_link = [0]
+
+        for synonym, role in synonyms.items():
+            self._add(synonym, role)
+        self._build()
+
+    def _add(self, synonym, role):
+        state = 0
+        for char in synonym:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.dict_link.append(0)
+            state = next_state
+        self.output[state] = (len(synonym), role)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                link = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = link if link != next_state else 0
+                suffix = self.fail[next_state]
+                self.dict_link[next_state] = suffix if self.output[suffix] else self.dict_link[suffix]
+
+    def _outputs(self, state):
+        """Every pattern ending in state, longest first"""
+        if self.output[state] is None:
+            state = self.dict_link[state]
+        while state:
+            yield self.output[state]
+            state = self.dict_link[state]
+
+    def match(self, text):
+        """Return the role for the longest whole-word synonym in text, or None"""
+        state = 0
+        found = None
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            # Only accept matches that end on a word boundary (allowing a plural 's')...
+            end = index + 1
+            if text[end:end + 1] == 's':
+                end += 1
+            if end < len(text) and text[end].isalnum():
+                continue
+            for length, role in self._outputs(state):
+                start = index - length + 1
+                # ...and begin on one
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if found is None or length > found[0]:
+                    found = (length, role)
+                break
+        return found[1] if found else None
+
+
+class RoleTaxonomy:
+    """Role names, synonyms and prompt hints loaded from the roles collection"""
+
+    def __init__(self, db=None, refresh_interval=30):
+        self.db = db
+        self.refresh_interval = refresh_interval
+        self.version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self._apply(DEFAULT_ROLES)
+        self.refresh(force=True)
+
+    def _apply(self, roles):
+        synonyms = {}
+        for role in roles:
+            synonyms[role['name'].lower()] = role['name']
+            for synonym in role.get('synonyms', []):
+                if synonym.strip():
+                    synonyms[synonym.lower().strip()] = role['name']
+
+        # Swap in one assignment so readers never see a half-built taxonomy
+        self._state = (
+            [dict(role) for role in roles],
+            RoleMatcher(synonyms)
+        )
+
+    def _current_version(self):
+        settings = self.db.settings.find_one({'_id': SETTINGS_ID})
+        return settings.get('version', 0) if settings else 0
+
+    def refresh(self, force=False):
+        """Reload the taxonomy if its version changed in the database"""
+        if self.db is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                version = self._current_version()
+                if version == self.version and not force:
+                    return
+                roles = list(self.db.roles.find({}, {'_id': 0}).sort('_id', 1))
+                # Blank names saved before they were rejected stay out of dropdowns and prompts
+                roles = [role for role in roles if str(role.get('name') or '').strip()]
+                self._apply(roles or DEFAULT_ROLES)
+                self.version = version
+            except Exception as e:
+                print(f"Error loading role taxonomy: {str(e)}")
+
+    @property
+    def roles(self):
+        self.refresh()
+        return self._state[0]
+
+    def role_names(self):
+        """Canonical role names, e.g. for UI dropdowns"""
+        return [role['name'] for role in self.roles]
+
+    def is_valid(self, role):
+        return role in self.role_names()
+
+    def normalize(self, role):
+        """Map a free-form role to its canonical name, or return it unchanged"""
+        if not role:
+            return None
+        self.refresh()
+        return self._state[1].match(role.lower().strip()) or role
+
+    def find_role(self, text):
+        """Canonical role mentioned anywhere in free text, or None"""
+        if not text:
+            return None
+        self.refresh()
+        return self._state[1].match(text.lower())
+
+    def prompt_role_list(self):
+        """Comma separated role names for the extraction prompt"""
+        return ', '.join(self.role_names())
+
+    def prompt_role_hints(self):
+        """Keyword to role guidance lines for the extraction prompt"""
+        return '\n'.join(
+            f"        - {', '.join(role.get('hints') or role.get('synonyms', []))} -> {role['name']}"
+            for role in self.roles
+        )
+
+    def save_role(self, name, synonyms=None, hints=None):
+        """Create or update a role and notify other processes of the change"""
+        name = (name or '').strip()
+        if not name:
+            print("Error saving role: a role name is required")
+            return False
+        try:
+            self.db.roles.update_one(
+                {'name': name},
+                {'$set': {
+                    'name': name,
+                    'synonyms': synonyms or [],
+                    'hints': hints or [],
+                    'updated_at': datetime.now()
+                }},
+                upsert=True
+            )
+            self._bump_version()
+            return True
+        except Exception as e:
+            print(f"Error saving role {name}: {str(e)}")
+            return False
+
+    def delete_role(self, name):
+        try:
+            result = self.db.roles.delete_one({'name': name})
+            self._bump_version()
+            return result.deleted_count > 0
+        except Exception as e:
+            print(f"Error deleting role {name}: {str(e)}")
+            return False
+
+    def _bump_version(self):
+        self.db.settings.update_one(
+            {'_id': SETTINGS_ID},
+            {'$inc': {'version': 1}},
+            upsert=True
+        )
+        self.refresh(force=True)
+
+
+def seed_roles(db):
+    """Insert the default roles if the roles collection is empty"""
+    if db.roles.count_documents({}) == 0:
+        db.roles.insert_many([dict(role, created_at=datetime.now()) for role in DEFAULT_ROLES])
+        db.settings.update_one({'_id': SETTINGS_ID}, {'$inc': {'version': 1}}, upsert=True)
+        print("Seeded default role taxonomy")
+    db.roles.create_index("name", unique=True)
+
+
+_taxonomies = {}
+_taxonomies_lock = threading.Lock()
+
+
+def get_role_taxonomy(db=None):
+    """Process-wide taxonomy for a database (or the defaults when db is None)"""
+    key = None if db is None else db.name
+    with _taxonomies_lock:
+        if key not in _taxonomies:
+            _taxonomies[key] = RoleTaxonomy(db)
+        return _taxonomies[key]
@@ -0,0 +1,198 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+USER_FIELDS = {
+    'name': 1,
+    'email': 1,
+    'role': 1,
+    'employee_role': 1,
+    'created_at': 1,
+    'updated_at': 1
+}
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, and collapse whitespace"""
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r'[^a-z0-9]+', ' ', text.lower())
+    return text.strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class RosterIndex:
+    """In-memory index of employees for name and role lookups"""
+
+    def __init__(self, db, refresh_interval=30):
+        self.db = db
+        self.refresh_interval = refresh_interval
+        self.users = {}
+        self.keys = {}          # normalized full name or name token -> user ids
+        self.grams = {}         # trigram -> normalized keys containing it
+        self.by_role = {}       # employee role -> user ids, in insertion order
+        self.watermark = None
+        self._checked_at = 0
+        self._lock = threading.RLock()
+        self.refresh(force=True)
+
+    def _name_keys(self, user):
+        name = normalize_name(user.get('name'))
+        if not name:
+            return set()
+        return {name, *name.split()}
+
+    def _add(self, user):
+        user_id = str(user['_id'])
+        self.users[user_id] = user
+        for key in self._name_keys(user):
+            if key not in self.keys:
+                self.keys[key] = []
+                for gram in trigrams(key):
+                    self.grams.setdefault(gram, set()).add(key)
+            self.keys[key].append(user_id)
+        role = user.get('employee_role')
+        if role:
+            self.by_role.setdefault(role, []).append(user_id)
+
+    def _remove(self, user_id):
+        user = self.users.pop(user_id, None)
+        if not user:
+            return
+        for key in self._name_keys(user):
+            ids = self.keys.get(key, [])
+            if user_id in ids:
+                ids.remove(user_id)
+            if not ids:
+                self.keys.pop(key, None)
+                for gram in trigrams(key):
+                    self.grams.get(gram, set()).discard(key)
+        role_ids = self.by_role.get(user.get('employee_role'), [])
+        if user_id in role_ids:
+            role_ids.remove(user_id)
+
+    def _rebuild(self, users):
+        self.users, self.keys, self.grams, self.by_role = {}, {}, {}, {}
+        for user in users:
+            self._add(user)
+
+    def _advance_watermark(self, users):
+        for user in users:
+            for field in ('updated_at', 'created_at'):
+                stamp = user.get(field)
+                if stamp and (self.watermark is None or stamp > self.watermark):
+                    self.watermark = stamp
+
+    def refresh(self, force=False):
+        """Pull users changed since the last refresh; rebuild if any were deleted"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                if force or self.watermark is None:
+                    users = list(self.db.users.find({'role': 'employee'}, USER_FIELDS))
+                    self._rebuild(users)
+                    self._advance_watermark(users)
+                    return
+
+                changed = list(self.db.users.find({
+                    '$or': [
+                        {'created_at': {'$gt': self.watermark}},
+                        {'updated_at': {'$gt': self.watermark}}
+                    ]
+                }, USER_FIELDS))
+                for user in changed:
+                    self._remove(str(user['_id']))
+                    if user.get('role') == 'employee':
+                        self._add(user)
+                self._advance_watermark(changed)
+
+                # Deletions leave no trace to pull, so fall back to a rebuild
+                if self.db.users.count_documents({'role': 'employee'}) != len(self.users):
+                    self.refresh(force=True)
+            except Exception as e:
+                print(f"Error refreshing roster: {str(e)}")
+
+    def get(self, user_id):
+        self.refresh()
+        return self.users.get(str(user_id))
+
+    def find_by_name(self, name, role=None, max_distance=None):
+        """Find an employee by exact, normalized or misspelled name"""
+        self.refresh()
+        query = normalize_name(name)
+        if not query:
+            return None
+
+        with self._lock:
+            ids = self.keys.get(query)
+            if not ids:
+                ids = self._fuzzy_ids(query, max_distance)
+            return self._pick(ids, role)
+
+    def _fuzzy_ids(self, query, max_distance):
+        limit = max_distance if max_distance is not None else max(1, len(query) // 4)
+        query_grams = trigrams(query)
+
+        # Prefilter on shared trigrams before paying for edit distance
+        overlap = Counter()
+        for gram in query_grams:
+            for key in self.grams.get(gram, ()):
+                overlap[key] += 1
+
+        best_ids, best_distance = None, limit + 1
+        for key, shared in overlap.most_common(10):
+            dice = 2 * shared / (len(query_grams) + len(trigrams(key)))
+            if dice < 0.3:
+                break
+            distance = edit_distance(query, key, limit)
+            if distance < best_distance:
+                best_ids, best_distance = self.keys[key], distance
+        return best_ids
+
+    def _pick(self, ids, role=None):
+        if not ids:
+            return None
+        users = [self.users[user_id] for user_id in ids]
+        if role:
+            for user in users:
+                if user.get('employee_role') == role:
+                    return user
+        return users[0]
+
+    def find_by_role(self, role):
+        """Find the first employee with the given job role"""
+        self.refresh()
+        with self._lock:
+            ids = self.by_role.get(role)
+            return self.users[ids[0]] if ids else None
@@ -5,6 +5,7 @@ from datetime import timedelta
 import os
 from dotenv import load_dotenv
 import extra_streamlit_components as stx
+from streamlit.errors import StreamlitAPIException
 
 load_dotenv()
 
@@ -99,4 +100,11 @@ def logout():
     cookie_manager.delete(cookie='session_token')
     st.session_state.user = None
     st.session_state.role = None
-    st.rerun() 
\ No newline at end of file
+    st.rerun() 
+
+def rerun_fragment():
+    """Rerun only the enclosing fragment; during a full-app run, rerun everything"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
@@ -1,64 +1,151 @@
 import streamlit as st
-import google.generativeai as genai
 from datetime import datetime
+from collections import OrderedDict
 import os
+import threading
 from dotenv import load_dotenv
+from llm_gateway import LLMGateway, LLMTimeoutError, PRIORITY_CHAT
+from task_index import TaskIndex
+from task_snapshot import TaskCache, get_task_cache
+from chat_intents import IntentRouter
+from role_taxonomy import get_role_taxonomy
+from chat_history import ChatHistory, format_turns
 
 load_dotenv()
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
 
 class TaskChat:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, task_cache=None):
         self.db_manager = db_manager
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        # Tasks come from the process-wide cache the dashboards read too
+        self.task_cache = task_cache if task_cache is not None else TaskCache(db_manager)
+        self.gateway = LLMGateway()
+        self.task_index = TaskIndex()
+        self.top_k = int(os.getenv('CHAT_CONTEXT_TASKS', 15))
+        self.intent_router = IntentRouter(get_role_taxonomy(db_manager.db))
+        self.history = ChatHistory(db_manager.db)
+        # Rendered context blocks and employee indexes, keyed by task version
+        self._contexts = OrderedDict()
+        self._indexes = OrderedDict()
+        self._synced_version = None
+        self.cache_size = 256
+        self._cache_lock = threading.Lock()
         
-    def get_task_context(self, task_id=None, user=None):
-        """Get context about tasks"""
+    @property
+    def model(self):
+        return self.gateway.model()
+
+    def cached(self, cache, key):
+        with self._cache_lock:
+            if None in key[:2] or key not in cache:
+                return None
+            cache.move_to_end(key)
+            return cache[key]
+
+    def remember(self, cache, key, value):
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return value
+
+    def get_task_index(self, user, version=None):
+        """Index over the tasks the user may ask about"""
         if user['role'] == 'admin':
-            tasks = self.db_manager.get_all_tasks()
-            context = "You are a task management assistant. Here are all current tasks:\n\n"
+            # Re-index only when the shared cache moved to a new version
+            if version is None or version != self._synced_version:
+                self.task_index.sync(self.task_cache.all_tasks())
+                self._synced_version = version
+            return self.task_index
+
+        # Use tasks provided in user context
+        key = (user.get('id'), version)
+        index = self.cached(self._indexes, key)
+        if index is not None:
+            return index
+        index = TaskIndex()
+        index.sync(user.get('tasks', []))
+        return self.remember(self._indexes, key, index)
+
+    def get_task_context(self, task_id=None, user=None, message=None, index=None, version=None, tasks=None):
+        """Get context about the tasks most relevant to the message.
+
+        tasks is a snapshot of the index; the admin index is shared across
+        sessions, so its dict is never iterated directly.
+        """
+        if index is None:
+            index = self.get_task_index(user, version)
+        if tasks is None:
+            tasks = index.snapshot()
+
+        selected = [task for task in tasks if task_id and str(task['_id']) == str(task_id)]
+        if selected:
+            tasks = selected
+        elif len(tasks) > self.top_k:
+            tasks = index.search(message or '', self.top_k)
+
+        # The same task selection at the same version renders the same block
+        key = (user.get('id') or user['role'], version, datetime.now().date(),
+               tuple(str(task['_id']) for task in tasks))
+        context = self.cached(self._contexts, key)
+        if context is not None:
+            return context
+        return self.remember(self._contexts, key, self.render_context(tasks, user, index))
+
+    def render_context(self, tasks, user, index):
+        if user['role'] == 'admin':
+            header = "You are a task management assistant."
         else:
-            # Use tasks provided in user context
-            tasks = user.get('tasks', [])
-            context = f"""You are a task assistant for {user['name']}, a {user['employee_role']}.
-Here are their current tasks:\n\n"""
-            
-        # Add all tasks to context
+            header = f"You are a task assistant for {user['name']}, a {user['employee_role']}."
+
+        stats = index.stats()
+        parts = [
+            header, "\n\n",
+            f"Overview: {stats['total']} tasks, {stats['overdue']} overdue, "
+            f"{stats['due_this_week']} due in the next 7 days.\n",
+            "By status: ", ', '.join(f"{status} {count}" for status, count in stats['by_status'].items()), "\n"
+        ]
+        if user['role'] == 'admin':
+            parts += ["By role: ", ', '.join(f"{role} {count}" for role, count in stats['by_role'].items()), "\n"]
+
+        parts.append(f"\nThe {len(tasks)} tasks most relevant to the question:\n\n")
         for task in tasks:
-            context += f"Task: {task['task_description']}\n"
-            context += f"Status: {task['status']}\n"
-            context += f"Deadline: {task['deadline']}\n"
-            context += f"Priority: {task.get('priority', 'Not set')}\n\n"
-            
-        context += """
+            parts.append(
+                f"Task: {task['task_description']}\n"
+                f"Status: {task['status']}\n"
+                f"Deadline: {task['deadline']}\n"
+                f"Priority: {task.get('priority', 'Not set')}\n"
+            )
+            if user['role'] == 'admin':
+                parts.append(f"Assignee: {task.get('assignee_name', 'Unassigned')} ({task.get('role', '')})\n")
+            parts.append("\n")
+
+        parts.append("""
 Please help with any questions about these tasks. You can:
 - Provide status updates
 - Suggest next steps
 - Help with prioritization
 - Explain task requirements
 - Offer guidance and best practices
-"""
-        return context
+""")
+        return ''.join(parts)
 
-    def chat(self, message, task_id=None, user=None):
-        """Process chat message and return response"""
-        try:
-            # Initialize chat history if needed
-            if 'chat_history' not in st.session_state:
-                st.session_state.chat_history = []
-            
-            # Get task context
-            context = self.get_task_context(task_id, user)
-            
-            # Build conversation history
-            history = "\n\n".join([
-                f"User: {msg['user']}\nAssistant: {msg['assistant']}"
-                for msg in st.session_state.chat_history[-5:]  # Last 5 messages for context
-            ])
-            
-            # Construct prompt
-            prompt = f"""{context}
+    def load_history(self, user):
+        """Session chat history, loaded from the database once per user"""
+        user_id = user.get('id') if user else None
+        if st.session_state.get('chat_history_user') != user_id or 'chat_history' not in st.session_state:
+            st.session_state.chat_history = self.history.recent(user_id) if user_id else []
+            st.session_state.chat_history_user = user_id
+        return st.session_state.chat_history
 
+    def build_prompt(self, message, user, context=''):
+        # Summary of older turns plus the turns it does not cover yet
+        summary, covered_until = self.history.summary(user['id']) if user.get('id') else ('', None)
+        history = format_turns(self.history.prompt_turns(self.load_history(user), covered_until))
+        if summary:
+            history = f"Summary of earlier conversation:\n{summary}\n\n{history}"
+        
+        return f"""{context}
 Previous conversation:
 {history}
 
@@ -66,41 +153,89 @@ User: {message}
 
 Provide a helpful response while considering the task context. Be concise but informative.
 """
-            
-            # Get response from Gemini
-            response = self.model.generate_content(prompt)
-            
-            # Save to chat history
-            st.session_state.chat_history.append({
-                'user': message,
-                'assistant': response.text,
-                'timestamp': datetime.now(),
-                'task_id': task_id
-            })
-            
-            return response.text
-            
+
+    def chat_stream(self, message, task_id=None, user=None):
+        """Yield the response text as it arrives; the full reply is saved to history at the end"""
+        self.load_history(user)
+        parts = []
+        try:
+            # Factual questions (overdue, counts, due dates) are answered locally
+            self.task_cache.revalidate()
+            version = self.task_cache.version
+            index = self.get_task_index(user, version)
+            tasks = index.snapshot()
+            answer = self.intent_router.answer(message, tasks, task_id=task_id)
+            if answer:
+                parts.append(answer)
+                yield answer
+            else:
+                context = self.get_task_context(task_id, user, message, index, version, tasks)
+                prompt = self.build_prompt(message, user, context)
+                stream = self.gateway.generate(self.model, prompt, priority=PRIORITY_CHAT, stream=True)
+                for chunk in stream:
+                    text = chunk.text
+                    if text:
+                        parts.append(text)
+                        yield text
+                
+        except LLMTimeoutError as e:
+            print(f"Chat request timed out: {str(e)}")
+            if not parts:
+                parts = ["The assistant is busy right now. Please try again in a moment."]
+                yield parts[0]
         except Exception as e:
             print(f"Error in chat: {str(e)}")
-            return "I'm sorry, I encountered an error. Please try again."
+            if not parts:
+                parts = ["I'm sorry, I encountered an error. Please try again."]
+                yield parts[0]
+        
+        # Save to chat history
+        self.save_exchange(message, ''.join(parts), task_id, user)
+
+    def chat(self, message, task_id=None, user=None):
+        """Process chat message and return response"""
+        return ''.join(self.chat_stream(message, task_id, user))
+
+    def save_exchange(self, message, response, task_id=None, user=None):
+        now = datetime.now()
+        turn = {
+            'user': message,
+            'assistant': response,
+            # MongoDB keeps milliseconds; match it so summary cut-offs compare cleanly
+            'timestamp': now.replace(microsecond=now.microsecond // 1000 * 1000),
+            'task_id': str(task_id) if task_id else None
+        }
+        history = self.load_history(user)
+        history.append(turn)
+        del history[:-self.history.max_turns]
+        if user and user.get('id'):
+            self.history.append(user['id'], dict(turn))
+
+@st.cache_resource
+def get_task_chat(_db_manager):
+    """One TaskChat per process, reused across reruns and sessions"""
+    return TaskChat(_db_manager, get_task_cache(_db_manager))
 
 def show_chat_interface(task_chat, task_id=None, user=None):
     """Display chat interface in Streamlit"""
     st.markdown("### 💬 Task Chat Assistant")
     
-    # Initialize chat history
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
-    
     # Chat input
     message = st.chat_input("Ask a question about your task...")
     
-    if message:
-        response = task_chat.chat(message, task_id, user)
-        
     # Display chat history
-    for msg in st.session_state.chat_history:
+    for msg in task_chat.load_history(user):
         with st.chat_message("user"):
             st.write(msg['user'])
         with st.chat_message("assistant"):
-            st.write(msg['assistant']) 
\ No newline at end of file
+            st.write(msg['assistant'])
+    
+    if message:
+        stream_reply(task_chat, message, task_id, user)
+
+def stream_reply(task_chat, message, task_id=None, user=None):
+    """Show the new message and render the reply as it streams in"""
+    with st.chat_message("user"):
+        st.write(message)
+    with st.chat_message("assistant"):
+        st.write_stream(task_chat.chat_stream(message, task_id, user)) 
\ No newline at end of file
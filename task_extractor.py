@@ -1,108 +1,77 @@
-import json
-from datetime import datetime, timedelta
-import re
+from deadline_parser import deadline_parser
+from role_taxonomy import get_role_taxonomy
+from json_stream import JSONArrayStream, repair_json_array
+from llm_gateway import LLMGateway, PRIORITY_EXTRACTION
+from task_schema import TaskValidator, task_response_schema
+from transcript_window import TranscriptWindow, TaskDeduplicator
+
+try:
+    from google.api_core.exceptions import InvalidArgument
+except ImportError:
+    InvalidArgument = None
+
+# Errors raised when the SDK or the API rejects a response schema
+SCHEMA_ERRORS = (TypeError, ValueError) + ((InvalidArgument,) if InvalidArgument else ())
 
 class TaskExtractor:
-    def __init__(self, model):
+    def __init__(self, model, role_taxonomy=None, roster=None, structured=False, hedge=False):
         self.model = model
-        self.role_mappings = {
-            # Common variations of roles
-            'sales': 'Sales Analyst',
-            'sales analyst': 'Sales Analyst',
-            'sales rep': 'Sales Analyst',
-            'sales representative': 'Sales Analyst',
-            
-            'presentation': 'Presentation Designer',
-            'designer': 'Presentation Designer',
-            'presentation designer': 'Presentation Designer',
-            
-            'engineer': 'Software Engineer',
-            'developer': 'Software Engineer',
-            'software engineer': 'Software Engineer',
-            'programmer': 'Software Engineer',
-            
-            'marketing': 'Marketing Manager',
-            'marketing manager': 'Marketing Manager',
-            'marketing lead': 'Marketing Manager'
-        }
         
-        # Date mapping patterns
-        self.date_patterns = {
-            r'today': 0,
-            r'tomorrow': 1,
-            r'day after tomorrow': 2,
-            r'next week': 7,
-            r'next month': 30,
-            r'tonight': 0,
-            r'this evening': 0,
-            r'this week': 7,
-            r'this month': 30,
-        }
+        # Duplicate requests that run past the observed p95 latency
+        self.hedge = hedge
         
-        # Day of week patterns
-        self.day_patterns = {
-            r'monday': 0,
-            r'tuesday': 1,
-            r'wednesday': 2,
-            r'thursday': 3,
-            r'friday': 4,
-            r'saturday': 5,
-            r'sunday': 6
-        }
+        # Ask Gemini for schema-constrained JSON instead of free text
+        self.structured = structured
+        self.validator = TaskValidator()
+        self.parse_stats = {'responses': 0, 'repaired': 0, 'failed': 0}
+        
+        # Shared rate limits; extraction is admitted ahead of chat
+        self.gateway = LLMGateway()
+        
+        # In-memory employee index used to resolve assignees
+        self.roster = roster
+        
+        # Role names and synonyms, loaded from the roles collection
+        self.role_taxonomy = role_taxonomy or get_role_taxonomy()
+        
+        # Compiled deadline grammar shared with the calendar and dashboards
+        self.deadline_parser = deadline_parser
         
     def normalize_role(self, role):
-        if not role:
-            return None
-            
-        role_lower = role.lower().strip()
-        for key, value in self.role_mappings.items():
-            if key in role_lower:
-                return value
-        return role
+        return self.role_taxonomy.normalize(role)
         
     def convert_to_date(self, deadline_str):
         if not deadline_str or deadline_str.lower() == 'not specified':
             return 'Not specified'
             
-        deadline_lower = deadline_str.lower().strip()
-        today = datetime.now()
-        
-        # Check for relative day patterns
-        for pattern, days in self.date_patterns.items():
-            if pattern in deadline_lower:
-                future_date = today + timedelta(days=days)
-                return future_date.strftime('%Y-%m-%d')
-                
-        # Check for day of week
-        for day_name, day_num in self.day_patterns.items():
-            if day_name in deadline_lower:
-                current_day = today.weekday()
-                days_ahead = day_num - current_day
-                if days_ahead <= 0:
-                    days_ahead += 7
-                future_date = today + timedelta(days=days_ahead)
-                return future_date.strftime('%Y-%m-%d')
-                
-        # Check for "in X days/weeks" pattern
-        number_patterns = {
-            r'in (\d+) day': 1,
-            r'in (\d+) days': 1,
-            r'in (\d+) week': 7,
-            r'in (\d+) weeks': 7,
-            r'in (\d+) month': 30,
-            r'in (\d+) months': 30
-        }
-        
-        for pattern, multiplier in number_patterns.items():
-            match = re.search(pattern, deadline_lower)
-            if match:
-                number = int(match.group(1))
-                future_date = today + timedelta(days=number * multiplier)
-                return future_date.strftime('%Y-%m-%d')
+        deadline = self.deadline_parser.parse(deadline_str)
+        if deadline:
+            return deadline.strftime('%Y-%m-%d')
         
         return deadline_str
         
-    def extract_tasks(self, transcript):
+    def generation_config(self):
+        return {
+            'response_mime_type': 'application/json',
+            'response_schema': task_response_schema(self.role_taxonomy.role_names())
+        }
+        
+    def generate(self, prompt, stream=False):
+        """Call the model, requesting structured output when enabled"""
+        call = self.gateway.generate_hedged if self.hedge else self.gateway.generate
+        if self.structured:
+            try:
+                return call(
+                    self.model, prompt, priority=PRIORITY_EXTRACTION, stream=stream,
+                    generation_config=self.generation_config()
+                )
+            except SCHEMA_ERRORS as e:
+                # Older SDKs, models and API versions reject response schemas
+                print(f"Structured output unavailable, using plain JSON: {str(e)}")
+                self.structured = False
+        return call(self.model, prompt, priority=PRIORITY_EXTRACTION, stream=stream)
+        
+    def build_prompt(self, transcript, context=None):
         prompt = """
         Extract ALL tasks and assignments from the following meeting transcript and format them as a JSON array.
         Analyze the entire transcript carefully to identify every distinct task or assignment mentioned.
@@ -110,14 +79,11 @@ class TaskExtractor:
         Each task object must have these exact fields:
         - task: the task description
         - assignee: the person assigned (if not specified, leave empty)
-        - role: must be one of: Sales Analyst, Presentation Designer, Software Engineer, Marketing Manager
+        - role: must be one of: """ + self.role_taxonomy.prompt_role_list() + """
         - deadline: when it's due (use exact date if specified, or relative terms like 'tomorrow', 'next week', etc.)
         
         For the role field, analyze the context and task to determine the most appropriate role:
-        - sales, reports, analytics, revenue -> Sales Analyst
-        - presentations, slides, design, visuals -> Presentation Designer
-        - code, development, technical, bugs -> Software Engineer
-        - marketing, campaigns, social media, promotion -> Marketing Manager
+""" + self.role_taxonomy.prompt_role_hints() + """
         
         Important:
         - Create a separate task object for EACH distinct task mentioned
@@ -144,13 +110,74 @@ class TaskExtractor:
             }
         ]
 
-        Transcript:
         """
         
-        prompt += transcript
+        if context:
+            prompt += """Earlier context (tasks from it were already extracted; use it only to understand the transcript below):
+        """ + context + """
+
+        """
+        
+        prompt += """Transcript:
+        """ + transcript
+        return prompt
+        
+    def process_task(self, task):
+        """Normalize a raw task from the model; returns None if it is not usable"""
+        task = self.validator.validate(task)
+        if not task:
+            return None
+        
+        # Normalize roles and convert deadlines to dates
+        if 'role' in task:
+            task['role'] = self.normalize_role(task['role'])
+        if 'deadline' in task:
+            task['deadline'] = self.convert_to_date(task['deadline'])
+        task.setdefault('assignee', '')
+        task.setdefault('deadline', 'Not specified')
+        
+        # Check if assignee and role match
+        if task.get('assignee') and 'role' in task:
+            assigned_role = task['role']
+            assignee_name = task['assignee']
+            # Find the user by name to get their actual role
+            user = self.find_user_by_name(assignee_name, assigned_role)
+            if user and user.get('employee_role') == assigned_role:
+                task['assignee'] = user['name']
+                task['assignee_id'] = str(user['_id'])
+            elif user:
+                print(f"Warning: Task '{task['task']}' assigned to '{assignee_name}' with role '{assigned_role}' does not match their actual role '{user.get('employee_role')}'. The task will be assigned to the employee with the role of '{assigned_role}'.")
+                # Assign to a user with the matching role
+                matching_user = self.find_user_by_role(assigned_role)
+                if matching_user:
+                    task['assignee'] = matching_user['name']
+                    task['assignee_id'] = str(matching_user['_id'])
+                else:
+                    print(f"Warning: No user found with role '{assigned_role}' to assign the task.")
+        
+        # Filter out tasks with invalid roles
+        if not self.role_taxonomy.is_valid(task.get('role')):
+            print(f"\nWarning: Filtered out task with invalid role: {task.get('role')}")
+            return None
+        
+        return task
+        
+    def print_task(self, task):
+        print(f"- {task['task']}")
+        print(f"  Assigned to: {task['assignee']}")
+        print(f"  Role: {task['role']}")
+        print(f"  Due: {task['deadline']}")
+        print()
+        
+    def extract_tasks(self, transcript, stream=False, context=None):
+        if stream:
+            return list(self.extract_tasks_stream(transcript, context))
+        
+        prompt = self.build_prompt(transcript, context)
+        response_text = ''
         
         try:
-            response = self.model.generate_content(prompt)
+            response = self.generate(prompt)
             response_text = response.text.strip()
             print("\nGemini API Response:")
             print(response_text)
@@ -158,68 +185,85 @@ class TaskExtractor:
             # Remove any markdown code block markers
             response_text = response_text.replace('```json', '').replace('```', '').strip()
             
-            # Parse the response to get JSON array
-            tasks = json.loads(response_text)
-            
-            if not isinstance(tasks, list):
-                print("API response was not a list of tasks")
-                return []
-            
-            # Normalize roles and convert deadlines to dates
-            for task in tasks:
-                if 'role' in task:
-                    task['role'] = self.normalize_role(task['role'])
-                if 'deadline' in task:
-                    task['deadline'] = self.convert_to_date(task['deadline'])
-                
-                # Check if assignee and role match
-                if 'assignee' in task and 'role' in task:
-                    assigned_role = task['role']
-                    assignee_name = task['assignee']
-                    # Find the user by name to get their actual role
-                    user = self.find_user_by_name(assignee_name)  # Implement this method to find user by name
-                    if user and user['role'] != assigned_role:
-                        print(f"Warning: Task '{task['task']}' assigned to '{assignee_name}' with role '{assigned_role}' does not match their actual role. The task will be assigned to the employee with the role of '{user['role']}'.")
-                        # Assign to a user with the matching role
-                        matching_user = self.find_user_by_role(assigned_role)  # Implement this method to find user by role
-                        if matching_user:
-                            task['assignee'] = matching_user['name']
-                            task['assignee_id'] = str(matching_user['_id'])
-                        else:
-                            print(f"Warning: No user found with role '{assigned_role}' to assign the task.")
-
-            # Filter out tasks with invalid roles
-            valid_tasks = [task for task in tasks if task.get('role') in self.role_mappings.values()]
+            # Parse the response, salvaging complete tasks from malformed output
+            tasks, repaired = repair_json_array(response_text)
+            self.parse_stats['responses'] += 1
+            if repaired:
+                self.parse_stats['repaired' if tasks else 'failed'] += 1
+                print(f"Repaired malformed API response, recovered {len(tasks)} tasks")
             
-            if len(valid_tasks) < len(tasks):
-                print(f"\nWarning: Filtered out {len(tasks) - len(valid_tasks)} tasks with invalid roles")
+            valid_tasks = [task for task in map(self.process_task, tasks) if task]
                 
             print("\nExtracted Tasks:")
             for task in valid_tasks:
-                print(f"- {task['task']}")
-                print(f"  Assigned to: {task['assignee']}")
-                print(f"  Role: {task['role']}")
-                print(f"  Due: {task['deadline']}")
-                print()
+                self.print_task(task)
                 
             return valid_tasks
             
-        except json.JSONDecodeError as e:
-            print(f"Error parsing tasks from API response: {str(e)}")
-            print(f"Raw response: {response_text}")
-            return []
         except Exception as e:
             print(f"Error extracting tasks: {str(e)}")
+            print(f"Raw response: {response_text}")
             return [] 
 
-    def find_user_by_name(self, name):
-        """Find a user by their name in the database."""
-        # Implement logic to query the database for a user by name
-        # Return user object or None if not found
-        pass
+    def extract_tasks_stream(self, transcript, context=None):
+        """Yield tasks one by one as soon as each JSON object is complete"""
+        prompt = self.build_prompt(transcript, context)
+        parser = JSONArrayStream()
+        count = 0
+        
+        try:
+            response = self.generate(prompt, stream=True)
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text (e.g. safety metadata) carry no tasks
+                    continue
+                
+                for raw_task in parser.feed(text):
+                    task = self.process_task(raw_task)
+                    if task:
+                        count += 1
+                        self.print_task(task)
+                        yield task
+                        
+                if parser.finished:
+                    break
+                    
+        except Exception as e:
+            print(f"Error streaming tasks: {str(e)}")
+            
+        # Recover the final task if the response was cut off mid-object
+        if parser.pending:
+            for raw_task in repair_json_array('[' + parser.pending)[0]:
+                task = self.process_task(raw_task)
+                if task:
+                    count += 1
+                    self.print_task(task)
+                    yield task
+        print(f"\nStreamed {count} tasks")
+
+    def extract_tasks_windowed(self, transcript, window=None, deduplicator=None):
+        """Yield tasks from a transcript of any length in token-budgeted chunks"""
+        window = window or TranscriptWindow()
+        deduplicator = deduplicator or TaskDeduplicator()
+        
+        for context, text in window.chunk(transcript):
+            deduplicator.next_window(context)
+            for task in self.extract_tasks_stream(text, context):
+                if deduplicator.is_new(task):
+                    yield task
+                else:
+                    print(f"Skipping task already extracted from overlap: {task['task']}")
+
+    def find_user_by_name(self, name, role=None):
+        """Find an employee by name, tolerating transcription misspellings."""
+        if not self.roster:
+            return None
+        return self.roster.find_by_name(name, role)
 
     def find_user_by_role(self, role):
-        """Find a user by their role in the database."""
-        # Implement logic to query the database for a user by role
-        # Return user object or None if not found
-        pass 
\ No newline at end of file
+        """Find an employee by their job role."""
+        if not self.roster:
+            return None
+        return self.roster.find_by_role(role)
@@ -0,0 +1,172 @@
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from deadline_parser import parse_many
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'do', 'does', 'for', 'from',
+    'have', 'how', 'i', 'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'our',
+    'the', 'this', 'to', 'was', 'we', 'what', 'when', 'which', 'who', 'with', 'you'
+}
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in STOPWORDS]
+
+
+def task_text(task):
+    """Searchable text of a task"""
+    return ' '.join(str(task.get(field, '')) for field in (
+        'task_description', 'role', 'assignee_name', 'status', 'deadline'
+    )).replace('_', ' ')
+
+
+class TaskIndex:
+    """BM25 index over tasks, kept current with incremental upserts.
+
+    sync() mirrors a TaskCache's task list: tasks are replaced rather than
+    mutated there, so only changed documents are re-tokenized.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.tasks = {}         # task id -> task
+        self.rows = {}          # task id -> row number
+        self.row_ids = []       # row number -> task id (None once removed)
+        self.doc_lengths = []
+        self.postings = {}      # term -> {row: term frequency}
+        self.total_length = 0
+        self._stats = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def upsert(self, task):
+        with self._lock:
+            task_id = str(task['_id'])
+            if task_id in self.rows:
+                self.remove(task_id)
+
+            row = len(self.row_ids)
+            terms = Counter(tokenize(task_text(task)))
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, {})[row] = frequency
+
+            length = sum(terms.values())
+            self.row_ids.append(task_id)
+            self.doc_lengths.append(length)
+            self.total_length += length
+            self.rows[task_id] = row
+            self.tasks[task_id] = task
+            self._stats = None
+
+    def remove(self, task_id):
+        with self._lock:
+            row = self.rows.pop(task_id, None)
+            if row is None:
+                return
+            task = self.tasks.pop(task_id)
+            for term in set(tokenize(task_text(task))):
+                postings = self.postings.get(term)
+                if postings:
+                    postings.pop(row, None)
+                    if not postings:
+                        del self.postings[term]
+            self.total_length -= self.doc_lengths[row]
+            self.doc_lengths[row] = 0
+            self.row_ids[row] = None
+            self._stats = None
+
+            # Compact once most rows are dead so memory stays proportional to tasks
+            if len(self.row_ids) > 64 and len(self.tasks) < len(self.row_ids) // 2:
+                self._rebuild()
+
+    def _rebuild(self):
+        tasks = list(self.tasks.values())
+        self.__init__(self.k1, self.b)
+        for task in tasks:
+            self.upsert(task)
+
+    def sync(self, tasks):
+        """Make the index hold exactly these tasks, re-indexing only changed ones"""
+        current = {str(task['_id']): task for task in tasks}
+        with self._lock:
+            for task_id in [task_id for task_id in self.tasks if task_id not in current]:
+                self.remove(task_id)
+            for task_id, task in current.items():
+                if self.tasks.get(task_id) is not task:
+                    self.upsert(task)
+
+    def snapshot(self):
+        """List of the indexed tasks, safe to iterate while other threads sync"""
+        with self._lock:
+            return list(self.tasks.values())
+
+    def search(self, query, k=10):
+        """Top-k tasks for the query; falls back to the most urgent open tasks"""
+        with self._lock:
+            if not self.tasks:
+                return []
+            scores = np.zeros(len(self.row_ids))
+            lengths = np.asarray(self.doc_lengths, dtype=np.float64)
+            average_length = self.total_length / len(self.tasks) or 1.0
+            doc_count = len(self.tasks)
+
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                frequencies = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+                idf = np.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[rows] / average_length)
+                scores[rows] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+
+            matched = np.flatnonzero(scores > 0)
+            if not len(matched):
+                return self.most_urgent(k)
+            top = matched[np.argsort(-scores[matched], kind='stable')[:k]]
+            return [self.tasks[self.row_ids[row]] for row in top]
+
+    def most_urgent(self, k=10):
+        """Open tasks ordered by deadline, undated ones last"""
+        open_tasks = [task for task in self.snapshot() if task.get('status') != 'completed']
+        deadlines = parse_many([task.get('deadline') for task in open_tasks])
+        ranked = sorted(
+            zip(open_tasks, deadlines),
+            key=lambda pair: pair[1] or datetime.max
+        )
+        return [task for task, _ in ranked[:k]]
+
+    def stats(self, today=None):
+        """Compact aggregate statistics over every indexed task"""
+        today = today or datetime.now()
+        with self._lock:
+            if self._stats and self._stats[0] == today.date():
+                return self._stats[1]
+
+            tasks = list(self.tasks.values())
+            deadlines = parse_many([task.get('deadline') for task in tasks], today)
+            start = datetime(today.year, today.month, today.day)
+            open_deadlines = [
+                deadline for task, deadline in zip(tasks, deadlines)
+                if deadline and task.get('status') != 'completed'
+            ]
+            stats = {
+                'total': len(tasks),
+                'by_status': dict(Counter(task.get('status') for task in tasks)),
+                'by_role': dict(Counter(task.get('role') for task in tasks)),
+                'overdue': sum(1 for deadline in open_deadlines if deadline < start),
+                'due_this_week': sum(1 for deadline in open_deadlines
+                                     if start <= deadline < start + timedelta(days=7))
+            }
+            self._stats = (today.date(), stats)
+            return stats
@@ -8,6 +8,7 @@ class TaskQueue:
         self.task_queue = queue.Queue()
         self.db_manager = db_manager
         self.is_running = True
+        self.stats = {'stored': 0, 'failed': 0}
         
         # Start the processing thread
         self.process_thread = threading.Thread(target=self._process_queue)
@@ -18,6 +19,15 @@ class TaskQueue:
         """Add a task to the queue"""
         self.task_queue.put(task_data)
         
+    def add_tasks(self, tasks):
+        """Add a batch of tasks to be stored with a single bulk insert"""
+        if tasks:
+            self.task_queue.put(list(tasks))
+        
+    def join(self):
+        """Block until every queued task has been processed"""
+        self.task_queue.join()
+        
     def stop(self):
         """Stop the processing thread"""
         self.is_running = False
@@ -31,9 +41,14 @@ class TaskQueue:
                 task_data = self.task_queue.get(timeout=1)
                 
                 try:
+                    if isinstance(task_data, list):
+                        self._process_batch(task_data)
+                        continue
+                    
                     # Store in MongoDB
                     task_id = self.db_manager.create_task(task_data)  # This returns ObjectId directly
                     if task_id:
+                        self.stats['stored'] += 1
                         print(f"\nTask processed and stored:")
                         print(f"Task ID: {task_id}")
                         print(f"Description: {task_data['task_description']}")
@@ -48,6 +63,7 @@ class TaskQueue:
                         }
                         self.db_manager.create_notification(notification_data)
                     else:
+                        self.stats['failed'] += 1
                         print("Failed to store task in database")
                     
                 except Exception as e:
@@ -59,4 +75,23 @@ class TaskQueue:
                     
             except queue.Empty:
                 # Queue is empty, continue waiting
-                continue 
\ No newline at end of file
+                continue
+                
+    def _process_batch(self, tasks):
+        """Store a batch of tasks and their notifications in two round trips"""
+        task_ids = self.db_manager.create_tasks(tasks)
+        self.stats['stored'] += len(task_ids)
+        self.stats['failed'] += len(tasks) - len(task_ids)
+        if not task_ids:
+            print(f"Failed to store batch of {len(tasks)} tasks")
+            return
+        
+        # Only the stored prefix of a partially failed batch gets notified
+        notifications = [{
+            'user_id': task_data['assignee_id'],
+            'task_id': str(task_id),
+            'message': f"New task assigned: {task_data['task_description']}",
+            'type': 'new_task'
+        } for task_data, task_id in zip(tasks, task_ids)]
+        self.db_manager.create_notifications(notifications)
+        print(f"\nStored {len(task_ids)} of {len(tasks)} tasks in batch")
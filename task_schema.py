@@ -0,0 +1,73 @@
+# Task shape returned by the extraction model: (field, required, default)
+TASK_FIELDS = (
+    ('task', True, None),
+    ('assignee', False, ''),
+    ('role', True, None),
+    ('deadline', False, 'Not specified')
+)
+
+# Alternative keys models sometimes use for the same field
+FIELD_ALIASES = {
+    'description': 'task',
+    'task_description': 'task',
+    'title': 'task',
+    'assigned_to': 'assignee',
+    'owner': 'assignee',
+    'name': 'assignee',
+    'due': 'deadline',
+    'due_date': 'deadline',
+    'job_role': 'role',
+    'employee_role': 'role'
+}
+
+
+def task_response_schema(role_names):
+    """Gemini response schema for an array of tasks"""
+    role = {'type': 'string'}
+    if role_names:
+        role.update({'format': 'enum', 'enum': list(role_names)})
+
+    return {
+        'type': 'array',
+        'items': {
+            'type': 'object',
+            'properties': {
+                'task': {'type': 'string'},
+                'assignee': {'type': 'string'},
+                'role': role,
+                'deadline': {'type': 'string'}
+            },
+            'required': [field for field, required, _ in TASK_FIELDS if required]
+        }
+    }
+
+
+class TaskValidator:
+    """Validate and coerce raw task objects into the expected shape"""
+
+    def __init__(self, fields=TASK_FIELDS, aliases=FIELD_ALIASES):
+        self.fields = fields
+        # Resolve every accepted key (case-insensitive) to its field once
+        self.key_map = {field: field for field, _, _ in fields}
+        self.key_map.update(aliases)
+
+    def validate(self, obj):
+        """Return a cleaned task dict, or None if a required field is missing"""
+        if not isinstance(obj, dict):
+            return None
+
+        values = {}
+        for key, value in obj.items():
+            field = self.key_map.get(str(key).strip().lower())
+            if field and field not in values and value is not None:
+                values[field] = value if isinstance(value, str) else str(value)
+
+        task = {}
+        for field, required, default in self.fields:
+            value = values.get(field, '').strip()
+            if not value:
+                if required:
+                    return None
+                value = default
+            task[field] = value
+        return task
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+
+# Writes from other processes may carry slightly skewed timestamps
+CLOCK_SKEW = timedelta(seconds=5)
+
+
+class TaskCache:
+    """Process-wide task store shared by every Streamlit session.
+
+    Sessions revalidate with a cheap read of the task version counter, at
+    most once per max_staleness seconds; only a changed version pulls the
+    tasks written since the last refresh.
+    """
+
+    def __init__(self, db_manager, max_staleness=None):
+        self.db_manager = db_manager
+        self.max_staleness = max_staleness if max_staleness is not None else float(
+            os.getenv('TASK_CACHE_STALENESS', 2)
+        )
+        self.version = None
+        self.watermark = None
+        self.tasks_by_id = {}
+        self.stats = {'checks': 0, 'refreshes': 0, 'full_reloads': 0}
+        self._checked_at = 0
+        self._views = {}
+        self._lock = threading.RLock()
+
+    def invalidate(self):
+        """Check the version on the next access instead of waiting out the staleness bound"""
+        self._checked_at = 0
+
+    def apply_update(self, task_id, fields):
+        """Reflect a write made through this process without reloading"""
+        with self._lock:
+            task = self.tasks_by_id.get(task_id)
+            if task is not None:
+                # Copy rather than mutate: other sessions may hold the old lists
+                self.tasks_by_id[task_id] = dict(task, **fields)
+                self._views = {}
+
+    def revalidate(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.max_staleness:
+            return
+        with self._lock:
+            if now - self._checked_at < self.max_staleness:
+                return
+            self.stats['checks'] += 1
+            version = self.db_manager.get_task_version()
+            self._checked_at = time.monotonic()
+            if version is not None and version == self.version:
+                return
+
+            if self.version is None or version is None or self.watermark is None:
+                self._reload()
+            else:
+                self._refresh()
+            self.version = version
+            self._views = {}
+
+    def _reload(self):
+        self.stats['full_reloads'] += 1
+        self.tasks_by_id = {}
+        self.watermark = None
+        self._merge(self.db_manager.get_all_tasks())
+
+    def _refresh(self):
+        self.stats['refreshes'] += 1
+        self._merge(self.db_manager.get_tasks_modified_since(self.watermark - CLOCK_SKEW))
+
+        # Deletions do not show up as modifications: drop ids no longer stored
+        task_ids = self.db_manager.get_task_ids()
+        if task_ids is None:
+            self._reload()
+            return
+        for task_id in [task_id for task_id in self.tasks_by_id if task_id not in task_ids]:
+            del self.tasks_by_id[task_id]
+        # A task written with a timestamp behind the watermark was missed
+        if len(task_ids) != len(self.tasks_by_id):
+            self._reload()
+
+    def _merge(self, tasks):
+        for task in tasks:
+            self.tasks_by_id[task['_id']] = task
+            for field in ('created_at', 'updated_at'):
+                stamp = task.get(field)
+                if stamp and (self.watermark is None or stamp > self.watermark):
+                    self.watermark = stamp
+
+    def _view(self, key, build):
+        with self._lock:
+            if key not in self._views:
+                self._views[key] = build()
+            return self._views[key]
+
+    def all_tasks(self):
+        self.revalidate()
+        return self._view(('tasks', None), lambda: list(self.tasks_by_id.values()))
+
+    def user_tasks(self, user_id):
+        self.revalidate()
+        return self._view(('tasks', user_id), lambda: [
+            task for task in self.tasks_by_id.values() if task.get('assignee_id') == user_id
+        ])
+
+    def frame(self, user_id=None):
+        """Shared DataFrame of the tasks with parsed created_at; treat as read-only"""
+        tasks = self.all_tasks() if user_id is None else self.user_tasks(user_id)
+        return self._view(('frame', user_id), lambda: task_frame(tasks))
+
+
+def task_frame(tasks):
+    frame = pd.DataFrame(tasks)
+    if 'created_at' in frame:
+        frame['created_at'] = pd.to_datetime(frame['created_at'])
+    return frame
+
+
+@st.cache_resource
+def get_task_cache(_db_manager):
+    """One TaskCache per process, shared across sessions and reruns"""
+    return TaskCache(_db_manager)
+
+
+class TaskSnapshot:
+    """Tasks read at most once per Streamlit rerun and shared by every section.
+
+    Pass one snapshot down the page instead of querying in each section, and
+    call invalidate() after a write that the rest of the run should see. With
+    a TaskCache the tasks come from the process-wide cache instead of MongoDB.
+    """
+
+    def __init__(self, db_manager, user_id=None, cache=None):
+        self.db_manager = db_manager
+        self.user_id = user_id
+        self.cache = cache
+        self._tasks = None
+        self._frame = None
+        self._loaded_version = None
+
+    @property
+    def tasks(self):
+        """Task documents: all tasks, or only the user's when user_id is set"""
+        if self._tasks is None:
+            if self.cache is not None:
+                self._tasks = self.cache.all_tasks() if self.user_id is None else self.cache.user_tasks(self.user_id)
+                self._loaded_version = self.cache.version
+            elif self.user_id is None:
+                self._tasks = self.db_manager.get_all_tasks()
+            else:
+                self._tasks = self.db_manager.get_user_tasks(self.user_id)
+        return self._tasks
+
+    def frame(self):
+        """Tasks as a DataFrame with parsed created_at; treat as read-only"""
+        if self._frame is None:
+            if self.cache is not None:
+                self._frame = self.cache.frame(self.user_id)
+                self._loaded_version = self.cache.version
+            else:
+                self._frame = task_frame(self.tasks)
+        return self._frame
+
+    @property
+    def version(self):
+        """Task version the snapshot's data corresponds to, for keying caches"""
+        if self.cache is not None:
+            self.cache.revalidate()
+            return self.cache.version
+        return self.db_manager.get_task_version()
+
+    def invalidate(self):
+        self._tasks = None
+        self._frame = None
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def revalidate(self):
+        """Drop the loaded tasks if the shared cache has moved on, e.g. in a timed fragment rerun"""
+        if self.cache is None:
+            return
+        self.cache.revalidate()
+        if self._loaded_version != self.cache.version:
+            self._tasks = None
+            self._frame = None
+
+    def update_task(self, task_id, fields):
+        """Apply a successful write locally so the edit needs no re-read"""
+        if self.cache is not None:
+            self.cache.apply_update(task_id, fields)
+            self._tasks = None
+            self._frame = None
+            return
+        if self._tasks is not None:
+            self._tasks = [dict(task, **fields) if task['_id'] == task_id else task for task in self._tasks]
+        self._frame = None
+
+    def __len__(self):
+        return len(self.tasks)
@@ -0,0 +1,33 @@
+import numpy as np
+import speech_recognition as sr
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=0.5, frequency=220):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds))
+
+
+def noisy(signal, level=0.002, seed=0):
+    return signal + np.random.default_rng(seed).normal(0, level, len(signal))
+
+
+def encode(signal, sample_width=2):
+    """Float samples in [-1, 1] as little-endian PCM bytes"""
+    ints = (np.clip(signal, -1, 1) * (2 ** (8 * sample_width - 1) - 1)).astype(np.int32)
+    if sample_width == 3:
+        return ints.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    return ints.astype({1: np.int8, 2: '<i2', 4: '<i4'}[sample_width]).tobytes()
+
+
+def audio_data(signal, sample_width=2):
+    return sr.AudioData(encode(signal, sample_width), RATE, sample_width)
+
+
+def seconds(audio):
+    return len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+from audio_fixtures import audio_data, silence, tone
+from audio_processor import AudioProcessor, PhraseBuffer
+
+
+def test_phrase_buffer_is_fifo():
+    buffer = PhraseBuffer(3)
+    for phrase in 'abc':
+        buffer.put(phrase)
+    assert [buffer.get(), buffer.get(), buffer.get()] == ['a', 'b', 'c']
+    assert len(buffer) == 0
+
+
+def test_full_buffer_drops_the_oldest_phrase():
+    buffer = PhraseBuffer(2)
+    for phrase in 'abcd':
+        buffer.put(phrase)
+    assert buffer.dropped == 2
+    assert len(buffer) == 2
+    assert [buffer.get(), buffer.get()] == ['c', 'd']
+
+
+def test_get_times_out_when_nothing_arrives():
+    buffer = PhraseBuffer()
+    started = time.monotonic()
+    assert buffer.get(timeout=0.05) is None
+    assert time.monotonic() - started >= 0.05
+
+
+def test_get_wakes_up_when_a_phrase_arrives():
+    buffer = PhraseBuffer()
+    threading.Timer(0.05, buffer.put, args=('late',)).start()
+    assert buffer.get(timeout=5) == 'late'
+
+
+class FakeSource:
+    def __init__(self):
+        self.opened = 0
+
+    def __enter__(self):
+        self.opened += 1
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeRecognizer:
+    """Hands out queued phrases, then times out like an idle microphone"""
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self.energy_threshold = 300
+        self.calibrations = 0
+
+    def adjust_for_ambient_noise(self, source):
+        self.calibrations += 1
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        if self.phrases:
+            return self.phrases.pop(0)
+        time.sleep(0.01)
+        raise sr.WaitTimeoutError('listening timed out')
+
+    def recognize_google(self, audio):
+        return f'{len(audio.frame_data)} bytes'
+
+
+def test_capture_audio_consumes_buffered_phrases():
+    speech = audio_data(np.concatenate([silence(0.3), tone(0.5), silence(0.3)]))
+    processor = AudioProcessor()
+    processor.recognizer = FakeRecognizer([speech, audio_data(silence(1)), speech])
+    source = FakeSource()
+
+    processor.start_continuous(source)
+    try:
+        first = processor.capture_audio()
+        # Silence is dropped locally instead of being sent for recognition
+        assert processor.capture_audio() is None
+        assert processor.capture_audio() == first
+    finally:
+        processor.stop_continuous()
+
+    assert first.endswith(' bytes') and int(first.split()[0]) < len(speech.frame_data)
+    # The stream is opened and calibrated once for the whole session
+    assert source.opened == 1
+    assert processor.recognizer.calibrations == 1
+    assert processor.vad_stats['phrases'] == 3
+    assert processor.vad_stats['dropped'] == 1
+    assert len(processor.phrases) == 0
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+import mongomock
+import pytest
+
+import calendar_view
+from calendar_view import MAX_MARKERS_PER_DAY, CalendarView, calendar_figure_json, month_range, shift_month
+from database_manager import DatabaseManager
+
+
+def task(day, status='pending', description=None, month=11):
+    return {
+        'task_description': description or f'Task due {day}',
+        'assignee_name': 'Alex',
+        'deadline': f'2026-{month:02d}-{day:02d}',
+        'status': status
+    }
+
+
+def test_trace_count_does_not_grow_with_tasks():
+    view = CalendarView()
+    few = view.create_calendar([task(3)], 2026, 11)
+    many = view.create_calendar([task(day % 28 + 1, status) for day in range(300)
+                                 for status in ('pending', 'completed')], 2026, 11)
+    # Day numbers, one marker trace per status and the overflow counts
+    assert len(few.data) == len(many.data) == 5
+    assert [trace.name for trace in many.data[1:4]] == ['Pending', 'In Progress', 'Completed']
+
+
+def test_markers_are_grouped_by_status_and_other_months_skipped():
+    fig = CalendarView().create_calendar(
+        [task(3), task(3, 'completed'), task(4, 'in_progress'), task(3, month=12)], 2026, 11
+    )
+    pending, in_progress, completed = fig.data[1:4]
+    assert len(pending.x) == len(in_progress.x) == len(completed.x) == 1
+    assert 'Task due 3' in pending.hovertext[0]
+    assert len(fig.data[4].x) == 0
+
+
+def test_busy_days_show_an_overflow_count():
+    tasks = [task(10, description=f'Busy {i}') for i in range(MAX_MARKERS_PER_DAY + 3)] + [task(11)]
+    fig = CalendarView().create_calendar(tasks, 2026, 11)
+    assert len(fig.data[1].x) == MAX_MARKERS_PER_DAY + 1
+    overflow = fig.data[4]
+    assert list(overflow.text) == ['+3']
+    assert overflow.hovertext[0].count('<br>') == 2
+    assert f'Busy {MAX_MARKERS_PER_DAY}' in overflow.hovertext[0]
+
+
+@pytest.mark.parametrize('year, month, expected', [
+    (2026, 1, ('2026-01-01', '2026-02-01')),
+    (2026, 11, ('2026-11-01', '2026-12-01')),
+    (2026, 12, ('2026-12-01', '2027-01-01')),
+])
+def test_month_range(year, month, expected):
+    assert month_range(year, month) == expected
+
+
+@pytest.mark.parametrize('delta, expected', [
+    (1, (2027, 1)), (-1, (2026, 11)), (13, (2028, 1)), (-12, (2025, 12))
+])
+def test_shift_month_rolls_over_years(delta, expected):
+    assert shift_month(2026, 12, delta) == expected
+
+
+@pytest.fixture
+def db_manager():
+    db_manager = DatabaseManager(mongomock.MongoClient().task_manager)
+    for deadline, assignee in [('2026-10-31', 'u1'), ('2026-11-01', 'u1'), ('2026-11-30', 'u2'),
+                               ('2026-12-01', 'u1'), ('Not specified', 'u1')]:
+        db_manager.create_task({
+            'task_description': f'Due {deadline}', 'assignee_id': assignee, 'assignee_name': 'Alex',
+            'role': 'Sales Analyst', 'deadline': deadline, 'status': 'pending'
+        })
+    return db_manager
+
+
+def test_range_query_covers_one_month(db_manager):
+    start, end = month_range(2026, 11)
+    tasks = db_manager.get_tasks_in_range(start, end)
+    assert sorted(task['deadline'] for task in tasks) == ['2026-11-01', '2026-11-30']
+    assert [task['deadline'] for task in db_manager.get_tasks_in_range(start, end, 'u2')] == ['2026-11-30']
+
+
+@pytest.fixture
+def figure_cache(monkeypatch):
+    monkeypatch.setattr(calendar_view, '_figure_cache', OrderedDict())
+    return calendar_view._figure_cache
+
+
+def test_figures_are_cached_per_version(db_manager, figure_cache, monkeypatch):
+    queries = []
+    query = db_manager.get_tasks_in_range
+    monkeypatch.setattr(db_manager, 'get_tasks_in_range', lambda *args: queries.append(args) or query(*args))
+
+    first = calendar_figure_json(db_manager, 2026, 11, version=1)
+    assert calendar_figure_json(db_manager, 2026, 11, version=1) is first
+    assert len(queries) == 1
+
+    calendar_figure_json(db_manager, 2026, 11, version=2)
+    calendar_figure_json(db_manager, 2026, 11, user_id='u2', version=2)
+    assert len(queries) == 3
+
+    # Without a version every call queries again and nothing is stored
+    calendar_figure_json(db_manager, 2026, 11)
+    assert len(queries) == 4
+    assert len(figure_cache) == 3
+
+
+def test_figure_cache_is_bounded(db_manager, figure_cache, monkeypatch):
+    monkeypatch.setattr(calendar_view, 'FIGURE_CACHE_SIZE', 2)
+    for month in (10, 11, 12):
+        calendar_figure_json(db_manager, 2026, month, version=1)
+    assert [key[:2] for key in figure_cache] == [(2026, 11), (2026, 12)]
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from chat_history import ChatHistory, format_turns
+
+START = datetime(2026, 10, 19, 9)
+
+
+class FakeGateway:
+    def __init__(self):
+        self.prompts = []
+
+    def model(self):
+        return None
+
+    def generate(self, model, prompt, priority=None):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text=f' summary {len(self.prompts)} ')
+
+
+def turn(i):
+    return {'user': f'question {i}', 'assistant': f'answer {i}', 'timestamp': START + timedelta(minutes=i)}
+
+
+def settle(history):
+    """Wait for background summarization to finish"""
+    history._executor.submit(lambda: None).result()
+
+
+@pytest.fixture
+def history():
+    history = ChatHistory(mongomock.MongoClient().task_manager, max_turns=20, recent_turns=3)
+    history.gateway = FakeGateway()
+    return history
+
+
+def test_format_turns():
+    assert format_turns([turn(1), turn(2)]) == 'User: question 1\nAssistant: answer 1\n\nUser: question 2\nAssistant: answer 2'
+
+
+def test_recent_returns_oldest_first_per_user(history):
+    for i in range(3):
+        history.append('u1', turn(i))
+    history.append('u2', turn(9))
+    settle(history)
+    assert [t['user'] for t in history.recent('u1')] == ['question 0', 'question 1', 'question 2']
+    assert [t['user'] for t in history.recent('u1', limit=2)] == ['question 1', 'question 2']
+
+
+def test_retention_is_capped(history):
+    for i in range(25):
+        history.append('u1', turn(i))
+    settle(history)
+    stored = history.recent('u1', limit=100)
+    assert len(stored) == 20
+    assert stored[0]['user'] == 'question 5'
+
+
+def test_turns_are_summarized_once_they_leave_the_recent_window(history):
+    for i in range(3):
+        history.append('u1', turn(i))
+    settle(history)
+    assert history.summary('u1') == ('', None)
+
+    history.append('u1', turn(3))
+    settle(history)
+    summary, covered_until = history.summary('u1')
+    assert summary == 'summary 1'
+    # Everything but the newest recent_turns is folded in
+    assert covered_until == turn(0)['timestamp']
+    assert 'question 0' in history.gateway.prompts[0]
+    assert 'question 1' not in history.gateway.prompts[0]
+
+
+def test_summary_is_extended_not_rebuilt(history):
+    for i in range(5):
+        history.append('u1', turn(i))
+        settle(history)
+    assert len(history.gateway.prompts) == 2
+    second = history.gateway.prompts[1]
+    assert 'summary 1' in second
+    assert 'question 0' not in second
+    assert 'question 1' in second
+    assert history.summary('u1') == ('summary 2', turn(1)['timestamp'])
+
+
+def test_prompt_turns_skip_summarized_turns_and_stay_at_recent_turns(history):
+    turns = [turn(i) for i in range(30)]
+    assert history.prompt_turns(turns, turn(28)['timestamp']) == turns[29:]
+    assert history.prompt_turns(turns, turn(20)['timestamp']) == turns[27:]
+    assert history.prompt_turns(turns) == turns[27:]
+
+
+def test_failed_summaries_can_be_retried(history):
+    history.gateway.generate = lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError('down'))
+    for i in range(4):
+        history.append('u1', turn(i))
+    settle(history)
+    assert history.summary('u1') == ('', None)
+    assert history._pending == set()
+
+
+def test_clear(history):
+    for i in range(8):
+        history.append('u1', turn(i))
+    settle(history)
+    history.clear('u1')
+    assert history.recent('u1') == []
+    assert history.summary('u1') == ('', None)
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+
+from chat_intents import IntentRouter
+from role_taxonomy import RoleTaxonomy
+
+TODAY = datetime(2026, 10, 19)
+
+
+def task(task_id, description, status, deadline, role='Sales Analyst'):
+    return {
+        '_id': task_id, 'task_description': description, 'status': status,
+        'deadline': deadline, 'role': role, 'assignee_name': 'Alex'
+    }
+
+
+TASKS = [
+    task(1, 'Quarterly report', 'pending', '2026-10-10'),
+    task(2, 'Fix login bug', 'in_progress', '2026-10-20', 'Software Engineer'),
+    task(3, 'Kickoff slides', 'completed', '2026-10-01', 'Presentation Designer'),
+    task(4, 'Launch email', 'pending', '2026-10-30', 'Marketing Manager'),
+    task(5, 'Pipeline review', 'pending', 'Not specified'),
+]
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(RoleTaxonomy())
+
+
+@pytest.mark.parametrize('message, intent', [
+    ("What's overdue?", 'overdue'),
+    ('Which tasks are past their deadline?', 'overdue'),
+    ('How many tasks are overdue?', 'count_overdue'),
+    ("What's due this week?", 'due'),
+    ('How many deadlines next week?', 'count_due'),
+    ('How many pending tasks does sales have?', 'count'),
+    ('Show completed tasks', 'list'),
+])
+def test_recognized_questions(router, message, intent):
+    assert router.parse(message)[0] == intent
+
+
+@pytest.mark.parametrize('message', [
+    'How many tasks did I finish late?',
+    'Which tasks were done early?',
+    'Am I late on anything?',
+    'overdue',
+    'Why is the report overdue?',
+    'How should I prioritize my pending tasks?',
+    'Summarize the sales tasks',
+    'Hello there',
+])
+def test_other_questions_fall_through(router, message):
+    assert router.parse(message) is None
+    assert router.answer(message, TASKS, TODAY) is None
+
+
+def test_overdue_skips_completed_and_undated(router):
+    answer = router.answer("What's overdue?", TASKS, TODAY)
+    assert answer.startswith('There is **1** task overdue:')
+    assert 'Quarterly report' in answer
+    assert 'Kickoff slides' not in answer
+
+
+def test_counts_pluralize(router):
+    assert router.answer('How many tasks are overdue?', TASKS, TODAY) == 'There is **1** task overdue.'
+    assert router.answer('How many pending tasks?', TASKS, TODAY) == 'There are **3** pending tasks.'
+    assert router.answer('How many tasks?', TASKS, TODAY) == (
+        'There are **5** tasks (3 pending, 1 in progress, 1 completed).'
+    )
+    assert router.answer('How many in progress tasks?', TASKS[:1], TODAY) == 'There are **0** in progress tasks.'
+
+
+def test_filters_by_role(router):
+    assert router.answer('How many tasks does the developer have?', TASKS, TODAY) == (
+        'There is **1** Software Engineer task (1 in progress).'
+    )
+
+
+def test_due_windows(router):
+    answer = router.answer("What's due this week?", TASKS, TODAY)
+    assert 'Fix login bug' in answer
+    assert 'Launch email' not in answer
+    assert router.answer("What's due next week?", TASKS, TODAY).startswith('There is **1** task due next week')
+    assert router.answer("What's due today?", TASKS, TODAY) == 'There are no tasks due today.'
+
+
+def test_task_id_scopes_the_answer(router):
+    assert router.answer("What's overdue?", TASKS, TODAY, task_id=4) == 'There are no tasks overdue.'
+    assert router.answer('How many tasks are overdue?', TASKS, TODAY, task_id='1') == 'There is **1** task overdue.'
+    assert router.answer("What's overdue?", TASKS, TODAY, task_id=99) is None
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from datetime import date
+
+import mongomock
+import pytest
+
+import deadline_heatmap
+from database_manager import DatabaseManager
+from deadline_heatmap import create_heatmap, deadline_counts
+
+START = date(2026, 10, 1)
+
+
+@pytest.fixture
+def db_manager():
+    db_manager = DatabaseManager(mongomock.MongoClient().task_manager)
+    for deadline, role, status in [
+        ('2026-10-05', 'Sales Analyst', 'pending'),
+        ('2026-10-05', 'Sales Analyst', 'pending'),
+        ('2026-10-05', 'Sales Analyst', 'completed'),
+        ('2026-10-07', 'Software Engineer', 'in_progress'),
+        ('2027-02-01', 'Software Engineer', 'pending'),
+        ('Not specified', 'Software Engineer', 'pending'),
+    ]:
+        db_manager.create_task({
+            'task_description': 'Task', 'assignee_id': 'u1', 'assignee_name': 'Alex',
+            'role': role, 'deadline': deadline, 'status': status
+        })
+    return db_manager
+
+
+def test_counts_are_grouped_by_day_role_and_status(db_manager):
+    rows = db_manager.get_deadline_counts('2026-10-01', '2027-01-01')
+    key = lambda row: (row['day'], row['role'], row['status'])
+    assert sorted(rows, key=key) == [
+        {'day': '2026-10-05', 'role': 'Sales Analyst', 'status': 'completed', 'count': 1},
+        {'day': '2026-10-05', 'role': 'Sales Analyst', 'status': 'pending', 'count': 2},
+        {'day': '2026-10-07', 'role': 'Software Engineer', 'status': 'in_progress', 'count': 1},
+    ]
+
+
+def test_counts_are_cached_per_version(db_manager, monkeypatch):
+    monkeypatch.setattr(deadline_heatmap, '_counts_cache', OrderedDict())
+    queries = []
+    query = db_manager.get_deadline_counts
+    monkeypatch.setattr(db_manager, 'get_deadline_counts', lambda *args: queries.append(args) or query(*args))
+
+    first = deadline_counts(db_manager, '2026-10-01', '2027-01-01', version=1)
+    assert deadline_counts(db_manager, '2026-10-01', '2027-01-01', version=1) is first
+    deadline_counts(db_manager, '2026-10-01', '2027-01-01', version=2)
+    deadline_counts(db_manager, '2026-10-01', '2027-01-01')
+    assert len(queries) == 3
+
+
+ROWS = [
+    {'day': '2026-10-05', 'role': 'Sales Analyst', 'status': 'pending', 'count': 2},
+    {'day': '2026-10-05', 'role': 'Sales Analyst', 'status': 'completed', 'count': 1},
+    {'day': '2026-10-07', 'role': None, 'status': 'in_progress', 'count': 4},
+    {'day': '2027-06-01', 'role': 'Sales Analyst', 'status': 'pending', 'count': 9},
+    {'day': 'Not specified', 'role': 'Sales Analyst', 'status': 'pending', 'count': 5},
+]
+
+
+def test_heatmap_is_a_single_trace_per_day_and_role():
+    fig = create_heatmap(ROWS, START, 92)
+    assert len(fig.data) == 1
+    heatmap = fig.data[0]
+    assert heatmap.type == 'heatmap'
+    assert list(heatmap.y) == ['Sales Analyst', 'Unassigned']
+    assert len(heatmap.x) == 92
+    assert heatmap.z[0][4] == 3 and heatmap.z[1][6] == 4
+    # Days outside the window and unparseable days are left out
+    assert sum(map(sum, heatmap.z)) == 7
+    assert 'Completed: 1' in heatmap.text[0][4]
+
+
+def test_heatmap_respects_the_status_filter():
+    heatmap = create_heatmap(ROWS, START, 92, ('pending', 'in_progress')).data[0]
+    assert heatmap.z[0][4] == 2 and heatmap.z[1][6] == 4
+    assert 'Completed' not in heatmap.text[0][4]
+
+    completed = create_heatmap(ROWS, START, 92, ('completed',)).data[0]
+    assert sum(map(sum, completed.z)) == 1
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+
+from deadline_parser import DeadlineParser, parse_deadline, parse_many
+
+TODAY = datetime(2026, 10, 19)  # a Monday
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2026-12-01', datetime(2026, 12, 1)),
+    ('2026/1/9', datetime(2026, 1, 9)),
+    ('12/05/2026', datetime(2026, 12, 5)),
+    ('25/12/2026', datetime(2026, 12, 25)),
+    ('March 5th', datetime(2027, 3, 5)),
+    ('march 5, 2027', datetime(2027, 3, 5)),
+    ('Nov 2', datetime(2026, 11, 2)),
+    ('15th of March', datetime(2027, 3, 15)),
+    ('the 15th of march', datetime(2027, 3, 15)),
+    ('by the 15th of March', datetime(2027, 3, 15)),
+    ('25 December 2026', datetime(2026, 12, 25)),
+    ('the 15th', datetime(2026, 11, 15)),
+    ('by the 25th', datetime(2026, 10, 25)),
+    ('on the 3rd', datetime(2026, 11, 3)),
+    ('February 30th', datetime(2027, 2, 28)),
+    ('Friday, October 30', datetime(2026, 10, 30)),
+    ('friday 30th october', datetime(2026, 10, 30)),
+    ('Friday (2026-10-30)', datetime(2026, 10, 30)),
+])
+def test_absolute_dates(text, expected):
+    assert parse_deadline(text, TODAY) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('today', datetime(2026, 10, 19)),
+    ('tomorrow', datetime(2026, 10, 20)),
+    ('day after tomorrow', datetime(2026, 10, 21)),
+    ('next week', datetime(2026, 10, 26)),
+    ('in 3 days', datetime(2026, 10, 22)),
+    ('in two weeks', datetime(2026, 11, 2)),
+    ('friday', datetime(2026, 10, 23)),
+    ('next Monday', datetime(2026, 10, 26)),
+    ('Friday at 3pm', datetime(2026, 10, 23)),
+    ('friday, or the 30th at the latest', datetime(2026, 10, 23)),
+    ('end of week', datetime(2026, 10, 23)),
+    ('end of the month', datetime(2026, 10, 31)),
+])
+def test_relative_dates(text, expected):
+    assert parse_deadline(text, TODAY) == expected
+
+
+@pytest.mark.parametrize('text', [None, '', 'Not specified', 'asap', '13/13/2026', '2026-02-30', 'the 40th'])
+def test_unparseable(text):
+    assert parse_deadline(text, TODAY) is None
+
+
+def test_parse_many_parses_each_value_once():
+    calls = []
+
+    class CountingParser(DeadlineParser):
+        def parse(self, value, today=None):
+            calls.append(value)
+            return super().parse(value, today)
+
+    results = CountingParser().parse_many(['tomorrow', 'tomorrow', float('nan'), None], TODAY)
+    assert results == [datetime(2026, 10, 20), datetime(2026, 10, 20), None, None]
+    assert calls == ['tomorrow', None]
+
+
+def test_parse_many_shared_parser():
+    assert parse_many(['2026-11-01', 'Not specified'], TODAY) == [datetime(2026, 11, 1), None]
+
+
+def test_missing_pandas_values_have_no_deadline():
+    pd = pytest.importorskip('pandas')
+    assert parse_deadline(pd.NaT, TODAY) is None
+    assert parse_many([pd.NaT, float('nan'), pd.Timestamp('2026-11-02'), 'tomorrow'], TODAY) == [
+        None, None, datetime(2026, 11, 2), datetime(2026, 10, 20)
+    ]
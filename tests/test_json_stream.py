@@ -0,0 +1,56 @@
+import pytest
+
+from json_stream import JSONArrayStream
+
+
+def feed_in_chunks(text, size):
+    stream = JSONArrayStream()
+    objects = []
+    for i in range(0, len(text), size):
+        objects.extend(stream.feed(text[i:i + size]))
+    return stream, objects
+
+
+RESPONSE = '```json\n[\n  {"task": "Prepare {Q3} report", "assignee": "Alex"},\n  {"task": "Say \\"hi\\" ]", "tags": ["a", {"b": 1}]}\n]\n```'
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 64, len(RESPONSE)])
+def test_yields_objects_across_any_chunking(size):
+    stream, objects = feed_in_chunks(RESPONSE, size)
+    assert objects == [
+        {'task': 'Prepare {Q3} report', 'assignee': 'Alex'},
+        {'task': 'Say "hi" ]', 'tags': ['a', {'b': 1}]},
+    ]
+    assert stream.finished
+    assert stream.pending == ''
+
+
+def test_objects_are_returned_as_soon_as_they_close():
+    stream = JSONArrayStream()
+    assert stream.feed('[{"task": "a"}, {"task": ') == [{'task': 'a'}]
+    assert stream.feed('"b"}') == [{'task': 'b'}]
+
+
+def test_truncated_response_keeps_complete_objects():
+    stream, objects = feed_in_chunks('[{"task": "a"}, {"task": "b", "assig', 5)
+    assert objects == [{'task': 'a'}]
+    assert not stream.finished
+    assert stream.pending == '{"task": "b", "assig'
+
+
+def test_ignores_text_after_the_array():
+    stream = JSONArrayStream()
+    assert stream.feed('[{"a": 1}] trailing [{"b": 2}]') == [{'a': 1}]
+    assert stream.feed('{"c": 3}') == []
+
+
+def test_skips_malformed_objects():
+    stream = JSONArrayStream()
+    assert stream.feed('[{"a": 1,}, {"b": 2}]') == [{'b': 2}]
+
+
+def test_buffer_does_not_grow_with_consumed_objects():
+    stream = JSONArrayStream()
+    for i in range(100):
+        stream.feed(f'{"[" if i == 0 else ","}{{"n": {i}}}')
+    assert len(stream.buffer) < 20
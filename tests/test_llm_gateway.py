@@ -0,0 +1,222 @@
+import threading
+import time
+
+import pytest
+
+import llm_gateway
+from llm_gateway import (
+    LLMGateway, LLMTimeoutError, PRIORITY_CHAT, PRIORITY_EXTRACTION, TokenBucket
+)
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """A fresh gateway instance rather than the process-wide singleton"""
+    monkeypatch.setenv('LLM_MAX_IN_FLIGHT', '1')
+    monkeypatch.setenv('LLM_REQUESTS_PER_MINUTE', '6000')
+    monkeypatch.setenv('LLM_MAX_RETRIES', '1')
+    gateway = object.__new__(LLMGateway)
+    gateway._initialize()
+    return gateway
+
+
+class Response:
+    def __init__(self, text='ok', tokens=None):
+        self.text = text
+        if tokens:
+            self.usage_metadata = type('Usage', (), {'total_token_count': tokens})()
+
+
+class FakeModel:
+    def __init__(self, delay=0, errors=()):
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls.append(prompt)
+        if self.errors:
+            raise self.errors.pop(0)
+        time.sleep(self.delay)
+        return Response(prompt)
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(60)
+    start = bucket.updated
+    assert bucket.wait_time(60, start) == 0
+    bucket.consume(60)
+    assert bucket.wait_time(1, start) == pytest.approx(1)
+    assert bucket.wait_time(1, start + 1) == pytest.approx(0)
+    # Never refills beyond capacity
+    assert bucket.wait_time(60, start + 1000) == 0
+    assert bucket.tokens == 60
+
+
+def test_token_bucket_oversized_request_waits_for_a_full_bucket():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(500, bucket.updated) == 0
+    bucket.consume(500)
+    assert bucket.wait_time(500, bucket.updated) == pytest.approx(500)
+
+
+def test_generate_settles_tokens_with_reported_usage(gateway):
+    class Model:
+        def generate_content(self, prompt, **kwargs):
+            return Response(tokens=2000)
+
+    before = gateway.tokens.tokens
+    gateway.generate(Model(), 'x' * 400)
+    assert before - gateway.tokens.tokens == pytest.approx(2000, abs=1)
+    assert gateway.metrics()['in_flight'] == 0
+
+
+def test_extraction_lane_is_admitted_before_chat(gateway):
+    blocker = FakeModel(delay=0.2)
+    order = []
+
+    class Recorder:
+        def generate_content(self, prompt, **kwargs):
+            order.append(prompt)
+            return Response(prompt)
+
+    threads = [threading.Thread(target=gateway.generate, args=(blocker, 'first'))]
+    threads[0].start()
+    time.sleep(0.05)
+    for prompt, priority in [('chat', PRIORITY_CHAT), ('extraction', PRIORITY_EXTRACTION)]:
+        thread = threading.Thread(target=gateway.generate, args=(Recorder(), prompt), kwargs={'priority': priority})
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+    assert order == ['extraction', 'chat']
+
+
+def test_waiting_past_the_timeout_raises(gateway):
+    holder = threading.Thread(target=gateway.generate, args=(FakeModel(delay=0.3), 'slow'))
+    holder.start()
+    time.sleep(0.05)
+    with pytest.raises(LLMTimeoutError):
+        gateway.generate(FakeModel(), 'queued', timeout=0.1)
+    holder.join()
+    assert gateway.stats['timeouts'] == 1
+    assert gateway.metrics()['waiting'] == 0
+
+
+def test_retries_when_quota_is_exhausted(gateway, monkeypatch):
+    if llm_gateway.ResourceExhausted is None:
+        pytest.skip('google-api-core not installed')
+    monkeypatch.setattr(llm_gateway.time, 'sleep', lambda seconds: None)
+    model = FakeModel(errors=[llm_gateway.ResourceExhausted('quota')])
+    assert gateway.generate(model, 'retry me').text == 'retry me'
+    assert len(model.calls) == 2
+    assert gateway.stats['rate_limited'] == 1
+
+
+def test_failures_release_the_slot(gateway):
+    with pytest.raises(ValueError):
+        gateway.generate(FakeModel(errors=[ValueError('boom')]), 'fails')
+    assert gateway.stats['failures'] == 1
+    assert gateway.generate(FakeModel(), 'next').text == 'next'
+
+
+def test_stream_holds_its_slot_until_closed(gateway):
+    class StreamModel:
+        def generate_content(self, prompt, stream=False, **kwargs):
+            return iter(['a', 'b'])
+
+    stream = gateway.generate(StreamModel(), 'stream', stream=True)
+    assert gateway.metrics()['in_flight'] == 1
+    assert list(stream) == ['a', 'b']
+    assert gateway.metrics()['in_flight'] == 0
+
+
+class SequenceModel:
+    """Each call sleeps for the next delay in the list"""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        with self.lock:
+            delay = self.delays[min(self.calls, len(self.delays) - 1)]
+            self.calls += 1
+            call = self.calls
+        time.sleep(delay)
+        if stream:
+            return iter([f'{prompt}-{call}', 'rest'])
+        return Response(f'{prompt}-{call}')
+
+
+@pytest.fixture
+def hedging(gateway):
+    gateway.hedge_default_delay = 0.05
+    gateway.hedge_credit = 5.0
+    return gateway
+
+
+def test_slow_primary_is_hedged(hedging):
+    hedging.max_in_flight = 2
+    response = hedging.generate_hedged(SequenceModel(0.5, 0.01), 'extract')
+    assert response.text == 'extract-2'
+    assert hedging.hedge_stats == {'hedged_calls': 1, 'hedges': 1, 'hedge_wins': 1, 'hedge_denied': 0}
+
+
+def test_fast_primary_is_not_hedged(hedging):
+    model = SequenceModel(0.0)
+    assert hedging.generate_hedged(model, 'extract').text == 'extract-1'
+    assert model.calls == 1
+    assert hedging.hedge_stats['hedges'] == 0
+
+
+def test_queue_wait_does_not_trigger_a_hedge(hedging):
+    holder = threading.Thread(target=hedging.generate, args=(FakeModel(delay=0.3), 'busy'))
+    holder.start()
+    time.sleep(0.02)
+    model = SequenceModel(0.0)
+    assert hedging.generate_hedged(model, 'extract').text == 'extract-1'
+    holder.join()
+    assert model.calls == 1
+    assert hedging.hedge_stats['hedges'] == 0
+
+
+def test_hedge_budget_is_enforced(hedging):
+    hedging.hedge_credit = 0
+    hedging.hedge_ratio = 0
+    model = SequenceModel(0.15)
+    assert hedging.generate_hedged(model, 'extract').text == 'extract-1'
+    assert model.calls == 1
+    assert hedging.hedge_stats['hedge_denied'] == 1
+
+
+def test_hedged_stream_races_on_first_chunk(hedging):
+    hedging.max_in_flight = 2
+    chunks = list(hedging.generate_hedged(SequenceModel(0.5, 0.01), 'extract', stream=True))
+    assert chunks == ['extract-2', 'rest']
+    time.sleep(0.6)
+    assert hedging.metrics()['in_flight'] == 0
+
+
+def test_hedge_delay_uses_observed_p95(hedging):
+    for i in range(100):
+        hedging._record_latency((PRIORITY_EXTRACTION, False), i / 100)
+    assert hedging.hedge_delay(PRIORITY_EXTRACTION) == pytest.approx(0.95)
+    assert hedging.hedge_delay(PRIORITY_CHAT) == hedging.hedge_default_delay
+
+
+def test_concurrent_hedged_calls_count_consistently(hedging):
+    hedging.max_in_flight = 8
+    hedging.hedge_credit = 0
+    model = SequenceModel(0.01)
+    threads = [threading.Thread(target=hedging.generate_hedged, args=(model, 'x')) for _ in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = hedging.metrics()
+    assert stats['hedged_calls'] == 40
+    assert stats['requests'] == model.calls
+    assert stats['hedges'] + stats['hedge_denied'] <= 40
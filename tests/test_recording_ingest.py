@@ -0,0 +1,56 @@
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from audio_fixtures import RATE, audio_data, encode, noisy, seconds, silence, tone
+from recording_ingest import load_recording, split_on_silence
+from voice_activity import audio_samples
+
+MEETING = noisy(np.concatenate([silence(1), tone(1), silence(1), tone(1.5), silence(1)]))
+
+
+@pytest.mark.parametrize('sample_width', [1, 2, 3, 4])
+def test_audio_samples_decode_every_pcm_width(sample_width):
+    signal = np.array([0.0, 0.5, -0.5, 1.0, -1.0])
+    samples = audio_samples(audio_data(signal, sample_width))
+    scale = 2 ** (8 * sample_width - 1) - 1
+    assert samples.tolist() == [0, int(0.5 * scale), -int(0.5 * scale), scale, -scale]
+
+
+def test_audio_samples_reject_unknown_widths():
+    with pytest.raises(ValueError, match='5 bytes'):
+        audio_samples(SimpleNamespace(frame_data=b'\0' * 10, sample_rate=RATE, sample_width=5))
+
+
+@pytest.mark.parametrize('sample_width', [2, 3])
+def test_split_on_silence_cuts_at_pauses(sample_width):
+    chunks = split_on_silence(audio_data(MEETING, sample_width))
+    assert len(chunks) == 2
+    assert all(chunk.sample_width == sample_width for chunk in chunks)
+    # Cuts fall in the middle of each pause, so chunks tile the audio without overlap
+    assert sum(seconds(chunk) for chunk in chunks) <= seconds(audio_data(MEETING))
+
+
+def test_split_on_silence_caps_chunk_length():
+    chunks = split_on_silence(audio_data(noisy(tone(10))), max_chunk_seconds=3)
+    assert len(chunks) >= 4
+    assert max(seconds(chunk) for chunk in chunks) <= 3.01
+
+
+def test_split_on_silence_of_empty_audio():
+    assert split_on_silence(audio_data(np.zeros(0))) == []
+
+
+def test_loads_24_bit_wav(tmp_path):
+    path = tmp_path / 'meeting.wav'
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(3)
+        wav.setframerate(RATE)
+        wav.writeframes(encode(MEETING, 3))
+
+    audio = load_recording(str(path))
+    assert audio.sample_width == 3
+    assert len(split_on_silence(audio)) == 2
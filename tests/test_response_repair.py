@@ -0,0 +1,92 @@
+import pytest
+
+from json_stream import close_truncated, repair_json_array
+from role_taxonomy import RoleTaxonomy
+from task_extractor import TaskExtractor
+from task_schema import TaskValidator, task_response_schema
+
+
+def test_clean_array_is_not_repaired():
+    assert repair_json_array('[{"task": "a"}]') == ([{'task': 'a'}], False)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"tasks": [{"task": "a"}]}', [{'task': 'a'}]),
+    ('{"task": "a"}', [{'task': 'a'}]),
+    ('```json\n[{"task": "a"}, {"task": "b"}]\n```', [{'task': 'a'}, {'task': 'b'}]),
+    ('Here you go: {"task": "a"}, {"task": "b"}', [{'task': 'a'}, {'task': 'b'}]),
+    ('[{"task": "a"}, {"task": "b", "tags": ["x"', [{'task': 'a'}, {'task': 'b', 'tags': ['x']}]),
+    ('[{"task": "a"}, {"task": "b", "role": "Sal', [{'task': 'a'}, {'task': 'b'}]),
+    ('[{"task": "a"}, {"task": "b", "role":', [{'task': 'a'}, {'task': 'b'}]),
+    ('', []),
+    ('no json at all', []),
+])
+def test_repairs_common_failures(text, expected):
+    items, repaired = repair_json_array(text)
+    assert items == expected
+    assert repaired
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": [1, {"b": 2', '{"a": [1, {"b": 2}]}'),
+    ('{"a": 1,', '{"a": 1}'),
+    ('{"a": "x]"', '{"a": "x]"}'),
+    ('{"a": "cut', None),
+    ('{"a":', None),
+])
+def test_close_truncated(text, expected):
+    assert close_truncated(text) == expected
+
+
+def test_validator_maps_aliases_and_fills_defaults():
+    validator = TaskValidator()
+    assert validator.validate({'Description': ' Ship it ', 'Owner': 'Alex', 'job_role': 'Software Engineer', 'due': 7}) == {
+        'task': 'Ship it', 'assignee': 'Alex', 'role': 'Software Engineer', 'deadline': '7'
+    }
+    assert validator.validate({'task': 'Ship it', 'role': 'Software Engineer', 'assignee': None}) == {
+        'task': 'Ship it', 'assignee': '', 'role': 'Software Engineer', 'deadline': 'Not specified'
+    }
+
+
+@pytest.mark.parametrize('obj', [{'task': 'No role'}, {'role': 'Sales Analyst'}, {'task': '  ', 'role': 'x'}, ['task'], None])
+def test_validator_rejects_incomplete_tasks(obj):
+    assert TaskValidator().validate(obj) is None
+
+
+def test_response_schema_constrains_roles():
+    schema = task_response_schema(['Sales Analyst', 'Software Engineer'])
+    assert schema['items']['properties']['role']['enum'] == ['Sales Analyst', 'Software Engineer']
+    assert schema['items']['required'] == ['task', 'role']
+    assert 'enum' not in task_response_schema([])['items']['properties']['role']
+
+
+class SchemaRejectingGateway:
+    def __init__(self, error):
+        self.error = error
+        self.calls = []
+
+    def generate(self, model, prompt, priority=None, stream=False, **kwargs):
+        self.calls.append(kwargs)
+        if 'generation_config' in kwargs:
+            raise self.error
+        return 'plain'
+
+
+def schema_errors():
+    errors = [TypeError('unknown field'), ValueError('bad schema')]
+    try:
+        from google.api_core.exceptions import InvalidArgument
+    except ImportError:
+        return errors
+    return errors + [InvalidArgument('response_schema is not supported')]
+
+
+@pytest.mark.parametrize('error', schema_errors(), ids=lambda error: type(error).__name__)
+def test_rejected_schema_falls_back_to_plain_prompt(error):
+    extractor = TaskExtractor(None, role_taxonomy=RoleTaxonomy(), structured=True)
+    extractor.gateway = SchemaRejectingGateway(error)
+    assert extractor.generate('prompt') == 'plain'
+    assert not extractor.structured
+    # Later calls skip the schema altogether
+    assert extractor.generate('prompt') == 'plain'
+    assert [bool(call) for call in extractor.gateway.calls] == [True, False, False]
@@ -0,0 +1,92 @@
+import mongomock
+import pytest
+
+from role_taxonomy import DEFAULT_ROLES, RoleMatcher, RoleTaxonomy, seed_roles
+
+
+def legacy_normalize(role):
+    """The substring lookup TaskExtractor.normalize_role used before the taxonomy"""
+    mappings = {}
+    for seed in DEFAULT_ROLES:
+        for synonym in seed['synonyms']:
+            mappings[synonym] = seed['name']
+    role_lower = role.lower().strip()
+    for key, value in mappings.items():
+        if key in role_lower:
+            return value
+    return role
+
+
+SEED_SYNONYMS = [synonym for seed in DEFAULT_ROLES for synonym in seed['synonyms']]
+
+
+@pytest.mark.parametrize('synonym', SEED_SYNONYMS)
+@pytest.mark.parametrize('template', ['{}', '{}s', 'Senior {}', 'the {} team', 'lead {} (contract)', '{}, remote'])
+def test_matches_legacy_lookup_for_seed_roles(synonym, template):
+    text = template.format(synonym.title())
+    assert RoleTaxonomy().normalize(text) == legacy_normalize(text)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('representation designer', 'Presentation Designer'),
+    ('sales representative', 'Sales Analyst'),
+    ('senior software engineer', 'Software Engineer'),
+    ('marketing lead', 'Marketing Manager'),
+])
+def test_shorter_synonym_inside_longer_partial_match(text, expected):
+    assert RoleTaxonomy().normalize(text) == expected
+
+
+@pytest.mark.parametrize('text', ['salesforce dev', 'devops', 'presentational', 'reengineering', 'salesy'])
+def test_requires_whole_words(text):
+    assert RoleTaxonomy().normalize(text) == text
+
+
+def test_longest_synonym_wins():
+    matcher = RoleMatcher({'lead': 'Team Lead', 'marketing lead': 'Marketing Manager', 'marketing': 'Marketer'})
+    assert matcher.match('our marketing lead') == 'Marketing Manager'
+    assert matcher.match('lead of marketing') == 'Marketer'
+    assert matcher.match('nothing here') is None
+
+
+def test_find_role_in_free_text():
+    assert RoleTaxonomy().find_role('What is the developer working on?') == 'Software Engineer'
+
+
+def test_reloads_roles_when_version_changes():
+    db = mongomock.MongoClient().task_manager
+    seed_roles(db)
+    taxonomy = RoleTaxonomy(db, refresh_interval=0)
+    assert taxonomy.normalize('data scientist') == 'data scientist'
+
+    assert taxonomy.save_role('Data Scientist', synonyms=['data scientist', 'ml engineer'])
+    assert taxonomy.normalize('ML Engineer') == 'Data Scientist'
+    assert 'Data Scientist' in taxonomy.role_names()
+
+    assert taxonomy.delete_role('Data Scientist')
+    assert taxonomy.normalize('data scientist') == 'data scientist'
+
+
+@pytest.mark.parametrize('name', ['', '   ', None])
+def test_blank_role_names_are_rejected(name):
+    db = mongomock.MongoClient().task_manager
+    seed_roles(db)
+    taxonomy = RoleTaxonomy(db, refresh_interval=0)
+    assert not taxonomy.save_role(name, synonyms=['anything'])
+    assert db.roles.count_documents({}) == len(DEFAULT_ROLES)
+
+
+def test_blank_roles_already_stored_are_ignored():
+    db = mongomock.MongoClient().task_manager
+    seed_roles(db)
+    db.roles.insert_one({'name': ' ', 'synonyms': [''], 'hints': []})
+    taxonomy = RoleTaxonomy(db)
+    assert taxonomy.role_names() == [role['name'] for role in DEFAULT_ROLES]
+    assert ' ' not in taxonomy.prompt_role_list().split(', ')
+
+
+def test_saved_role_names_are_trimmed():
+    db = mongomock.MongoClient().task_manager
+    taxonomy = RoleTaxonomy(db, refresh_interval=0)
+    assert taxonomy.save_role('  Data Scientist ')
+    assert db.roles.find_one({'name': 'Data Scientist'})
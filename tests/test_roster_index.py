@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from roster_index import RosterIndex, edit_distance, normalize_name
+
+
+@pytest.fixture
+def db():
+    db = mongomock.MongoClient().task_manager
+    created = datetime(2026, 1, 1)
+    db.users.insert_many([
+        {'name': 'Alex Johnson', 'role': 'employee', 'employee_role': 'Sales Analyst', 'created_at': created},
+        {'name': 'Alex Kim', 'role': 'employee', 'employee_role': 'Software Engineer', 'created_at': created},
+        {'name': 'Zoë Müller', 'role': 'employee', 'employee_role': 'Presentation Designer', 'created_at': created},
+        {'name': 'Admin', 'role': 'admin', 'created_at': created},
+    ])
+    return db
+
+
+def test_normalize_name():
+    assert normalize_name('  Zoë   Müller-Smith ') == 'zoe muller smith'
+    assert normalize_name(None) == ''
+
+
+def test_edit_distance_gives_up_past_limit():
+    assert edit_distance('johnson', 'jonson', 2) == 1
+    assert edit_distance('alex', 'zoe muller', 2) == 3
+
+
+def test_exact_and_token_lookup(db):
+    roster = RosterIndex(db)
+    assert roster.find_by_name('alex johnson')['name'] == 'Alex Johnson'
+    assert roster.find_by_name('Muller')['name'] == 'Zoë Müller'
+    assert roster.find_by_name('Admin') is None
+
+
+def test_token_shared_by_several_users_prefers_role(db):
+    roster = RosterIndex(db)
+    assert roster.find_by_name('Alex', role='Software Engineer')['name'] == 'Alex Kim'
+    assert roster.find_by_name('Alex', role='Unknown Role')['name'] == 'Alex Johnson'
+
+
+def test_misspelled_names(db):
+    roster = RosterIndex(db)
+    assert roster.find_by_name('Alex Jonson')['name'] == 'Alex Johnson'
+    assert roster.find_by_name('Zoe Mueller')['name'] == 'Zoë Müller'
+    assert roster.find_by_name('Priya') is None
+
+
+def test_find_by_role(db):
+    roster = RosterIndex(db)
+    assert roster.find_by_role('Software Engineer')['name'] == 'Alex Kim'
+    assert roster.find_by_role('Marketing Manager') is None
+
+
+def test_refresh_picks_up_changes_and_deletions(db):
+    roster = RosterIndex(db, refresh_interval=0)
+    later = datetime(2026, 2, 1)
+    db.users.insert_one({'name': 'Priya Patel', 'role': 'employee', 'employee_role': 'Marketing Manager', 'created_at': later})
+    db.users.update_one({'name': 'Alex Kim'}, {'$set': {'employee_role': 'Sales Analyst', 'updated_at': later + timedelta(days=1)}})
+    db.users.delete_one({'name': 'Zoë Müller'})
+
+    assert roster.find_by_name('Priya')['employee_role'] == 'Marketing Manager'
+    assert roster.find_by_role('Software Engineer') is None
+    assert roster.find_by_name('Zoe') is None
+    assert len(roster.users) == 3
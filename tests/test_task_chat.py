@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from database_manager import DatabaseManager
+from task_chat import TaskChat
+from task_snapshot import TaskCache
+
+
+class FakeGateway:
+    def __init__(self):
+        self.prompts = []
+
+    def model(self):
+        return 'model'
+
+    def generate(self, model, prompt, priority=None, stream=False):
+        self.prompts.append(prompt)
+        return iter([SimpleNamespace(text='Start with '), SimpleNamespace(text='the report.')])
+
+
+@pytest.fixture
+def chat():
+    db_manager = DatabaseManager(mongomock.MongoClient().task_manager)
+    for i in range(40):
+        db_manager.create_task({
+            'task_description': f'Routine task {i}', 'assignee_id': 'u1', 'assignee_name': 'Alex',
+            'role': 'Sales Analyst', 'deadline': 'Not specified', 'status': 'pending'
+        })
+    db_manager.create_task({
+        'task_description': 'Prepare the investor deck', 'assignee_id': 'u2', 'assignee_name': 'Sam',
+        'role': 'Presentation Designer', 'deadline': '2020-01-01', 'status': 'pending'
+    })
+    chat = TaskChat(db_manager, TaskCache(db_manager, max_staleness=0))
+    chat.gateway = FakeGateway()
+    chat.top_k = 5
+    return chat
+
+
+ADMIN = {'role': 'admin'}
+
+
+def test_factual_questions_skip_the_llm(chat):
+    reply = chat.chat("What's overdue?", user=ADMIN)
+    assert reply.startswith('There is **1** task overdue:')
+    assert 'investor deck' in reply
+    assert chat.gateway.prompts == []
+
+
+def test_open_questions_send_a_bounded_context(chat):
+    reply = chat.chat('Suggest an order for the routine work', user=ADMIN)
+    assert reply == 'Start with the report.'
+    prompt = chat.gateway.prompts[0]
+    assert 'Overview: 41 tasks, 1 overdue' in prompt
+    assert prompt.count('Task: Routine task') == 5
+
+
+def test_context_holds_only_relevant_tasks(chat):
+    chat.chat('What should I do about the investor deck?', user=ADMIN)
+    prompt = chat.gateway.prompts[0]
+    assert prompt.count('Task: ') == 1
+    assert 'Task: Prepare the investor deck' in prompt
+
+
+def test_task_chat_uses_that_task(chat):
+    task = chat.db_manager.db.tasks.find_one({'task_description': 'Routine task 3'})
+    chat.chat('Any tips for this one?', task_id=task['_id'], user=ADMIN)
+    prompt = chat.gateway.prompts[0]
+    assert prompt.count('Task: ') == 1
+    assert 'Task: Routine task 3' in prompt
+
+
+def test_employee_context_comes_from_their_tasks(chat):
+    tasks = chat.task_cache.user_tasks('u2')
+    user = {'role': 'employee', 'name': 'Sam', 'employee_role': 'Presentation Designer', 'tasks': tasks}
+    chat.chat('Suggest a plan for my week', user=user)
+    prompt = chat.gateway.prompts[0]
+    assert prompt.startswith('You are a task assistant for Sam, a Presentation Designer.')
+    assert 'Overview: 1 tasks' in prompt
+
+
+def test_rendered_context_is_reused_until_the_version_changes(chat, monkeypatch):
+    renders = []
+    render = chat.render_context
+    monkeypatch.setattr(chat, 'render_context', lambda *args: renders.append(1) or render(*args))
+
+    chat.chat('Suggest an order for the routine work', user=ADMIN)
+    chat.chat('Suggest an order for the routine work', user=ADMIN)
+    assert len(renders) == 1
+    assert chat.gateway.prompts[0].split('Previous conversation:')[0] == \
+        chat.gateway.prompts[1].split('Previous conversation:')[0]
+
+    task = chat.db_manager.db.tasks.find_one({'task_description': 'Routine task 0'})
+    chat.db_manager.update_task(task['_id'], {'status': 'in_progress'})
+    chat.chat('Suggest an order for the routine work', user=ADMIN)
+    assert len(renders) == 2
+
+
+def test_employee_index_is_cached_per_user_and_version(chat):
+    tasks = chat.task_cache.user_tasks('u2')
+    user = {'id': 'u2', 'role': 'employee', 'name': 'Sam', 'employee_role': 'Presentation Designer', 'tasks': tasks}
+    first = chat.get_task_index(user, 7)
+    assert chat.get_task_index(user, 7) is first
+    assert chat.get_task_index(user, 8) is not first
+    assert chat.get_task_index({**user, 'id': 'u3'}, 7) is not first
+    # Without a version nothing is cached
+    assert chat.get_task_index(user, None) is not chat.get_task_index(user, None)
+
+
+def test_a_sync_from_another_session_does_not_break_the_reply(chat, monkeypatch):
+    answer = chat.intent_router.answer
+
+    def answer_while_syncing(message, tasks, **kwargs):
+        seen = []
+        for task in tasks:
+            if not seen:
+                # Another session drops a task while this one reads the shared index
+                chat.task_index.remove(str(task['_id']))
+            seen.append(task)
+        return answer(message, seen, **kwargs)
+
+    monkeypatch.setattr(chat.intent_router, 'answer', answer_while_syncing)
+    reply = chat.chat('How many tasks are pending?', user=ADMIN)
+    assert reply.startswith('There are **41** pending tasks')
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from database_manager import DatabaseManager
+from import_transcripts import extract_file, iter_transcripts
+from task_queue import TaskQueue
+
+
+def task_data(description, **fields):
+    return dict({
+        'task_description': description,
+        'assignee_id': 'u1',
+        'assignee_name': 'Alex',
+        'role': 'Sales Analyst',
+        'deadline': 'Not specified',
+        'status': 'pending'
+    }, **fields)
+
+
+@pytest.fixture
+def db_manager():
+    return DatabaseManager(mongomock.MongoClient().task_manager)
+
+
+def test_create_tasks_returns_ids_and_bumps_version(db_manager):
+    ids = db_manager.create_tasks([task_data('a'), task_data('b')])
+    assert len(ids) == 2
+    assert db_manager.db.tasks.count_documents({}) == 2
+    assert db_manager.get_task_version() == 1
+
+
+def test_partially_failed_batch_returns_the_stored_prefix(db_manager):
+    db_manager.db.tasks.insert_one({'_id': 'taken'})
+    tasks = [task_data('a'), task_data('b', _id='taken'), task_data('c')]
+    ids = db_manager.create_tasks(tasks)
+    assert ids == [tasks[0]['_id']]
+    assert db_manager.get_task_version() == 1
+
+
+def test_invalid_batch_stores_nothing(db_manager):
+    assert db_manager.create_tasks([task_data('a'), {'task_description': 'b'}]) == []
+    assert db_manager.db.tasks.count_documents({}) == 0
+
+
+def test_queue_notifies_only_stored_tasks(db_manager):
+    db_manager.db.tasks.insert_one({'_id': 'taken'})
+    queue = TaskQueue(db_manager)
+    try:
+        queue.add_tasks([task_data('a'), task_data('b'), task_data('c', _id='taken'), task_data('d')])
+        queue.join()
+    finally:
+        queue.stop()
+
+    messages = sorted(n['message'] for n in db_manager.db.notifications.find())
+    assert messages == ['New task assigned: a', 'New task assigned: b']
+    assert queue.stats == {'stored': 2, 'failed': 2}
+
+
+def test_extract_file_stores_the_transcript_once(db_manager):
+    extracted = [{'task': 'a', 'role': 'Sales Analyst'}, {'task': 'b', 'role': 'Sales Analyst'}]
+    manager = SimpleNamespace(
+        db_manager=db_manager,
+        task_extractor=SimpleNamespace(extract_tasks_windowed=lambda text: iter(extracted)),
+        build_task_data=lambda task: task_data(task['task'])
+    )
+    batch = extract_file(manager, 'standup.txt', 'a long transcript')
+
+    transcript = db_manager.db.transcripts.find_one()
+    assert transcript['text'] == 'a long transcript'
+    assert transcript['source'] == 'standup.txt'
+    assert [task['transcript_id'] for task in batch] == [transcript['_id']] * 2
+    assert all('original_transcript' not in task for task in batch)
+
+
+def test_extract_file_without_tasks_stores_no_transcript(db_manager):
+    manager = SimpleNamespace(
+        db_manager=db_manager,
+        task_extractor=SimpleNamespace(extract_tasks_windowed=lambda text: iter([])),
+        build_task_data=None
+    )
+    assert extract_file(manager, 'empty.txt', 'small talk') == []
+    assert db_manager.db.transcripts.count_documents({}) == 0
+
+
+def test_iter_transcripts_walks_directories(tmp_path):
+    (tmp_path / 'b.txt').write_text('second')
+    (tmp_path / 'nested').mkdir()
+    (tmp_path / 'nested' / 'a.txt').write_text('first')
+    (tmp_path / 'notes.md').write_text('skipped')
+    names = [(name.replace(str(tmp_path), ''), text) for name, text in iter_transcripts([str(tmp_path)])]
+    assert names == [('/b.txt', 'second'), ('/nested/a.txt', 'first')]
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import mongomock
+import pytest
+
+from database_manager import DatabaseManager
+from task_chat import TaskChat
+from task_index import TaskIndex, tokenize
+from task_snapshot import TaskCache
+
+TODAY = datetime(2026, 10, 19)
+
+
+def task(task_id, description, status='pending', deadline='Not specified', role='Sales Analyst'):
+    return {
+        '_id': task_id,
+        'task_description': description,
+        'status': status,
+        'deadline': deadline,
+        'role': role,
+        'assignee_name': 'Alex'
+    }
+
+
+TASKS = [
+    task(1, 'Prepare the quarterly sales report', deadline='2026-10-25'),
+    task(2, 'Fix login bug on the website', role='Software Engineer', deadline='2026-10-10'),
+    task(3, 'Design slides for the sales kickoff', role='Presentation Designer', status='completed'),
+    task(4, 'Update website copy', role='Marketing Manager', deadline='2026-10-21'),
+]
+
+
+@pytest.fixture
+def index():
+    index = TaskIndex()
+    index.sync(TASKS)
+    return index
+
+
+def ids(tasks):
+    return [task['_id'] for task in tasks]
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize('What is the status of the Sales report?') == ['status', 'sales', 'report']
+
+
+def test_search_ranks_by_relevance(index):
+    assert ids(index.search('sales report', 2)) == [1, 3]
+    # The shorter document ranks first for the same term frequency
+    assert ids(index.search('website', 5)) == [4, 2]
+
+
+def test_search_without_matches_falls_back_to_most_urgent(index):
+    assert ids(index.search('nothing relevant', 2)) == [2, 4]
+
+
+def test_upsert_replaces_and_remove_forgets(index):
+    index.upsert(task(4, 'Plan the product launch campaign', role='Marketing Manager'))
+    assert ids(index.search('website', 5)) == [2]
+    assert ids(index.search('launch', 5)) == [4]
+
+    index.remove('2')
+    assert 'login' not in index.postings
+    assert 2 not in ids(index.search('login bug', 5))
+    assert len(index) == 3
+
+
+def test_sync_reindexes_only_changed_tasks(index):
+    updated = dict(TASKS[0], status='completed')
+    calls = []
+    original = index.upsert
+    index.upsert = lambda task: calls.append(task['_id']) or original(task)
+
+    index.sync([updated, TASKS[1], TASKS[2]])
+    assert calls == [1]
+    assert len(index) == 3
+    assert '4' not in index.tasks
+    assert index.tasks['1']['status'] == 'completed'
+
+
+def test_compaction_keeps_results(index):
+    for i in range(100, 300):
+        index.upsert(task(i, f'Filler task number {i}'))
+    for i in range(100, 300):
+        index.remove(str(i))
+    assert len(index.row_ids) < 64
+    assert ids(index.search('sales report', 2)) == [1, 3]
+
+
+def test_stats(index):
+    stats = index.stats(TODAY)
+    assert stats['total'] == 4
+    assert stats['by_status'] == {'pending': 3, 'completed': 1}
+    assert stats['overdue'] == 1
+    assert stats['due_this_week'] == 2
+
+
+def test_admin_chat_index_follows_the_shared_cache():
+    db_manager = DatabaseManager(mongomock.MongoClient().task_manager)
+    for description in ('Prepare sales report', 'Fix website bug'):
+        db_manager.create_task({
+            'task_description': description, 'assignee_id': 'u1', 'assignee_name': 'Alex',
+            'role': 'Sales Analyst', 'deadline': 'Not specified', 'status': 'pending'
+        })
+    cache = TaskCache(db_manager, max_staleness=0)
+    chat = TaskChat(db_manager, cache)
+    admin = {'role': 'admin'}
+
+    cache.revalidate()
+    assert len(chat.get_task_index(admin, cache.version)) == 2
+
+    doomed = db_manager.db.tasks.find_one({'task_description': 'Fix website bug'})['_id']
+    db_manager.delete_task(str(doomed))
+    cache.revalidate()
+    index = chat.get_task_index(admin, cache.version)
+    assert len(index) == 1
+    assert ids(index.search('website bug')) != [doomed]
+    assert index.stats()['total'] == 1
+
+
+def test_snapshot_is_a_copy():
+    index = TaskIndex()
+    index.sync([task(1, 'Draft the report'), task(2, 'Review the deck')])
+    snapshot = index.snapshot()
+    index.remove('2')
+    assert [item['_id'] for item in snapshot] == [1, 2]
+    assert [item['_id'] for item in index.snapshot()] == [1]
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from database_manager import DatabaseManager
+from task_snapshot import TaskCache, TaskSnapshot
+
+
+class CountingManager(DatabaseManager):
+    """DatabaseManager that counts full task reads"""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.full_reads = 0
+
+    def get_all_tasks(self):
+        self.full_reads += 1
+        return super().get_all_tasks()
+
+
+def new_task(description, assignee_id='u1', status='pending'):
+    return {
+        'task_description': description,
+        'assignee_id': assignee_id,
+        'assignee_name': 'Alex',
+        'role': 'Sales Analyst',
+        'deadline': 'Not specified',
+        'status': status
+    }
+
+
+@pytest.fixture
+def db_manager():
+    db_manager = CountingManager(mongomock.MongoClient().task_manager)
+    db_manager.create_task(new_task('a'))
+    db_manager.create_task(new_task('b', 'u2'))
+    return db_manager
+
+
+def descriptions(tasks):
+    return sorted(task['task_description'] for task in tasks)
+
+
+def test_unchanged_version_is_served_from_memory(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    assert descriptions(cache.all_tasks()) == ['a', 'b']
+    for _ in range(5):
+        cache.all_tasks()
+    assert db_manager.full_reads == 1
+    assert cache.stats['refreshes'] == 0
+
+
+def test_staleness_bound_skips_version_checks(db_manager):
+    cache = TaskCache(db_manager, max_staleness=60)
+    cache.all_tasks()
+    db_manager.create_task(new_task('c'))
+    assert descriptions(cache.all_tasks()) == ['a', 'b']
+    cache.invalidate()
+    assert descriptions(cache.all_tasks()) == ['a', 'b', 'c']
+
+
+def test_writes_are_pulled_incrementally(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    cache.all_tasks()
+    task_id = db_manager.create_task(new_task('c'))
+    db_manager.update_task(str(task_id), {'status': 'completed'})
+
+    tasks = {task['task_description']: task for task in cache.all_tasks()}
+    assert tasks['c']['status'] == 'completed'
+    assert db_manager.full_reads == 1
+    assert cache.stats['refreshes'] == 1
+
+
+def test_deletions_are_dropped(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    cache.all_tasks()
+    doomed = db_manager.db.tasks.find_one({'task_description': 'a'})['_id']
+    assert db_manager.delete_task(str(doomed))
+    # Same count as before: a delete plus an insert
+    db_manager.create_task(new_task('c'))
+
+    assert descriptions(cache.all_tasks()) == ['b', 'c']
+    assert db_manager.full_reads == 1
+
+
+def test_external_delete_without_version_bump_is_seen_on_next_change(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    cache.all_tasks()
+    db_manager.db.tasks.delete_one({'task_description': 'a'})
+    db_manager.bump_task_version()
+    assert descriptions(cache.all_tasks()) == ['b']
+
+
+def test_backdated_write_triggers_a_reload(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    cache.all_tasks()
+    db_manager.db.tasks.insert_one(dict(new_task('old'), created_at=datetime.now() - timedelta(days=1)))
+    db_manager.bump_task_version()
+    assert descriptions(cache.all_tasks()) == ['a', 'b', 'old']
+    assert db_manager.full_reads == 2
+
+
+def test_user_views_and_frames(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    assert descriptions(cache.user_tasks('u2')) == ['b']
+    frame = cache.frame('u1')
+    assert list(frame['task_description']) == ['a']
+    assert str(frame['created_at'].dtype).startswith('datetime64')
+    assert cache.frame('u1') is frame
+
+
+def test_apply_update_does_not_mutate_shared_tasks(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    before = cache.all_tasks()
+    task = next(task for task in before if task['task_description'] == 'a')
+    cache.apply_update(task['_id'], {'status': 'completed'})
+
+    assert task['status'] == 'pending'
+    after = {task['task_description']: task for task in cache.all_tasks()}
+    assert after['a']['status'] == 'completed'
+
+
+def test_snapshot_reads_once_per_run(db_manager):
+    snapshot = TaskSnapshot(db_manager)
+    assert len(snapshot) == 2
+    snapshot.tasks
+    snapshot.frame()
+    assert db_manager.full_reads == 1
+
+
+def test_snapshot_update_and_revalidate(db_manager):
+    cache = TaskCache(db_manager, max_staleness=0)
+    snapshot = TaskSnapshot(db_manager, 'u1', cache)
+    task = snapshot.tasks[0]
+
+    db_manager.update_task(str(task['_id']), {'status': 'in_progress'})
+    snapshot.update_task(task['_id'], {'status': 'in_progress'})
+    assert snapshot.tasks[0]['status'] == 'in_progress'
+
+    db_manager.create_task(new_task('c'))
+    snapshot.revalidate()
+    assert descriptions(snapshot.tasks) == ['a', 'c']
+    assert snapshot.version == db_manager.get_task_version()
@@ -0,0 +1,79 @@
+from transcript_window import TaskDeduplicator, TranscriptWindow, estimate_tokens, split_to_budget
+
+
+def test_split_to_budget_prefers_sentences_then_words():
+    text = 'Short one. ' + ' '.join(['word'] * 40) + '! Done?'
+    pieces = split_to_budget(text, max_tokens=20)
+    assert pieces[0] == 'Short one.'
+    assert pieces[-1] == 'Done?'
+    assert all(estimate_tokens(piece) <= 20 for piece in pieces)
+    assert ' '.join(pieces).split() == text.split()
+
+
+def test_chunk_bounds_segments_and_carries_context():
+    window = TranscriptWindow(max_tokens=30, context_tokens=10, overlap_utterances=3)
+    sentences = [f'Sentence number {i} is here.' for i in range(20)]
+    segments = window.chunk(' '.join(sentences))
+
+    assert len(segments) > 1
+    assert segments[0][0] == ''
+    for context, text in segments:
+        assert estimate_tokens(text) <= 30
+        assert estimate_tokens(context) <= 10
+    # Each context is the tail of the text before it
+    for (_, previous), (context, _) in zip(segments, segments[1:]):
+        assert previous.endswith(context)
+    assert ' '.join(text for _, text in segments) == ' '.join(sentences)
+
+
+def test_live_utterances_keep_a_bounded_history():
+    window = TranscriptWindow(overlap_utterances=2)
+    for i in range(5):
+        window.add(f'utterance {i}.')
+    assert window.add('last.') == [('utterance 3. utterance 4.', 'last.')]
+
+
+def run_windows(deduplicator, windows):
+    kept = []
+    for context, tasks in windows:
+        deduplicator.next_window(context)
+        kept.append([task['task'] for task in tasks if deduplicator.is_new(task)])
+    return kept
+
+
+def task(text, role='Sales Analyst'):
+    return {'task': text, 'role': role}
+
+
+def test_drops_tasks_repeated_from_the_overlap():
+    kept = run_windows(TaskDeduplicator(), [
+        ('', [task('Send the quarterly report to finance')]),
+        ('Alex please send the quarterly report to finance', [
+            task('Send the quarterly report to finance'),
+            task('Book the venue'),
+        ]),
+    ])
+    assert kept == [['Send the quarterly report to finance'], ['Book the venue']]
+
+
+def test_keeps_tasks_restated_outside_the_overlap():
+    kept = run_windows(TaskDeduplicator(), [
+        ('', [task('Send the weekly report')]),
+        ('We also need new slides for Monday', [task('Prepare slides', 'Presentation Designer')]),
+        ('Slides are assigned', [task('Send the weekly report')]),
+    ])
+    assert kept == [['Send the weekly report'], ['Prepare slides'], ['Send the weekly report']]
+
+
+def test_same_wording_for_another_role_is_kept():
+    kept = run_windows(TaskDeduplicator(), [
+        ('', [task('Review the launch plan')]),
+        ('review the launch plan', [task('Review the launch plan', 'Marketing Manager')]),
+    ])
+    assert kept == [['Review the launch plan'], ['Review the launch plan']]
+
+
+def test_tasks_without_text_are_dropped():
+    deduplicator = TaskDeduplicator()
+    deduplicator.next_window('')
+    assert not deduplicator.is_new({'task': '', 'role': 'Sales Analyst'})
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from audio_fixtures import RATE, audio_data, noisy, seconds, silence, tone
+from voice_activity import (
+    FRAME_SECONDS, VoiceActivityDetector, estimate_energy_threshold, frame_energy, zero_crossing_rate
+)
+
+
+def test_frame_features():
+    samples = np.array([1, -1, 1, -1, 2, 2, 2, 2, 9])
+    assert frame_energy(samples, 4).tolist() == [1, 2]
+    assert zero_crossing_rate(samples, 4).tolist() == [1, 0]
+    assert len(frame_energy(samples[:3], 4)) == 0
+
+
+def test_energy_threshold_sits_just_above_the_noise_floor():
+    energy = np.concatenate([np.full(90, 10.0), np.full(10, 1000.0)])
+    assert estimate_energy_threshold(energy) == pytest.approx(109)
+    assert estimate_energy_threshold(np.zeros(0)) == 0
+
+
+@pytest.mark.parametrize('sample_width', [2, 3])
+def test_trim_keeps_speech_with_padding(sample_width):
+    audio = audio_data(noisy(np.concatenate([silence(1), tone(1), silence(1)])), sample_width)
+    trimmed = VoiceActivityDetector(padding=0.15).trim(audio)
+    assert trimmed.sample_width == sample_width
+    assert 1.0 <= seconds(trimmed) <= 1.0 + 2 * 0.15 + 2 * FRAME_SECONDS
+
+
+def test_speech_reaching_the_end_is_not_cut():
+    audio = audio_data(noisy(np.concatenate([silence(1), tone(1)])))
+    trimmed = VoiceActivityDetector().trim(audio)
+    assert audio.frame_data.endswith(trimmed.frame_data)
+
+
+def test_silence_and_clicks_are_not_speech():
+    detector = VoiceActivityDetector(min_speech=0.3)
+    assert detector.trim(audio_data(noisy(silence(2)))) is None
+    click = np.concatenate([silence(1), tone(0.1), silence(1)])
+    assert detector.trim(audio_data(noisy(click))) is None
+
+
+def test_quiet_hiss_is_rejected_by_zero_crossing_rate():
+    hiss = np.random.default_rng(1).normal(0, 0.02, RATE * 2)
+    samples = (np.concatenate([silence(1), hiss]) * 32767).astype(np.int16)
+    # Fixed threshold just below the hiss energy: only the ZCR test can reject it
+    mask = VoiceActivityDetector().speech_mask(samples, RATE, energy_threshold=0.015 * 32767)
+    assert not mask.any()
+
+
+def test_short_pauses_are_bridged():
+    speech = np.concatenate([tone(0.5), silence(0.1), tone(0.5)])
+    samples = (noisy(np.concatenate([silence(0.5), speech, silence(0.5)])) * 32767).astype(np.int16)
+    mask = VoiceActivityDetector(hangover=0.2).speech_mask(samples, RATE)
+    voiced = np.flatnonzero(mask)
+    assert mask[voiced[0]:voiced[-1] + 1].all()
@@ -0,0 +1,127 @@
+import re
+from collections import deque
+
+# Rough token estimate for English text; close enough for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def split_to_budget(text, max_tokens):
+    """Split text into pieces of at most max_tokens, preferring sentence breaks"""
+    pieces = []
+    for sentence in SENTENCE_BREAK.split(text.strip()):
+        if not sentence:
+            continue
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        # A single run-on sentence: fall back to word boundaries
+        words, current = sentence.split(), []
+        for word in words:
+            if current and estimate_tokens(' '.join(current + [word])) > max_tokens:
+                pieces.append(' '.join(current))
+                current = []
+            current.append(word)
+        if current:
+            pieces.append(' '.join(current))
+    return pieces
+
+
+class TranscriptWindow:
+    """Rolling window over a meeting transcript with a bounded prompt size.
+
+    Each segment pairs new text (at most max_tokens) with a short overlap of
+    the utterances before it, so tasks spoken across two phrases are still
+    seen together without the prompt growing with the meeting length.
+    """
+
+    def __init__(self, max_tokens=1500, context_tokens=300, overlap_utterances=3):
+        self.max_tokens = max_tokens
+        self.context_tokens = context_tokens
+        self.history = deque(maxlen=overlap_utterances)
+
+    def context(self):
+        """The most recent utterances that fit in the context budget"""
+        selected, used = [], 0
+        for utterance in reversed(self.history):
+            tokens = estimate_tokens(utterance)
+            if used + tokens > self.context_tokens:
+                # Keep the tail of a long utterance rather than dropping it
+                remaining = (self.context_tokens - used) * CHARS_PER_TOKEN
+                tail = utterance[-remaining:].split(' ', 1)[-1] if remaining > 0 else ''
+                if tail:
+                    selected.append(tail)
+                break
+            selected.append(utterance)
+            used += tokens
+        return ' '.join(reversed(selected))
+
+    def add(self, utterance):
+        """Add a live utterance; returns a list of (context, text) segments"""
+        return self.chunk(utterance)
+
+    def chunk(self, transcript):
+        """Split a transcript of any length into (context, text) segments"""
+        segments, current = [], []
+        for piece in split_to_budget(transcript or '', self.max_tokens):
+            if current and estimate_tokens(' '.join(current + [piece])) > self.max_tokens:
+                segments.append(self._emit(current))
+                current = []
+            current.append(piece)
+        if current:
+            segments.append(self._emit(current))
+        return segments
+
+    def _emit(self, pieces):
+        context = self.context()
+        for piece in pieces:
+            self.history.append(piece)
+        return context, ' '.join(pieces)
+
+
+def _words(text):
+    return frozenset(re.findall(r'[a-z0-9]+', str(text or '').lower()))
+
+
+class TaskDeduplicator:
+    """Suppress tasks re-extracted from the overlap between adjacent windows.
+
+    Only tasks from earlier windows whose wording appears in the current
+    window's context are candidates, so a task genuinely restated later in
+    the meeting is still kept.
+    """
+
+    def __init__(self, similarity=0.8, coverage=0.5):
+        self.similarity = similarity
+        self.coverage = coverage
+        self.overlap = []
+        self.current = []
+
+    def next_window(self, context):
+        """Start a new window whose prompt carries the given overlap context"""
+        # Earlier tasks stay candidates only while their wording is still in the context
+        context_words = _words(context)
+        self.overlap = [
+            (words, role) for words, role in self.overlap + self.current
+            if len(words & context_words) >= self.coverage * len(words)
+        ]
+        self.current = []
+
+    def is_new(self, task):
+        """Record the task and return False if it repeats one from the overlap"""
+        words, role = _words(task.get('task')), task.get('role')
+        if not words:
+            return False
+        self.current.append((words, role))
+
+        for seen_words, seen_role in self.overlap:
+            if seen_role != role:
+                continue
+            if len(words & seen_words) / len(words | seen_words) >= self.similarity:
+                return False
+        return True
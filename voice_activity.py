@@ -0,0 +1,116 @@
+import numpy as np
+import speech_recognition as sr
+
+SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+FRAME_SECONDS = 0.03
+
+
+def audio_samples(audio):
+    """Samples of an AudioData buffer as a NumPy array"""
+    if audio.sample_width == 3:
+        return unpack_int24(audio.frame_data)
+    if audio.sample_width not in SAMPLE_DTYPES:
+        raise ValueError(f"Unsupported sample width: {audio.sample_width} bytes")
+    return np.frombuffer(audio.frame_data, dtype=SAMPLE_DTYPES[audio.sample_width])
+
+
+def unpack_int24(data):
+    """Little-endian signed 24-bit samples (common in WAV and FLAC) as int32"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    raw = raw[:len(raw) - len(raw) % 3].reshape(-1, 3).astype(np.int32)
+    samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+    # Sign-extend from bit 23
+    return (samples ^ 0x800000) - 0x800000
+
+
+def frame_view(samples, frame_length):
+    frame_count = len(samples) // frame_length
+    return samples[:frame_count * frame_length].astype(np.float64).reshape(frame_count, frame_length)
+
+
+def frame_energy(samples, frame_length):
+    """RMS energy of consecutive, non-overlapping frames"""
+    frames = frame_view(samples, frame_length)
+    if not len(frames):
+        return np.zeros(0)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+def zero_crossing_rate(samples, frame_length):
+    """Fraction of sign changes per sample in each frame"""
+    frames = frame_view(samples, frame_length)
+    if not len(frames):
+        return np.zeros(0)
+    return np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+
+def estimate_energy_threshold(energy):
+    """Energy separating silence from speech: just above the noise floor"""
+    if not len(energy):
+        return 0
+    floor, peak = np.percentile(energy, [5, 95])
+    return floor + (peak - floor) * 0.1
+
+
+def recording_energy_threshold(audio):
+    """Threshold estimated over a whole recording, for judging its chunks"""
+    frame_length = max(1, int(audio.sample_rate * FRAME_SECONDS))
+    return estimate_energy_threshold(frame_energy(audio_samples(audio), frame_length))
+
+
+class VoiceActivityDetector:
+    """Energy plus zero-crossing voice activity detection on raw audio frames.
+
+    Voiced speech is loud with a low zero-crossing rate; hiss and fans cross
+    zero constantly at low energy, and coughs or clicks are too short to
+    pass the minimum speech length.
+    """
+
+    def __init__(self, max_zcr=0.25, min_speech=0.3, hangover=0.2, padding=0.15):
+        self.max_zcr = max_zcr
+        self.min_speech = min_speech
+        self.hangover = hangover
+        self.padding = padding
+
+    def speech_mask(self, samples, sample_rate, energy_threshold=None):
+        """Boolean mask of frames that contain speech"""
+        frame_length = max(1, int(sample_rate * FRAME_SECONDS))
+        energy = frame_energy(samples, frame_length)
+        if not len(energy):
+            return energy.astype(bool)
+        zcr = zero_crossing_rate(samples, frame_length)
+
+        if energy_threshold is None:
+            energy_threshold = estimate_energy_threshold(energy)
+
+        # Loud frames count even with a high ZCR (fricatives like 's')
+        speech = ((energy > energy_threshold) & (zcr < self.max_zcr)) | (energy > energy_threshold * 2)
+
+        # Bridge short pauses inside words and sentences
+        gap = int(self.hangover / FRAME_SECONDS)
+        indices = np.flatnonzero(speech)
+        if gap and len(indices) > 1:
+            gaps = np.diff(indices)
+            short = (gaps > 1) & (gaps <= gap + 1)
+            for start, length in zip(indices[:-1][short], gaps[short]):
+                speech[start:start + length] = True
+        return speech
+
+    def trim(self, audio, energy_threshold=None):
+        """Trim leading and trailing silence; returns None if there is no speech"""
+        samples = audio_samples(audio)
+        speech = self.speech_mask(samples, audio.sample_rate, energy_threshold)
+        if speech.sum() * FRAME_SECONDS < self.min_speech:
+            return None
+
+        frames = np.flatnonzero(speech)
+        pad = int(self.padding / FRAME_SECONDS)
+        frame_length = max(1, int(audio.sample_rate * FRAME_SECONDS))
+        bytes_per_frame = frame_length * audio.sample_width
+
+        start = max(0, frames[0] - pad) * bytes_per_frame
+        end = min(len(speech), frames[-1] + 1 + pad) * bytes_per_frame
+        if end >= len(speech) * bytes_per_frame:
+            end = len(audio.frame_data)
+        return sr.AudioData(audio.frame_data[start:end], audio.sample_rate, audio.sample_width)